@@ -87,7 +87,11 @@ def get_plan_cache() -> Generator[PlanCache, None, None]:
     Fornece instância de PlanCache.
     """
     cache = PlanCache.global_cache(enabled=True)
-    yield cache
+    try:
+        yield cache
+    finally:
+        # Instância por request: grava o índice e fecha a conexão
+        cache.close()
 
 
 def get_version_store() -> Generator[PlanVersionStore, None, None]:
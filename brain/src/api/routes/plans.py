@@ -45,10 +45,10 @@ def _diff_to_response(diff: PlanDiff, plan_name: str) -> PlanDiffResponse:
     steps_modified: list[PlanDiffChange] = []
     for change in diff.steps_modified:
         steps_modified.append(PlanDiffChange(
-            id=change.get("id", "unknown"),
+            id=change.id if change.id is not None else "unknown",
             field="step",
-            before=change.get("before"),
-            after=change.get("after"),
+            before=change.before,
+            after=change.after,
         ))
 
     # Converte config changes
@@ -57,8 +57,8 @@ def _diff_to_response(diff: PlanDiff, plan_name: str) -> PlanDiffResponse:
         config_changes.append(PlanDiffChange(
             id=key,
             field="config",
-            before=change.get("before"),
-            after=change.get("after"),
+            before=change.before,
+            after=change.after,
         ))
 
     # Converte meta changes
@@ -67,8 +67,8 @@ def _diff_to_response(diff: PlanDiff, plan_name: str) -> PlanDiffResponse:
         meta_changes.append(PlanDiffChange(
             id=key,
             field="meta",
-            before=change.get("before"),
-            after=change.get("after"),
+            before=change.before,
+            after=change.after,
         ))
 
     return PlanDiffResponse(
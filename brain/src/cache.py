@@ -32,8 +32,8 @@ Suporta dois modos de armazenamento:
 ### Cache Local (padrão legacy):
 ```
 .brain_cache/
-├── index.json          # Mapa de hash → arquivo
-├── abc123.json         # Plano cacheado
+├── index.db            # Índice SQLite: hash → objeto
+├── objects/ab/cdef.json  # Plano cacheado
 └── ...
 ```
 
@@ -41,9 +41,10 @@ Suporta dois modos de armazenamento:
 ```
 ~/.aqa/
 ├── cache/
-│   ├── index.json      # Índice com metadados e TTL
-│   ├── abc123.json.gz  # Plano comprimido (opcional)
-│   └── def456.json     # Plano não comprimido
+│   ├── index.db        # Índice SQLite: hash dos inputs → objeto, TTL
+│   └── objects/        # Planos endereçados pelo conteúdo
+│       ├── 3f/a9c1....json.zst  # Plano comprimido (opcional)
+│       └── 7b/02de....json      # Plano não comprimido
 ├── history/            # Histórico de execuções
 │   └── ...
 └── config.yaml         # Configuração global
@@ -68,15 +69,76 @@ Suporta dois modos de armazenamento:
 
 from __future__ import annotations
 
+import atexit
 import gzip
 import hashlib
+import heapq
+import itertools
 import json
+import logging
+import mmap
 import os
+import re
+import sqlite3
+import struct
 import threading
-from dataclasses import dataclass
-from datetime import datetime, timezone, timedelta
+import time
+import weakref
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Literal, NamedTuple
+
+# Tentar importar orjson - é opcional (acelera serialização interna)
+try:
+    import orjson
+    _orjson_available = True
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    _orjson_available = False
+
+ORJSON_AVAILABLE: bool = _orjson_available
+
+# Tentar importar zstandard - é opcional (compressão mais rápida que gzip)
+try:
+    import zstandard as zstd
+    _zstd_available = True
+except ImportError:
+    zstd = None  # type: ignore[assignment]
+    _zstd_available = False
+
+ZSTD_AVAILABLE: bool = _zstd_available
+
+# Tentar importar ijson - é opcional (parse incremental de entries grandes)
+try:
+    import ijson
+    _ijson_available = True
+except ImportError:
+    ijson = None  # type: ignore[assignment]
+    _ijson_available = False
+
+IJSON_AVAILABLE: bool = _ijson_available
+
+logger = logging.getLogger(__name__)
+
+# Nível zstd para entries do cache (bom equilíbrio velocidade/tamanho)
+ZSTD_LEVEL = 3
+
+# Magic numbers para detectar o formato de um arquivo de entry
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Erros de parse incremental (ijson), quando disponível
+_IJSON_ERRORS: tuple[type[Exception], ...] = (ijson.JSONError,) if ijson is not None else ()
+
+# Erros de decodificação de um arquivo de entry corrompido/truncado
+_ENTRY_READ_ERRORS: tuple[type[Exception], ...] = (ValueError, OSError, EOFError) + (
+    (zstd.ZstdError,) if zstd is not None else ()
+)
 
 
 # Constantes para localização do cache global
@@ -84,6 +146,7 @@ AQA_HOME_DIR = ".aqa"
 AQA_CACHE_SUBDIR = "cache"
 AQA_HISTORY_SUBDIR = "history"
 DEFAULT_TTL_DAYS = 30
+DEFAULT_MAX_ENTRIES = 1000
 
 
 @dataclass
@@ -130,6 +193,158 @@ class CacheStats:
     compressed_entries: int = 0
 
 
+def _json_dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """
+    Serializa objeto para JSON compacto em bytes UTF-8.
+
+    Usado para arquivos internos (produzidos e consumidos por este módulo),
+    onde indentação só aumenta tamanho e custo de encoding.
+    Usa orjson quando disponível, com fallback para stdlib.
+
+    Com `sort_keys=True` a saída é canônica (adequada para hashing).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+        except TypeError:
+            # orjson é mais restrito (ex: chaves não-string); cai para stdlib
+            pass
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys
+    ).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decodifica JSON a partir de bytes (orjson quando disponível)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    """Comprime bytes com o codec indicado ("none", "gzip" ou "zstd")."""
+    if codec == "zstd":
+        return zstd.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if codec == "gzip":
+        return gzip.compress(data)
+    return data
+
+
+def _decompress(data: bytes) -> bytes:
+    """
+    Descomprime bytes detectando o formato pelo magic number.
+
+    Dados sem magic conhecido são devolvidos como estão (JSON puro).
+
+    ## Exceções:
+
+    - `ValueError`: dados zstd sem o pacote zstandard instalado
+    """
+    if data[:4] == _ZSTD_MAGIC:
+        if zstd is None:
+            raise ValueError("zstandard não instalado; impossível ler dados zstd")
+        return zstd.ZstdDecompressor().decompress(data)
+    if data[:2] == _GZIP_MAGIC:
+        return gzip.decompress(data)
+    return data
+
+
+def _content_hash(obj: Any) -> bytes:
+    """Digest de 16 bytes (BLAKE2b) do JSON canônico de um objeto."""
+    return hashlib.blake2b(_json_dumps(obj, sort_keys=True), digest_size=16).digest()
+
+
+def _read_json_file(path: Path) -> Any:
+    """
+    Lê e decodifica um arquivo JSON interno em modo binário.
+
+    Com orjson, o arquivo é mapeado em memória e decodificado direto dos
+    bytes, sem passar pela camada de texto (decode UTF-8 + string
+    intermediária). Sem orjson, lê os bytes e usa a stdlib.
+
+    ## Retorno:
+
+    Objeto decodificado, ou None se o arquivo estiver vazio.
+
+    ## Exceções:
+
+    - `json.JSONDecodeError`: conteúdo inválido
+    - `OSError`: erro de leitura
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return None
+        if orjson is not None:
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+        return json.loads(f.read())
+
+
+def _atomic_write_bytes(path: Path, data: bytes, durable: bool = False) -> None:
+    """
+    Grava bytes em `path` de forma atômica.
+
+    Escreve em um arquivo temporário no mesmo diretório e faz `os.replace`,
+    garantindo que leitores concorrentes vejam o conteúdo antigo ou o novo
+    por inteiro, nunca um arquivo parcial.
+
+    Com `durable=True`, faz `fsync` do temporário antes do rename, para que
+    o conteúdo sobreviva a uma queda do sistema (mais lento).
+    """
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _utc_iso(time_ns: int) -> str:
+    """
+    Formata um instante (nanossegundos desde a epoch) em ISO 8601 UTC com "Z".
+
+    Equivale a `datetime.fromtimestamp(..., timezone.utc).isoformat()`
+    com "+00:00" trocado por "Z" (sempre com microssegundos), sem criar
+    datetime com tzinfo nem fazer substituição de string.
+    """
+    seconds, nanos = divmod(time_ns, 1_000_000_000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)) + f".{nanos // 1000:06d}Z"
+
+
+def _utc_now_iso() -> str:
+    """Retorna o instante atual em UTC no formato ISO 8601 com sufixo "Z"."""
+    return _utc_iso(time.time_ns())
+
+
+def _utc_today() -> str:
+    """Retorna a data atual em UTC (YYYY-MM-DD), o nome do diretório do dia."""
+    return time.strftime("%Y-%m-%d", time.gmtime())
+
+
+def _iso_to_timestamp(value: str | None) -> float | None:
+    """
+    Converte data ISO 8601 (sufixo "Z" ou offset) em Unix timestamp.
+
+    Retorna None para valor vazio ou inválido.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
 def get_global_cache_dir() -> Path:
     """
     Retorna o diretório global de cache (~/.aqa/cache/).
@@ -162,28 +377,115 @@ def get_global_history_dir() -> Path:
     return Path.home() / AQA_HOME_DIR / AQA_HISTORY_SUBDIR
 
 
+def _cache_key(
+    requirements: str,
+    base_url: str,
+    provider: str | None,
+    model: str | None,
+) -> str:
+    """Fingerprint BLAKE2b-64 dos inputs normalizados (ver `PlanCache._compute_hash`)."""
+    # Normaliza (lowercase, trim) e alimenta o hasher campo a campo,
+    # sem montar a string "a|b|provider:x|model:y" intermediária
+    h = hashlib.blake2b(digest_size=8)
+    h.update(requirements.strip().lower().encode("utf-8"))
+    h.update(b"|")
+    h.update(base_url.strip().lower().encode("utf-8"))
+
+    # Inclui provider/model se fornecidos (backward compatible)
+    if provider:
+        h.update(b"|provider:")
+        h.update(provider.strip().lower().encode("utf-8"))
+    if model:
+        h.update(b"|model:")
+        h.update(model.strip().lower().encode("utf-8"))
+
+    return h.hexdigest()
+
+
+# Requisitos maiores que isso não entram no LRU de chaves
+_CACHE_KEY_MEMO_MAX_LEN = 4096
+
+# Função pura: chamadas repetidas viram uma consulta ao LRU
+_cache_key_memo = lru_cache(maxsize=1024)(_cache_key)
+
+
+# Caches com índice pendente de gravação; gravados na saída do processo
+_pending_index_flush: "weakref.WeakSet[PlanCache]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_pending_indexes() -> None:
+    """Grava índices de PlanCache ainda pendentes ao encerrar o processo."""
+    for cache in list(_pending_index_flush):
+        cache.flush()
+
+
 class PlanCache:
     """
     Cache de planos baseado em hash dos inputs.
 
     Este cache persiste em disco e sobrevive entre execuções.
-    Usa hash SHA256 para gerar fingerprints únicos.
+    Usa BLAKE2b (64 bits) para gerar fingerprints únicos.
 
     ## Thread Safety:
 
-    Este cache é thread-safe. Usa locks por hash para permitir
-    operações concorrentes em entradas diferentes enquanto
-    serializa operações na mesma entrada.
+    Este cache é thread-safe. O índice em memória é dividido em
+    `INDEX_SHARDS` shards, cada um com seu próprio lock, então operações
+    em chaves diferentes não disputam um lock global. Locks por hash
+    serializam as escritas (store/invalidate/remoção de expiradas) de uma
+    mesma entrada. O caminho de leitura de `get` não usa locks: lê o
+    shard com um `dict.get` atômico, e entries são gravadas de forma
+    atômica, então o leitor sempre vê um arquivo completo.
+
+    ## Memória:
+
+    Os `MEMO_SIZE` planos lidos mais recentemente ficam em um LRU em
+    memória, serializados em JSON compacto: hits repetidos não tocam o
+    disco, e cada `get` devolve um dict novo (o chamador pode mutá-lo
+    sem afetar o cache).
+
+    ## Carregamento:
+
+    O índice é carregado em uma thread de background; o construtor
+    retorna imediatamente e as operações públicas só esperam se o
+    carregamento ainda não terminou.
+
+    ## Persistência do índice:
+
+    O índice é persistido em SQLite (`index.db`, modo WAL). Mutações
+    ficam pendentes em memória e são gravadas em lote por `flush()` —
+    apenas as linhas alteradas, sem reescrever o índice inteiro. Um
+    `index.json` legado é migrado automaticamente na primeira abertura.
 
     ## TTL (Time-to-Live):
 
     Entries podem expirar automaticamente. Configure `ttl_days`
     para definir por quanto tempo entries são válidas.
 
+    ## Deduplicação:
+
+    Planos são gravados como objetos endereçados pelo conteúdo
+    (`objects/<2 hex>/<resto do BLAKE2b-128 do JSON canônico>`). Inputs
+    diferentes que resultam no mesmo plano apontam para o mesmo arquivo;
+    o índice guarda, por hash de input, o objeto e os metadados (TTL,
+    provider, model, resumo dos requisitos). Um objeto só é removido
+    quando nenhuma entrada aponta mais para ele. Entries antigas
+    (`<hash>.json`, plano embutido) continuam legíveis.
+
+    ## Limite de tamanho:
+
+    Com mais de `max_entries` entradas, `store` remove as menos usadas
+    recentemente (LRU) até voltar a `EVICT_TARGET` do limite, para o
+    índice e o diretório não crescerem sem fim. O último acesso é
+    mantido só em memória; ao abrir o cache, vale a ordem de gravação.
+
     ## Compressão:
 
-    Entries podem ser comprimidas com gzip para economizar espaço.
+    Entries podem ser comprimidas para economizar espaço.
     Útil para planos grandes. Configure `compress=True`.
+    Usa zstd (nível `ZSTD_LEVEL`) se o pacote `zstandard` estiver
+    instalado, senão gzip. A leitura detecta o formato pelo magic
+    number, então entries gzip antigas continuam legíveis.
 
     ## Exemplo:
 
@@ -199,7 +501,24 @@ class PlanCache:
         >>> global_cache = PlanCache.global_cache(ttl_days=7, compress=True)
     """
 
-    INDEX_FILE = "index.json"
+    INDEX_FILE = "index.json"  # formato legado, migrado para INDEX_DB
+    INDEX_DB = "index.db"
+    INDEX_SHARDS = 32
+    LOCK_STRIPES = 64  # locks por hash/arquivo (potência de 2)
+    INDEX_FLUSH_INTERVAL = 2.0  # segundos entre mutação e gravação do índice
+    ENTRY_EXTENSIONS = {"none": ".json", "gzip": ".json.gz", "zstd": ".json.zst"}
+    OBJECTS_DIR = "objects"  # planos endereçados pelo conteúdo
+    ENTRY_MMAP_MIN_SIZE = 32 * 1024  # abaixo disso, read() é mais barato que mmap
+    ENTRY_STREAM_MIN_SIZE = 4 * 1024 * 1024  # a partir disso, parse incremental (ijson)
+    MEMO_SIZE = 128  # planos mantidos em memória (LRU) na frente do disco
+    DURABLE_WRITES = False  # fsync de cada entry antes do rename (mais lento)
+    EVICT_TARGET = 0.9  # fração de max_entries mantida após uma remoção por LRU
+
+    _UPSERT_SQL = (
+        "INSERT OR REPLACE INTO entries"
+        " (hash, filename, expires_at, compressed, expires_at_ts, size_bytes, details)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?)"
+    )
 
     def __init__(
         self,
@@ -207,6 +526,7 @@ class PlanCache:
         enabled: bool = True,
         ttl_days: int | None = None,
         compress: bool = False,
+        max_entries: int | None = DEFAULT_MAX_ENTRIES,
     ):
         """
         Inicializa o cache.
@@ -216,24 +536,76 @@ class PlanCache:
         - `cache_dir`: Diretório para armazenar cache
         - `enabled`: Se False, cache é desabilitado (always miss)
         - `ttl_days`: Dias até expiração (None = nunca expira)
-        - `compress`: Se True, comprime entries com gzip
+        - `compress`: Se True, comprime entries (zstd se disponível, senão gzip)
+        - `max_entries`: Máximo de entradas antes da remoção por LRU (None = sem limite)
         """
         self.cache_dir = Path(cache_dir)
+        # Prefixo em str para caminhos de arquivos no caminho quente:
+        # concatenar é mais barato que `Path.__truediv__`, e open/stat/unlink
+        # aceitam str
+        self._cache_dir_str = os.fspath(self.cache_dir) + os.sep
         self.enabled = enabled
         self.ttl_days = ttl_days
         self.compress = compress
-        self._index: dict[str, dict[str, Any]] = {}  # hash → {filename, expires_at, compressed}
-
-        # Lock global para operações no índice
-        self._index_lock = threading.Lock()
-
-        # Locks por hash para operações em entradas individuais
-        self._hash_locks: dict[str, threading.Lock] = {}
-        self._hash_locks_lock = threading.Lock()
+        self.max_entries = max_entries
+        # Codec das entries gravadas por esta instância
+        self.codec: Literal["none", "gzip", "zstd"] = "none"
+        if compress:
+            self.codec = "zstd" if zstd is not None else "gzip"
+        # Índice em shards: cada shard é (lock, dict hash → {filename, expires_at, compressed})
+        self._shards: list[tuple[threading.Lock, dict[str, dict[str, Any]]]] = [
+            (threading.Lock(), {}) for _ in range(self.INDEX_SHARDS)
+        ]
 
+        # Conexão do índice SQLite; acesso serializado por _persist_lock
+        self._db: sqlite3.Connection | None = None
+        self._persist_lock = threading.Lock()
+
+        # Mudanças ainda não gravadas (hash → metadados, None = remoção)
+        # + timer da próxima gravação
+        self._pending: dict[str, dict[str, Any] | None] = {}
+        self._pending_clear = False
+        # Objetos sem referências nesta instância; só são removidos em
+        # flush(), se o índice compartilhado também não apontar para eles
+        self._orphans: set[str] = set()
+        self._flush_timer: threading.Timer | None = None
+        self._dirty_lock = threading.Lock()
+
+        # Locks por hash e por arquivo, em faixas de tamanho fixo: chaves
+        # diferentes podem dividir um lock, o que só serializa as duas.
+        # Arrays separados porque o lock de arquivo é tomado com o de hash
+        # já adquirido (sempre nessa ordem).
+        self._key_locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._file_locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+
+        # LRU em memória: hash → plano em JSON compacto
+        self._memo: OrderedDict[str, bytes] = OrderedDict()
+        self._memo_lock = threading.Lock()
+
+        # Hash → instante lógico do último acesso (store ou hit), para o
+        # LRU de max_entries. Atribuição simples de dict, sem lock: o
+        # caminho de leitura de get continua sem locks
+        self._access: dict[str, int] = {}
+        self._access_clock = itertools.count()
+        self._evict_lock = threading.Lock()
+
+        # Arquivo → número de entradas do índice *desta instância* que
+        # apontam para ele (outros processos podem compartilhar o diretório).
+        # Alterado só sob o lock do próprio arquivo (_get_file_lock(filename))
+        self._file_refs: Counter[str] = Counter()
+
+        # Índice carregado em background: o construtor retorna na hora e
+        # operações esperam o carregamento só se ainda não terminou
+        self._index_ready = threading.Event()
         if enabled:
             self._ensure_cache_dir()
-            self._load_index()
+            threading.Thread(
+                target=self._load_index_then_set,
+                name="plan-cache-index-load",
+                daemon=True,
+            ).start()
+        else:
+            self._index_ready.set()
 
     @classmethod
     def global_cache(
@@ -241,6 +613,7 @@ class PlanCache:
         enabled: bool = True,
         ttl_days: int = DEFAULT_TTL_DAYS,
         compress: bool = True,
+        max_entries: int | None = DEFAULT_MAX_ENTRIES,
     ) -> "PlanCache":
         """
         Cria cache global em ~/.aqa/cache/.
@@ -253,10 +626,12 @@ class PlanCache:
         - `enabled`: Se False, cache é desabilitado
         - `ttl_days`: Dias até expiração (default: 30)
         - `compress`: Se True, comprime entries (default: True)
+        - `max_entries`: Máximo de entradas (default: 1000, None = sem limite)
 
         ## Retorno:
 
-        Instância de PlanCache configurada para uso global.
+        Instância de PlanCache configurada para uso global
+        (NullPlanCache se desabilitado).
 
         ## Exemplo:
 
@@ -264,12 +639,15 @@ class PlanCache:
             >>> cache.cache_dir
             PosixPath('/home/user/.aqa/cache')
         """
+        if not enabled:
+            return NullPlanCache(cache_dir=str(get_global_cache_dir()))
         cache_dir = get_global_cache_dir()
         return cls(
             cache_dir=str(cache_dir),
             enabled=enabled,
             ttl_days=ttl_days,
             compress=compress,
+            max_entries=max_entries,
         )
 
     @classmethod
@@ -279,6 +657,7 @@ class PlanCache:
         enabled: bool = True,
         ttl_days: int | None = None,
         compress: bool = False,
+        max_entries: int | None = DEFAULT_MAX_ENTRIES,
     ) -> "PlanCache":
         """
         Cria cache local no diretório especificado.
@@ -291,62 +670,370 @@ class PlanCache:
         - `enabled`: Se False, cache é desabilitado
         - `ttl_days`: Dias até expiração (None = nunca expira)
         - `compress`: Se True, comprime entries
+        - `max_entries`: Máximo de entradas (None = sem limite)
 
         ## Retorno:
 
-        Instância de PlanCache para uso local.
+        Instância de PlanCache para uso local (NullPlanCache se desabilitado).
         """
+        if not enabled:
+            return NullPlanCache(cache_dir=cache_dir)
         return cls(
             cache_dir=cache_dir,
             enabled=enabled,
             ttl_days=ttl_days,
             compress=compress,
+            max_entries=max_entries,
         )
 
     def _get_hash_lock(self, hash_key: str) -> threading.Lock:
         """
-        Obtém ou cria um lock para um hash específico.
+        Retorna o lock da faixa responsável por um hash.
+
+        Sem lock global nem alocação: os locks são fixos desde o
+        construtor, então a memória não cresce com o número de chaves.
+        """
+        return self._key_locks[hash(hash_key) & (self.LOCK_STRIPES - 1)]
+
+    def _get_file_lock(self, filename: str) -> threading.Lock:
+        """
+        Retorna o lock da faixa responsável por um arquivo do cache.
 
-        Thread-safe: usa lock global para gerenciar o dicionário de locks.
+        Pode ser adquirido com o lock de um hash já em posse, nunca o
+        contrário.
         """
-        with self._hash_locks_lock:
-            if hash_key not in self._hash_locks:
-                self._hash_locks[hash_key] = threading.Lock()
-            return self._hash_locks[hash_key]
+        return self._file_locks[hash(filename) & (self.LOCK_STRIPES - 1)]
+
+    def _memo_get(self, hash_key: str) -> bytes | None:
+        """Busca plano serializado no LRU em memória (marca como recente)."""
+        with self._memo_lock:
+            data = self._memo.get(hash_key)
+            if data is not None:
+                self._memo.move_to_end(hash_key)
+            return data
+
+    def _memo_put(self, hash_key: str, data: bytes, entry_meta: dict[str, Any]) -> None:
+        """
+        Insere plano serializado no LRU, descartando o mais antigo.
+
+        Só insere se `entry_meta` ainda é a entrada atual do índice: um
+        `store` concorrente troca os metadados e depois descarta o hash do
+        LRU, então um leitor atrasado nunca deixa um plano velho em memória.
+        """
+        with self._memo_lock:
+            if self._shard_for(hash_key)[1].get(hash_key) is not entry_meta:
+                return
+            self._memo[hash_key] = data
+            self._memo.move_to_end(hash_key)
+            if len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+
+    def _memo_discard(self, hash_key: str) -> None:
+        """Remove um hash do LRU em memória."""
+        with self._memo_lock:
+            self._memo.pop(hash_key, None)
+
+    def _shard_for(self, hash_key: str) -> tuple[threading.Lock, dict[str, dict[str, Any]]]:
+        """Retorna (lock, dict) do shard responsável por um hash."""
+        return self._shards[int(hash_key[:2], 16) % self.INDEX_SHARDS]
+
+    def _load_index_then_set(self) -> None:
+        """Carrega o índice (thread de background) e libera as operações."""
+        try:
+            self._load_index()
+        finally:
+            self._index_ready.set()
+
+    def _wait_index_ready(self) -> None:
+        """
+        Bloqueia até o índice estar carregado.
+
+        Checa a flag antes de `wait()`, que adquire um lock interno mesmo
+        com o evento já setado — mantém o `get` sem locks após a carga.
+        """
+        if not self._index_ready.is_set():
+            self._index_ready.wait()
+
+    @property
+    def _index(self) -> dict[str, dict[str, Any]]:
+        """
+        Snapshot do índice completo (todos os shards).
+
+        Cópia somente leitura, útil para debug e testes. Cada shard é
+        copiado sob seu próprio lock.
+        """
+        self._wait_index_ready()
+        merged: dict[str, dict[str, Any]] = {}
+        for lock, shard in self._shards:
+            with lock:
+                merged.update(shard)
+        return merged
 
     def _ensure_cache_dir(self) -> None:
         """Cria diretório de cache se não existir."""
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-    def _load_index(self) -> None:
-        """Carrega índice do disco."""
-        with self._index_lock:
-            index_path = self.cache_dir / self.INDEX_FILE
-            if index_path.exists():
-                try:
-                    with open(index_path, "r", encoding="utf-8") as f:
-                        raw_index = json.load(f)
-                        # Migra índice antigo (string) para novo formato (dict)
-                        self._index = {}
-                        for hash_key, value in raw_index.items():
-                            if isinstance(value, str):
-                                # Formato antigo: hash → filename
-                                self._index[hash_key] = {
-                                    "filename": value,
-                                    "expires_at": None,
-                                    "compressed": value.endswith(".gz"),
-                                }
-                            else:
-                                # Formato novo: hash → {filename, expires_at, compressed}
-                                self._index[hash_key] = value
-                except (json.JSONDecodeError, IOError):
-                    self._index = {}
+    def _open_db(self) -> sqlite3.Connection:
+        """Abre (ou cria) o índice SQLite do cache."""
+        db = sqlite3.connect(
+            self.cache_dir / self.INDEX_DB,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        try:
+            self._init_db(db)
+        except sqlite3.Error:
+            db.close()
+            raise
+        return db
+
+    def _init_db(self, db: sqlite3.Connection) -> None:
+        """Configura a conexão e cria/atualiza a tabela de entradas."""
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                hash TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                expires_at TEXT,
+                compressed INTEGER NOT NULL DEFAULT 0,
+                expires_at_ts REAL,
+                size_bytes INTEGER,
+                details TEXT
+            )
+            """
+        )
+        # Índices criados antes dessas colunas
+        for column, column_type in (
+            ("expires_at_ts", "REAL"),
+            ("size_bytes", "INTEGER"),
+            ("details", "TEXT"),
+        ):
+            try:
+                db.execute(f"ALTER TABLE entries ADD COLUMN {column} {column_type}")
+            except sqlite3.OperationalError:
+                pass
+        db.execute("CREATE INDEX IF NOT EXISTS entries_filename ON entries (filename)")
 
-    def _save_index(self) -> None:
-        """Salva índice no disco. DEVE ser chamada com _index_lock adquirido."""
+    def _migrate_legacy_index(self, db: sqlite3.Connection) -> None:
+        """
+        Importa um index.json legado para o SQLite e remove o arquivo.
+
+        Suporta os dois formatos antigos: hash → filename e
+        hash → {filename, expires_at, compressed}.
+        """
         index_path = self.cache_dir / self.INDEX_FILE
-        with open(index_path, "w", encoding="utf-8") as f:
-            json.dump(self._index, f, indent=2)
+        try:
+            raw_index = _read_json_file(index_path)
+        except FileNotFoundError:
+            return
+        except (ValueError, OSError):
+            raw_index = None
+
+        rows: list[tuple[str, str, str | None, int, float | None, int | None, str | None]] = []
+        for hash_key, value in (raw_index or {}).items():
+            if isinstance(value, str):
+                # Formato antigo: hash → filename
+                rows.append((hash_key, value, None, int(value.endswith(".gz")), None, None, None))
+            else:
+                rows.append((
+                    hash_key,
+                    value["filename"],
+                    value.get("expires_at"),
+                    int(bool(value.get("compressed", False))),
+                    _iso_to_timestamp(value.get("expires_at")),
+                    None,
+                    None,
+                ))
+
+        with db:
+            db.execute("BEGIN")
+            db.executemany(self._UPSERT_SQL, rows)
+        index_path.unlink(missing_ok=True)
+
+    def _read_index(self) -> tuple[sqlite3.Connection, list[tuple[Any, ...]]]:
+        """Abre o índice SQLite e lê todas as linhas (fecha a conexão se falhar)."""
+        db = self._open_db()
+        try:
+            self._migrate_legacy_index(db)
+            rows = db.execute(
+                "SELECT hash, filename, expires_at, compressed, expires_at_ts, size_bytes, details"
+                " FROM entries ORDER BY rowid"
+            ).fetchall()
+        except sqlite3.Error:
+            db.close()
+            raise
+        return db, rows
+
+    def _quarantine_index(self) -> None:
+        """Move o índice SQLite (e seus arquivos WAL/SHM) para `*.corrupt`."""
+        index_path = self._cache_dir_str + self.INDEX_DB
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.replace(index_path + suffix, f"{index_path}.corrupt{suffix}")
+            except FileNotFoundError:
+                pass
+
+    def _load_index(self) -> None:
+        """
+        Abre o índice SQLite e carrega as entradas nos shards.
+
+        Um índice corrompido (ou que não é SQLite) é movido para
+        `index.db.corrupt` e recriado vazio: as entradas anteriores se
+        perdem, mas o cache volta a persistir. Se o índice não abrir por
+        outro motivo (ex.: bloqueado ou sem permissão), o cache segue só
+        em memória; nos dois casos um aviso vai para o log.
+        """
+        try:
+            db, rows = self._read_index()
+        except sqlite3.OperationalError as e:
+            logger.warning("Índice do cache indisponível, sem persistência: %s", e)
+            return
+        except sqlite3.DatabaseError as e:
+            logger.warning("Índice do cache corrompido, recriando: %s", e)
+            try:
+                self._quarantine_index()
+                db, rows = self._read_index()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Não foi possível recriar o índice do cache: %s", e)
+                return
+        self._db = db
+
+        for hash_key, filename, expires_at, compressed, expires_at_ts, size_bytes, details in rows:
+            if expires_at_ts is None and expires_at:
+                expires_at_ts = _iso_to_timestamp(expires_at)
+            try:
+                details_dict = _json_loads(details) if details else None
+            except ValueError:
+                details_dict = None
+            lock, shard = self._shard_for(hash_key)
+            with lock:
+                shard[hash_key] = {
+                    "filename": filename,
+                    "expires_at": expires_at,
+                    "expires_at_ts": expires_at_ts,
+                    "compressed": bool(compressed),
+                    "size_bytes": size_bytes,
+                    "details": details_dict,
+                }
+            self._file_refs[filename] += 1
+            # rowid segue a ordem de gravação (INSERT OR REPLACE gera um novo)
+            self._access[hash_key] = next(self._access_clock)
+
+    def _mark_dirty(
+        self,
+        hash_key: str | None = None,
+        entry_meta: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Registra uma mudança no índice e agenda sua gravação.
+
+        A gravação real acontece em `flush()`, no máximo
+        `INDEX_FLUSH_INTERVAL` segundos depois (ou ao encerrar o processo),
+        agrupando várias mutações em uma única transação.
+
+        ## Parâmetros:
+
+        - `hash_key`: Hash alterado (None = índice inteiro foi limpo)
+        - `entry_meta`: Novos metadados (None = entrada removida)
+        """
+        with self._dirty_lock:
+            if hash_key is None:
+                self._pending_clear = True
+                self._pending.clear()
+            else:
+                self._pending[hash_key] = entry_meta
+            self._schedule_flush()
+        _pending_index_flush.add(self)
+
+    def _mark_orphan(self, filename: str) -> None:
+        """
+        Agenda a remoção de um objeto que perdeu a última referência local.
+
+        O diretório do cache é compartilhado entre processos (e entre
+        instâncias do mesmo processo), então a contagem em `_file_refs`
+        não basta: `flush()` confere no índice SQLite, na mesma transação,
+        se alguma entrada ainda aponta para o objeto antes de removê-lo.
+        """
+        with self._dirty_lock:
+            self._orphans.add(filename)
+            self._schedule_flush()
+        _pending_index_flush.add(self)
+
+    def _schedule_flush(self) -> None:
+        """Agenda `flush()` se ainda não houver um agendado (com `_dirty_lock`)."""
+        if self._flush_timer is None:
+            timer = threading.Timer(self.INDEX_FLUSH_INTERVAL, self.flush)
+            timer.daemon = True
+            self._flush_timer = timer
+            timer.start()
+
+    def flush(self) -> None:
+        """
+        Grava no índice SQLite as mudanças pendentes, se houver.
+
+        Apenas as linhas alteradas são escritas, em uma única transação.
+        Na mesma transação, objetos órfãos (ver `_mark_orphan`) são
+        removidos do disco se nenhuma linha do índice aponta mais para
+        eles. Sem índice, os objetos ficam no disco.
+        """
+        with self._dirty_lock:
+            timer, self._flush_timer = self._flush_timer, None
+            pending, self._pending = self._pending, {}
+            pending_clear, self._pending_clear = self._pending_clear, False
+            orphans, self._orphans = self._orphans, set()
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+        _pending_index_flush.discard(self)
+        if self._db is None or not (pending or pending_clear or orphans):
+            return
+
+        upserts = [
+            (
+                hash_key,
+                meta["filename"],
+                meta["expires_at"],
+                int(meta["compressed"]),
+                meta.get("expires_at_ts"),
+                meta.get("size_bytes"),
+                _json_dumps(meta["details"]).decode("utf-8") if meta.get("details") else None,
+            )
+            for hash_key, meta in pending.items()
+            if meta is not None
+        ]
+        deletes = [(hash_key,) for hash_key, meta in pending.items() if meta is None]
+
+        with self._persist_lock:
+            try:
+                with self._db:
+                    # IMMEDIATE: nenhum outro processo grava no índice entre
+                    # a contagem de referências e a remoção dos órfãos
+                    self._db.execute("BEGIN IMMEDIATE")
+                    if pending_clear:
+                        self._db.execute("DELETE FROM entries")
+                    if deletes:
+                        self._db.executemany("DELETE FROM entries WHERE hash = ?", deletes)
+                    if upserts:
+                        self._db.executemany(self._UPSERT_SQL, upserts)
+                    for filename in orphans:
+                        (refs,) = self._db.execute(
+                            "SELECT COUNT(*) FROM entries WHERE filename = ?", (filename,)
+                        ).fetchone()
+                        if refs == 0:
+                            self._unlink_orphan(filename)
+            except sqlite3.Error:
+                # Diretório do cache removido antes da gravação adiada
+                pass
+
+    def close(self) -> None:
+        """Grava mudanças pendentes e fecha o índice SQLite."""
+        self._wait_index_ready()
+        self.flush()
+        with self._persist_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
 
     def _is_expired(self, entry_meta: dict[str, Any]) -> bool:
         """
@@ -359,67 +1046,190 @@ class PlanCache:
         ## Retorno:
 
         True se expirada, False caso contrário.
-        """
-        expires_at = entry_meta.get("expires_at")
-        if not expires_at:
-            return False
 
-        try:
-            expiry = datetime.fromisoformat(expires_at.replace("Z", "+00:00"))
-            return datetime.now(timezone.utc) > expiry
-        except (ValueError, TypeError):
-            return False
+        Usa `expires_at_ts` (Unix timestamp), calculado uma vez no store ou
+        no carregamento do índice, então não há parsing de data por chamada.
+        """
+        expires_at_ts = entry_meta.get("expires_at_ts")
+        return expires_at_ts is not None and time.time() > expires_at_ts
 
-    def _read_entry_file(self, filepath: Path, compressed: bool = False) -> dict[str, Any] | None:
+    def _read_entry_file(self, filepath: str | Path) -> dict[str, Any] | None:
         """
         Lê arquivo de entry, descomprimindo se necessário.
 
+        O formato (zstd, gzip ou JSON puro) é detectado pelo magic number,
+        independente da extensão do arquivo. Com orjson, entries não
+        comprimidas a partir de `ENTRY_MMAP_MIN_SIZE` são decodificadas
+        direto de um mmap, sem copiar o arquivo para um buffer.
+
         ## Parâmetros:
 
         - `filepath`: Caminho do arquivo
-        - `compressed`: Se arquivo está comprimido com gzip
 
         ## Retorno:
 
-        Dict da entry ou None se falhar.
+        Dict da entry ou None se falhar (arquivo ausente, corrompido ou
+        entry zstd sem o pacote `zstandard` instalado).
         """
         try:
-            if compressed or filepath.suffix == ".gz":
-                with gzip.open(filepath, "rt", encoding="utf-8") as f:
-                    return json.load(f)
-            else:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    return json.load(f)
-        except (json.JSONDecodeError, IOError, gzip.BadGzipFile):
+            with open(filepath, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if orjson is not None and size >= self.ENTRY_MMAP_MIN_SIZE:
+                    with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                        if mm[:2] != _GZIP_MAGIC and mm[:4] != _ZSTD_MAGIC:
+                            with memoryview(mm) as view:
+                                return orjson.loads(view)
+                data = f.read()
+            return _json_loads(_decompress(data))
+        except _ENTRY_READ_ERRORS:
             return None
 
-    def _write_entry_file(self, filepath: Path, entry: dict[str, Any], compress: bool = False) -> bool:
+    def _read_entry_plan(
+        self, filepath: str | Path, is_object: bool = False
+    ) -> dict[str, Any] | None:
         """
-        Escreve arquivo de entry, comprimindo se solicitado.
+        Lê apenas o plano de um arquivo de entry.
+
+        Com `is_object=True` o arquivo é um objeto do cache (o próprio
+        plano); senão é uma entry antiga, com o plano no campo `plan`.
+
+        Com ijson instalado, entries a partir de `ENTRY_STREAM_MIN_SIZE`
+        são decodificadas incrementalmente direto do arquivo (descomprimindo
+        em stream), materializando só o campo `plan` — sem o buffer do
+        arquivo inteiro nem os metadados. Demais casos usam
+        `_read_entry_file`.
+
+        ## Retorno:
+
+        Dict do plano ou None se falhar.
+        """
+        if ijson is not None:
+            try:
+                size = os.stat(filepath).st_size
+            except OSError:
+                return None
+            if size >= self.ENTRY_STREAM_MIN_SIZE:
+                try:
+                    with open(filepath, "rb") as raw:
+                        magic = raw.read(4)
+                        raw.seek(0)
+                        if magic == _ZSTD_MAGIC:
+                            if zstd is None:
+                                return None
+                            stream: Any = zstd.ZstdDecompressor().stream_reader(raw)
+                        elif magic[:2] == _GZIP_MAGIC:
+                            stream = gzip.GzipFile(fileobj=raw)
+                        else:
+                            stream = raw
+                        with stream:
+                            prefix = "" if is_object else "plan"
+                            return next(ijson.items(stream, prefix, use_float=True), None)
+                except (*_ENTRY_READ_ERRORS, ijson.JSONError):
+                    return None
+
+        entry = self._read_entry_file(filepath)
+        if entry is None or is_object:
+            return entry
+        return entry.get("plan")
+
+    def _is_object(self, filename: str) -> bool:
+        """Indica se o arquivo é um objeto endereçado pelo conteúdo."""
+        return filename.startswith(f"{self.OBJECTS_DIR}/")
+
+    def _acquire_object(self, plan: dict[str, Any]) -> tuple[str, int] | None:
+        """
+        Grava (ou reaproveita) o objeto de um plano e conta uma referência.
+
+        O nome vem do BLAKE2b-128 do JSON canônico do plano: planos
+        iguais, mesmo com chaves em outra ordem, viram o mesmo arquivo, e
+        um objeto já presente não é regravado.
+
+        ## Retorno:
+
+        Tupla (nome do arquivo relativo ao cache, tamanho em bytes), ou
+        None se a gravação falhar.
+        """
+        digest = _content_hash(plan).hex()
+        filename = f"{self.OBJECTS_DIR}/{digest[:2]}/{digest[2:]}{self.ENTRY_EXTENSIONS[self.codec]}"
+        file_lock = self._get_file_lock(filename)
+        with file_lock:
+            try:
+                size_bytes: int | None = os.stat(self._cache_dir_str + filename).st_size
+            except FileNotFoundError:
+                # Só na primeira gravação do objeto o Path é necessário
+                filepath = self.cache_dir / filename
+                filepath.parent.mkdir(parents=True, exist_ok=True)
+                size_bytes = self._write_entry_file(filepath, plan, self.codec)
+            except OSError:
+                size_bytes = None
+            if size_bytes is None:
+                return None
+            self._file_refs[filename] += 1
+        return filename, size_bytes
+
+    def _release_file(self, filename: str) -> None:
+        """
+        Descarta uma referência a um arquivo do cache, removendo-o quando
+        nenhuma entrada do índice aponta mais para ele.
+
+        Entries antigas (um arquivo por hash) saem na hora; objetos
+        compartilhados ficam para `flush()`, que confere as referências
+        no índice SQLite antes de removê-los.
+        """
+        file_lock = self._get_file_lock(filename)
+        with file_lock:
+            self._file_refs[filename] -= 1
+            if self._file_refs[filename] > 0:
+                return
+            del self._file_refs[filename]
+            if not self._is_object(filename):
+                try:
+                    os.unlink(self._cache_dir_str + filename)
+                except OSError:
+                    pass
+                return
+        self._mark_orphan(filename)
+
+    def _unlink_orphan(self, filename: str) -> None:
+        """Remove um objeto órfão, a menos que esta instância o tenha reaproveitado."""
+        file_lock = self._get_file_lock(filename)
+        with file_lock:
+            if self._file_refs[filename] > 0:
+                return
+            try:
+                os.unlink(self._cache_dir_str + filename)
+            except OSError:
+                pass
+
+    def _write_entry_file(
+        self,
+        filepath: Path,
+        entry: dict[str, Any],
+        codec: Literal["none", "gzip", "zstd"] = "none",
+    ) -> int | None:
+        """
+        Escreve arquivo de entry (ou objeto) em JSON compacto, comprimindo se solicitado.
+
+        A escrita é atômica (temporário + `os.replace`) e acontece antes
+        da atualização do índice: uma queda no meio deixa no máximo um
+        arquivo órfão, nunca um índice apontando para entry parcial.
 
         ## Parâmetros:
 
         - `filepath`: Caminho do arquivo
-        - `entry`: Dict da entry a salvar
-        - `compress`: Se deve comprimir com gzip
+        - `entry`: Dict a salvar (plano, para objetos)
+        - `codec`: "none", "gzip" ou "zstd"
 
         ## Retorno:
 
-        True se sucesso, False se falhar.
+        Tamanho gravado em bytes, ou None se falhar.
         """
+        data = _compress(_json_dumps(entry), codec)
         try:
-            if compress:
-                # Garante extensão .gz
-                if filepath.suffix != ".gz":
-                    filepath = filepath.with_suffix(filepath.suffix + ".gz")
-                with gzip.open(filepath, "wt", encoding="utf-8") as f:
-                    json.dump(entry, f, indent=2, ensure_ascii=False)
-            else:
-                with open(filepath, "w", encoding="utf-8") as f:
-                    json.dump(entry, f, indent=2, ensure_ascii=False)
-            return True
-        except IOError:
-            return False
+            _atomic_write_bytes(filepath, data, durable=self.DURABLE_WRITES)
+            return len(data)
+        except OSError:
+            return None
 
     def _compute_hash(
         self,
@@ -431,7 +1241,11 @@ class PlanCache:
         """
         Calcula hash único do input.
 
-        Usa SHA256 para garantir unicidade.
+        Usa BLAKE2b com digest de 8 bytes (16 caracteres hex): é um
+        fingerprint de cache, não uma assinatura, então resistência
+        criptográfica a colisões não é necessária — uma colisão forjada
+        apenas poluiria o cache. BLAKE2b vem na stdlib, então a chave é a
+        mesma em qualquer ambiente que compartilhe o cache global.
         Normaliza o input antes de hashear.
 
         ## Por que incluir provider/model?
@@ -447,21 +1261,16 @@ class PlanCache:
         - `base_url`: URL base da API
         - `provider`: Provedor LLM (ex: "openai", "xai")
         - `model`: Identificador do modelo (ex: "gpt-5.1", "grok-4")
-        """
-        # Normaliza: lowercase, trim
-        parts = [
-            requirements.strip().lower(),
-            base_url.strip().lower(),
-        ]
 
-        # Inclui provider/model se fornecidos (backward compatible)
-        if provider:
-            parts.append(f"provider:{provider.strip().lower()}")
-        if model:
-            parts.append(f"model:{model.strip().lower()}")
+        ## Memoização:
 
-        normalized = "|".join(parts)
-        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+        Inputs repetidos vêm de um LRU de processo (`_cache_key_memo`).
+        Requisitos acima de `_CACHE_KEY_MEMO_MAX_LEN` caracteres não são
+        memoizados, para o LRU não reter strings arbitrariamente grandes.
+        """
+        if len(requirements) <= _CACHE_KEY_MEMO_MAX_LEN:
+            return _cache_key_memo(requirements, base_url, provider, model)
+        return _cache_key(requirements, base_url, provider, model)
 
     def get(
         self,
@@ -473,7 +1282,9 @@ class PlanCache:
         """
         Busca plano no cache.
 
-        Thread-safe: usa lock por hash para acesso concorrente.
+        Thread-safe e sem locks no caminho comum (entry presente e
+        válida); locks só são usados para remover entries expiradas ou
+        sem arquivo.
         Respeita TTL: entries expiradas retornam None.
 
         ## Parâmetros:
@@ -495,45 +1306,57 @@ class PlanCache:
         """
         if not self.enabled:
             return None
+        self._wait_index_ready()
 
         hash_key = self._compute_hash(requirements, base_url, provider, model)
-        hash_lock = self._get_hash_lock(hash_key)
+        shard_lock, shard = self._shard_for(hash_key)
 
-        with hash_lock:
-            with self._index_lock:
-                if hash_key not in self._index:
-                    return None
-                entry_meta = self._index[hash_key]
-
-                # Verifica expiração
-                if self._is_expired(entry_meta):
-                    # Remove entry expirada
-                    filename = entry_meta["filename"]
-                    filepath = self.cache_dir / filename
-                    if filepath.exists():
-                        filepath.unlink()
-                    del self._index[hash_key]
-                    self._save_index()
-                    return None
-
-                filename = entry_meta["filename"]
-                compressed = entry_meta.get("compressed", False)
-
-            filepath = self.cache_dir / filename
+        # Leitura sem lock: dict.get é atômico e metadados nunca são
+        # mutados no lugar (store publica um dict novo)
+        entry_meta = shard.get(hash_key)
+        if entry_meta is None:
+            return None
 
-            if not filepath.exists():
-                # Arquivo foi deletado, limpa índice
-                with self._index_lock:
-                    if hash_key in self._index:
-                        del self._index[hash_key]
-                        self._save_index()
-                return None
+        if self._is_expired(entry_meta):
+            # Remove entry expirada (caminho de escrita: usa locks e só
+            # remove se ninguém regravou a entrada nesse meio tempo)
+            hash_lock = self._get_hash_lock(hash_key)
+            with hash_lock:
+                with shard_lock:
+                    removed = shard.get(hash_key) is entry_meta
+                    if removed:
+                        del shard[hash_key]
+                if removed:
+                    self._access.pop(hash_key, None)
+                    self._memo_discard(hash_key)
+                    self._release_file(entry_meta["filename"])
+                    self._mark_dirty(hash_key)
+            return None
 
-            entry = self._read_entry_file(filepath, compressed)
-            if entry:
-                return entry.get("plan")
+        self._access[hash_key] = next(self._access_clock)
+
+        memo = self._memo_get(hash_key)
+        if memo is not None:
+            return _json_loads(memo)
+
+        # Abre direto (sem exists() antes): arquivo ausente ou ilegível
+        # vira miss, e a entrada sai do índice na próxima gravação
+        filename = entry_meta["filename"]
+        plan = self._read_entry_plan(self._cache_dir_str + filename, self._is_object(filename))
+        if plan is None:
+            with shard_lock:
+                removed = shard.get(hash_key) is entry_meta
+                if removed:
+                    del shard[hash_key]
+            if removed:
+                self._access.pop(hash_key, None)
+                self._release_file(entry_meta["filename"])
+                self._mark_dirty(hash_key)
             return None
 
+        self._memo_put(hash_key, _json_dumps(plan), entry_meta)
+        return plan
+
     def store(
         self,
         requirements: str,
@@ -568,49 +1391,145 @@ class PlanCache:
         """
         if not self.enabled:
             return ""
+        self._wait_index_ready()
 
         hash_key = self._compute_hash(requirements, base_url, provider, model)
         hash_lock = self._get_hash_lock(hash_key)
 
-        # Define nome do arquivo com extensão apropriada
-        extension = ".json.gz" if self.compress else ".json"
-        filename = f"{hash_key}{extension}"
-        filepath = self.cache_dir / filename
+        # Datas calculadas fora do lock, a partir de uma única leitura do relógio
+        now_ns = time.time_ns()
+        created_at = _utc_iso(now_ns)
+        expires_at: str | None = None
+        expires_at_ts: float | None = None
+        if self.ttl_days is not None:
+            # Em microssegundos inteiros: timestamp e string representam o
+            # mesmo instante (igual a datetime.fromisoformat(...).timestamp())
+            expiry_us = now_ns // 1000 + self.ttl_days * 86_400 * 1_000_000
+            expires_at = _utc_iso(expiry_us * 1000)
+            expires_at_ts = expiry_us / 1_000_000
 
         with hash_lock:
-            # Calcula data de expiração se TTL definido
-            expires_at: str | None = None
-            if self.ttl_days is not None:
-                expiry = datetime.now(timezone.utc) + timedelta(days=self.ttl_days)
-                expires_at = expiry.isoformat().replace("+00:00", "Z")
-
-            # Cria entrada
-            entry: dict[str, Any] = {
-                "hash": hash_key,
-                "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            # Salva (ou reaproveita) o objeto do plano
+            acquired = self._acquire_object(plan)
+            if acquired is None:
+                return ""
+            filename, size_bytes = acquired
+
+            # Atualiza índice com metadados; os dados do input ficam no
+            # índice, já que o objeto pode ser compartilhado
+            entry_meta = {
+                "filename": filename,
                 "expires_at": expires_at,
-                "input_summary": requirements[:100] + ("..." if len(requirements) > 100 else ""),
-                "base_url": base_url,
-                "provider": provider,
-                "model": model,
+                "expires_at_ts": expires_at_ts,
                 "compressed": self.compress,
-                "plan": plan,
+                "size_bytes": size_bytes,
+                "details": {
+                    "created_at": created_at,
+                    "input_summary": requirements[:100] + ("..." if len(requirements) > 100 else ""),
+                    "base_url": base_url,
+                    "provider": provider,
+                    "model": model,
+                },
             }
+            shard_lock, shard = self._shard_for(hash_key)
+            with shard_lock:
+                previous = shard.get(hash_key)
+                shard[hash_key] = entry_meta
+            self._access[hash_key] = next(self._access_clock)
+            # Depois de publicar os metadados novos: ver _memo_put
+            self._memo_discard(hash_key)
+            self._mark_dirty(hash_key, entry_meta)
+            if previous is not None:
+                self._release_file(previous["filename"])
+
+        # Fora do lock do hash: a remoção toma locks de outros hashes
+        if previous is None:
+            self._evict_if_needed()
 
-            # Salva arquivo
-            if not self._write_entry_file(filepath, entry, self.compress):
-                return ""
+        return hash_key
 
-            # Atualiza índice com metadados
-            with self._index_lock:
-                self._index[hash_key] = {
-                    "filename": filename,
-                    "expires_at": expires_at,
-                    "compressed": self.compress,
-                }
-                self._save_index()
+    def _evict_if_needed(self) -> None:
+        """
+        Remove as entradas usadas há mais tempo se o cache passou de `max_entries`.
 
-        return hash_key
+        Remove de uma vez até `EVICT_TARGET` do limite, para não rodar a
+        cada `store`. Uma thread por vez; as demais seguem sem esperar.
+        """
+        if self.max_entries is None:
+            return
+        total = sum(len(shard) for _, shard in self._shards)
+        if total <= self.max_entries:
+            return
+        if not self._evict_lock.acquire(blocking=False):
+            return
+        try:
+            keep = int(self.max_entries * self.EVICT_TARGET)
+            # Um get concorrente pode ter registrado acesso a um hash já
+            # removido: esses são descartados em vez de contar como vítimas
+            candidates = []
+            for hash_key, tick in self._access.copy().items():
+                if hash_key in self._shard_for(hash_key)[1]:
+                    candidates.append((hash_key, tick))
+                else:
+                    self._access.pop(hash_key, None)
+            victims = heapq.nsmallest(
+                len(candidates) - keep, candidates, key=itemgetter(1)
+            )
+            for hash_key, _ in victims:
+                hash_lock = self._get_hash_lock(hash_key)
+                shard_lock, shard = self._shard_for(hash_key)
+                with hash_lock:
+                    with shard_lock:
+                        entry_meta = shard.pop(hash_key, None)
+                    self._access.pop(hash_key, None)
+                    if entry_meta is None:
+                        continue
+                    self._memo_discard(hash_key)
+                    self._release_file(entry_meta["filename"])
+                    self._mark_dirty(hash_key)
+        finally:
+            self._evict_lock.release()
+
+    def prettify(self, hash_key: str) -> str | None:
+        """
+        Retorna uma entry do cache como JSON indentado, para inspeção.
+
+        Os arquivos de entry são gravados em JSON compacto (e possivelmente
+        comprimidos); este método descomprime e reformata com indentação
+        apenas quando o conteúdo é para humanos. O arquivo não é alterado.
+
+        ## Parâmetros:
+
+        - `hash_key`: Hash da entry (retornado por `store`)
+
+        ## Retorno:
+
+        String JSON da entry ou None se não existir.
+        """
+        if not self.enabled:
+            return None
+        self._wait_index_ready()
+
+        entry_meta = self._shard_for(hash_key)[1].get(hash_key)
+        if entry_meta is None:
+            return None
+        entry = self._read_entry_file(self.cache_dir / entry_meta["filename"])
+        if entry is None:
+            return None
+        if self._is_object(entry_meta["filename"]):
+            # Objeto guarda só o plano: junta os metadados do índice
+            entry = {
+                "hash": hash_key,
+                **(entry_meta.get("details") or {}),
+                "expires_at": entry_meta["expires_at"],
+                "compressed": entry_meta["compressed"],
+                "object": entry_meta["filename"],
+                "plan": entry,
+            }
+        if orjson is not None:
+            # Saída idêntica a json.dumps(indent=2, ensure_ascii=False)
+            return orjson.dumps(entry, option=orjson.OPT_INDENT_2).decode("utf-8")
+        return json.dumps(entry, indent=2, ensure_ascii=False)
 
     def invalidate(
         self,
@@ -637,26 +1556,26 @@ class PlanCache:
         """
         if not self.enabled:
             return False
+        self._wait_index_ready()
 
         hash_key = self._compute_hash(requirements, base_url, provider, model)
         hash_lock = self._get_hash_lock(hash_key)
 
+        shard_lock, shard = self._shard_for(hash_key)
+
         with hash_lock:
-            with self._index_lock:
-                if hash_key not in self._index:
-                    return False
+            # Remove do índice
+            with shard_lock:
+                entry_meta = shard.pop(hash_key, None)
+            self._access.pop(hash_key, None)
+            self._memo_discard(hash_key)
+            if entry_meta is None:
+                return False
 
-                entry_meta = self._index[hash_key]
-                filename = entry_meta["filename"]
-                filepath = self.cache_dir / filename
+            # Remove arquivo (se nenhuma outra entrada usa o mesmo objeto)
+            self._release_file(entry_meta["filename"])
 
-                # Remove arquivo
-                if filepath.exists():
-                    filepath.unlink()
-
-                # Remove do índice
-                del self._index[hash_key]
-                self._save_index()
+            self._mark_dirty(hash_key)
 
         return True
 
@@ -664,7 +1583,7 @@ class PlanCache:
         """
         Limpa todo o cache.
 
-        Thread-safe: usa lock global para limpeza completa.
+        Thread-safe: esvazia cada shard sob seu próprio lock.
 
         ## Retorno:
 
@@ -672,26 +1591,38 @@ class PlanCache:
         """
         if not self.enabled:
             return 0
+        self._wait_index_ready()
+
+        # Limpa índice, shard a shard
+        removed: list[dict[str, Any]] = []
+        for lock, shard in self._shards:
+            with lock:
+                removed.extend(shard.values())
+                shard.clear()
+
+        # Limpa o índice antes de liberar os arquivos: os objetos são
+        # conferidos contra ele no mesmo flush
+        self._mark_dirty()
+
+        # Remove todos os arquivos (objetos compartilhados uma vez só)
+        for filename in {entry_meta["filename"] for entry_meta in removed}:
+            file_lock = self._get_file_lock(filename)
+            with file_lock:
+                self._file_refs.pop(filename, None)
+                if not self._is_object(filename):
+                    try:
+                        os.unlink(self._cache_dir_str + filename)
+                    except OSError:
+                        pass
+                    continue
+            self._mark_orphan(filename)
 
-        with self._index_lock:
-            count = len(self._index)
-
-            # Remove todos os arquivos
-            for entry_meta in self._index.values():
-                filename = entry_meta["filename"]
-                filepath = self.cache_dir / filename
-                if filepath.exists():
-                    filepath.unlink()
-
-            # Limpa índice
-            self._index = {}
-            self._save_index()
-
-            # Limpa locks de hash (já que não há mais entradas)
-            with self._hash_locks_lock:
-                self._hash_locks.clear()
+        # Limpa LRUs (já que não há mais entradas)
+        self._access.clear()
+        with self._memo_lock:
+            self._memo.clear()
 
-        return count
+        return len(removed)
 
     def cleanup_expired(self) -> int:
         """
@@ -699,7 +1630,10 @@ class PlanCache:
 
         Útil para manutenção periódica do cache.
 
-        Thread-safe: usa lock global para consistência.
+        Thread-safe: varre cada shard sob seu próprio lock.
+
+        A expiração é uma comparação de `expires_at_ts` contra o instante
+        atual (lido uma vez), sem parsear datas por entry.
 
         ## Retorno:
 
@@ -707,31 +1641,33 @@ class PlanCache:
         """
         if not self.enabled:
             return 0
-
-        with self._index_lock:
-            expired_keys = [
-                key for key, meta in self._index.items()
-                if self._is_expired(meta)
-            ]
-
-            for hash_key in expired_keys:
-                entry_meta = self._index[hash_key]
-                filename = entry_meta["filename"]
-                filepath = self.cache_dir / filename
-                if filepath.exists():
-                    filepath.unlink()
-                del self._index[hash_key]
-
-            if expired_keys:
-                self._save_index()
-
-            return len(expired_keys)
+        self._wait_index_ready()
+
+        now = time.time()
+        expired: list[tuple[str, dict[str, Any]]] = []
+        for lock, shard in self._shards:
+            with lock:
+                expired_keys = [
+                    key for key, meta in shard.items()
+                    if (expires_at_ts := meta.get("expires_at_ts")) is not None
+                    and expires_at_ts < now
+                ]
+                for hash_key in expired_keys:
+                    expired.append((hash_key, shard.pop(hash_key)))
+
+        for hash_key, entry_meta in expired:
+            self._access.pop(hash_key, None)
+            self._memo_discard(hash_key)
+            self._release_file(entry_meta["filename"])
+            self._mark_dirty(hash_key)
+
+        return len(expired)
 
     def stats(self) -> CacheStats:
         """
         Retorna estatísticas detalhadas do cache.
 
-        Thread-safe: usa lock para leitura consistente.
+        Thread-safe: lê cada shard sob seu próprio lock.
 
         ## Retorno:
 
@@ -750,31 +1686,104 @@ class PlanCache:
                 cache_dir=str(self.cache_dir),
             )
 
-        with self._index_lock:
-            total_size = 0
-            expired_count = 0
-            compressed_count = 0
+        self._wait_index_ready()
+        total_size = 0
+        expired_count = 0
+        compressed_count = 0
 
-            for entry_meta in self._index.values():
-                if self._is_expired(entry_meta):
-                    expired_count += 1
+        index = self._index
+        counted_files: set[str] = set()
+        for entry_meta in index.values():
+            if self._is_expired(entry_meta):
+                expired_count += 1
 
-                if entry_meta.get("compressed", False):
-                    compressed_count += 1
+            if entry_meta.get("compressed", False):
+                compressed_count += 1
 
-                filename = entry_meta["filename"]
-                filepath = self.cache_dir / filename
-                if filepath.exists():
-                    total_size += filepath.stat().st_size
+            # Objeto compartilhado por várias entradas ocupa disco uma vez
+            if entry_meta["filename"] in counted_files:
+                continue
+            counted_files.add(entry_meta["filename"])
 
-            return CacheStats(
-                enabled=True,
-                entries=len(self._index),
-                expired_entries=expired_count,
-                cache_dir=str(self.cache_dir),
-                size_bytes=total_size,
-                compressed_entries=compressed_count,
-            )
+            # Tamanho registrado no store; entries antigas sem ele usam stat
+            size_bytes = entry_meta.get("size_bytes")
+            if size_bytes is None:
+                try:
+                    size_bytes = os.stat(self._cache_dir_str + entry_meta["filename"]).st_size
+                except OSError:
+                    size_bytes = 0
+            total_size += size_bytes
+
+        return CacheStats(
+            enabled=True,
+            entries=len(index),
+            expired_entries=expired_count,
+            cache_dir=str(self.cache_dir),
+            size_bytes=total_size,
+            compressed_entries=compressed_count,
+        )
+
+
+class NullPlanCache(PlanCache):
+    """
+    Cache desabilitado: todas as operações são no-ops.
+
+    Retornado por `PlanCache.global_cache`/`local_cache` com
+    `enabled=False`. Não cria diretório, índice, locks nem threads, e cada
+    método retorna direto, sem calcular hash nem consultar o índice.
+
+    ## Exemplo:
+
+        >>> cache = PlanCache.local_cache(enabled=False)
+        >>> cache.get("teste API login", "https://api.example.com") is None
+        True
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = ".brain_cache",
+        enabled: bool = False,
+        ttl_days: int | None = None,
+        compress: bool = False,
+        max_entries: int | None = None,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = False
+        self.ttl_days = ttl_days
+        self.compress = compress
+        self.max_entries = max_entries
+        self.codec = "none"
+
+    @property
+    def _index(self) -> dict[str, dict[str, Any]]:
+        return {}
+
+    def get(self, *args: Any, **kwargs: Any) -> dict[str, Any] | None:
+        return None
+
+    def store(self, *args: Any, **kwargs: Any) -> str:
+        return ""
+
+    def invalidate(self, *args: Any, **kwargs: Any) -> bool:
+        return False
+
+    def prettify(self, hash_key: str) -> str | None:
+        return None
+
+    def clear(self) -> int:
+        return 0
+
+    def cleanup_expired(self) -> int:
+        return 0
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> CacheStats:
+        return CacheStats(enabled=False, entries=0, cache_dir=str(self.cache_dir))
 
 
 # =============================================================================
@@ -789,7 +1798,7 @@ class ExecutionRecord:
 
     ## Atributos:
 
-    - `id`: ID único da execução (UUID)
+    - `id`: ID único da execução (timestamp em ms + sequência, em hex)
     - `timestamp`: Data/hora da execução
     - `plan_file`: Arquivo do plano executado
     - `plan_hash`: Hash do plano (se cacheado)
@@ -812,6 +1821,77 @@ class ExecutionRecord:
     runner_report: dict[str, Any] | None = None
 
 
+@dataclass(slots=True)
+class _PendingFrame:
+    """Frame aguardando gravação no log de registros (group commit)."""
+    path: Path
+    frame: bytes
+    length: int
+    offset: int | None = None
+    error: OSError | None = None
+
+
+@dataclass(slots=True)
+class HistoryIndexEntry:
+    """
+    Entrada do índice do histórico: metadados de uma execução, sem o
+    runner_report, mais a localização do registro completo.
+
+    Com `slots=True` cada entrada ocupa um array fixo de atributos em vez
+    de um dict por entrada (o índice mantém até `max_records` delas).
+
+    ## Atributos:
+
+    - `file`: Arquivo do registro, relativo ao diretório do histórico
+    - `offset`/`length`: Posição do payload no log do dia (None para
+      registros legados em arquivo individual)
+    - Demais campos: os mesmos de `ExecutionRecord`
+    """
+    id: str
+    timestamp: str = ""
+    plan_file: str = ""
+    plan_hash: str | None = None
+    duration_ms: int = 0
+    total_steps: int = 0
+    passed_steps: int = 0
+    failed_steps: int = 0
+    status: str | None = None
+    file: str = ""
+    offset: int | None = None
+    length: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HistoryIndexEntry:
+        """Cria entrada a partir de um dict do índice, ignorando chaves desconhecidas."""
+        return cls(**{k: data[k] for k in cls.__slots__ if k in data})
+
+    def to_public_dict(self) -> dict[str, Any]:
+        """
+        Converte para o dict exposto pela API e pelo CLI: só os metadados
+        da execução, sem a localização do registro no disco.
+        """
+        return {
+            "id": self.id,
+            "timestamp": self.timestamp,
+            "plan_file": self.plan_file,
+            "plan_hash": self.plan_hash,
+            "duration_ms": self.duration_ms,
+            "total_steps": self.total_steps,
+            "passed_steps": self.passed_steps,
+            "failed_steps": self.failed_steps,
+            "status": self.status,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Converte para a linha gravada no index.log (com a localização do registro)."""
+        data = self.to_public_dict()
+        data["file"] = self.file
+        if self.offset is not None:
+            data["offset"] = self.offset
+            data["length"] = self.length
+        return data
+
+
 class ExecutionHistory:
     """
     Armazena histórico de execuções para análise e debugging.
@@ -823,14 +1903,28 @@ class ExecutionHistory:
 
     ```
     ~/.aqa/history/
-    ├── index.json           # Índice com metadados de todas execuções
+    ├── index.log            # Índice NDJSON append-only (metadados)
     ├── 2024-01-15/          # Subdiretório por data
-    │   ├── abc123.json      # Execução individual
-    │   └── def456.json
+    │   └── records.log      # Log append-only com os registros do dia
     └── 2024-01-16/
         └── ...
     ```
 
+    Cada registro é anexado ao `records.log` do dia como um frame
+    `<tamanho uint32 LE><payload>`, onde o payload é o JSON do registro
+    (comprimido com zstd, ou gzip sem zstandard, quando `compress=True`;
+    o formato é detectado pelo magic number na leitura). O índice guarda o
+    offset e o tamanho do payload, então `get_full_record` lê o registro
+    com um único `pread` — sem um arquivo (e um inode) por execução.
+    Registros antigos em arquivos individuais (`abc123.json[.gz]`)
+    continuam legíveis.
+
+    O índice também é append-only: cada execução anexa uma linha JSON ao
+    `index.log` e remoções anexam um marcador `{"deleted": id}`. O log é
+    compactado (reescrito só com as entradas vivas) quando passa de
+    `2 * max_records` linhas, então o custo por inserção é O(1) amortizado.
+    Um `index.json` legado é migrado na primeira abertura.
+
     ## Exemplo:
 
         >>> history = ExecutionHistory()
@@ -847,7 +1941,22 @@ class ExecutionHistory:
         >>> recent = history.get_recent(limit=10)
     """
 
-    INDEX_FILE = "index.json"
+    INDEX_FILE = "index.json"  # formato legado, migrado para INDEX_LOG
+    INDEX_LOG = "index.log"
+    RECORDS_FILE = "records.log"
+
+    # Cabeçalho de cada frame do log: tamanho do payload (uint32 little-endian)
+    _FRAME_HEADER = struct.Struct("<I")
+
+    DURABLE_WRITES = False  # fsync dos logs após cada gravação (mais lento)
+
+    # LRU de registros completos (JSON descomprimido) lidos por get_full_record
+    MEMO_SIZE = 128
+    MEMO_MIN_HITS = 2
+
+    # Sequência para IDs; começa em ponto aleatório para que processos
+    # distintos no mesmo milissegundo não gerem o mesmo ID
+    _id_counter = itertools.count(int.from_bytes(os.urandom(2), "little"))
 
     def __init__(
         self,
@@ -864,7 +1973,7 @@ class ExecutionHistory:
         - `history_dir`: Diretório para histórico (default: ~/.aqa/history)
         - `enabled`: Se False, histórico é desabilitado
         - `max_records`: Número máximo de registros a manter
-        - `compress`: Se True, comprime registros antigos
+        - `compress`: Se True, comprime registros (zstd se disponível, senão gzip)
         """
         if history_dir:
             self.history_dir = Path(history_dir)
@@ -874,8 +1983,37 @@ class ExecutionHistory:
         self.enabled = enabled
         self.max_records = max_records
         self.compress = compress
-        self._index: list[dict[str, Any]] = []
+        # Codec dos registros gravados por esta instância
+        self.codec: Literal["none", "gzip", "zstd"] = "none"
+        if compress:
+            self.codec = "zstd" if zstd is not None else "gzip"
+        self._index: list[HistoryIndexEntry] = []
+        # _lock protege as estruturas em memória (leituras e mutações, rápidas);
+        # _write_lock serializa escritores e a escrita do index.log. Escritores
+        # adquirem _write_lock antes de _lock e fazem o I/O só com _write_lock,
+        # então leitores nunca esperam por disco.
         self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._log_lines = 0  # Linhas no index.log (vivas + obsoletas)
+        # Contagem de entradas por status, mantida junto com _index
+        self._status_counts: Counter[str | None] = Counter()
+        # Entradas por status, do mais recente ao mais antigo (mesma ordem de _index)
+        self._by_status: dict[str | None, deque[HistoryIndexEntry]] = {}
+        # Entrada do índice por ID do registro
+        self._by_id: dict[str, HistoryIndexEntry] = {}
+        # LRU de registros completos e contagem de acessos fora dele
+        self._memo: OrderedDict[str, bytes] = OrderedDict()
+        self._memo_hits: Counter[str] = Counter()
+        self._memo_lock = threading.Lock()
+        # Log do dia → escritores entre a gravação do frame e a entrada no
+        # índice; _release_storage não remove esses logs. Protegido por
+        # _logs_lock, mantido também durante a remoção dos logs
+        self._appending: Counter[str] = Counter()
+        self._logs_lock = threading.Lock()
+        # Fila de frames para o group commit do log de registros
+        self._commit_queue: list[_PendingFrame] = []
+        self._commit_queue_lock = threading.Lock()
+        self._commit_lock = threading.Lock()
 
         if enabled:
             self._ensure_dir()
@@ -886,26 +2024,354 @@ class ExecutionHistory:
         self.history_dir.mkdir(parents=True, exist_ok=True)
 
     def _load_index(self) -> None:
-        """Carrega índice do disco."""
-        with self._lock:
-            index_path = self.history_dir / self.INDEX_FILE
-            if index_path.exists():
+        """
+        Carrega índice do disco reproduzindo o index.log.
+
+        Linhas são aplicadas em ordem (entradas e marcadores de remoção);
+        linhas ilegíveis, como uma última linha truncada por uma queda,
+        são ignoradas. Mantém apenas as `max_records` entradas mais recentes.
+        """
+        with self._write_lock, self._lock:
+            log_path = self.history_dir / self.INDEX_LOG
+            legacy_path = self.history_dir / self.INDEX_FILE
+
+            if not log_path.exists() and legacy_path.exists():
+                self._migrate_legacy_index(legacy_path)
+            else:
+                self._replay_index_log(log_path)
+            self._reindex()
+
+    def _replay_index_log(self, log_path: Path) -> None:
+        """
+        Reconstrói _index a partir das linhas do index.log.
+
+        DEVE ser chamada com _write_lock e _lock adquiridos.
+        """
+        entries: dict[str, HistoryIndexEntry] = {}
+        lines = 0
+        torn = False
+
+        def apply(line: bytes | memoryview) -> None:
+            try:
+                item = _json_loads(line)
+            except ValueError:
+                return
+            if not isinstance(item, dict):
+                return
+            if "deleted" in item:
+                entries.pop(item["deleted"], None)
+            elif "id" in item:
+                entries[item["id"]] = HistoryIndexEntry.from_dict(item)
+
+        try:
+            with open(log_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if orjson is not None and size > 0:
+                    # Decodifica cada linha direto das páginas mapeadas,
+                    # sem copiar o log para buffers Python
+                    with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                        with memoryview(mm) as view:
+                            start = 0
+                            while start < size:
+                                end = mm.find(b"\n", start)
+                                if end == -1:
+                                    end = size
+                                    torn = True
+                                lines += 1
+                                apply(view[start:end])
+                                start = end + 1
+                else:
+                    for line in f:
+                        lines += 1
+                        torn = not line.endswith(b"\n")
+                        apply(line)
+        except OSError:
+            pass
+
+        # Log em ordem cronológica; índice em memória do mais recente
+        self._index = list(reversed(entries.values()))[:self.max_records]
+        self._log_lines = lines
+
+        # Sem o "\n" final, a próxima linha anexada se fundiria à parcial
+        if torn:
+            self._compact_index()
+
+    def _reindex(self) -> None:
+        """
+        Reconstrói as estruturas derivadas de _index (contadores e listas
+        por status, mapa por ID) e esvazia o LRU de registros.
+
+        DEVE ser chamada com _lock adquirido.
+        """
+        self._status_counts = Counter(e.status for e in self._index)
+        self._by_id = {e.id: e for e in self._index}
+        self._memo_discard()
+        self._by_status = {}
+        for entry in self._index:
+            self._by_status.setdefault(entry.status, deque()).append(entry)
+
+    def _remember(self, entry: HistoryIndexEntry) -> None:
+        """
+        Atualiza as estruturas derivadas para uma entrada nova no topo de _index.
+
+        DEVE ser chamada com _lock adquirido.
+        """
+        self._status_counts[entry.status] += 1
+        self._by_status.setdefault(entry.status, deque()).appendleft(entry)
+        self._by_id[entry.id] = entry
+
+    def _forget(self, entries: list[HistoryIndexEntry]) -> None:
+        """
+        Atualiza as estruturas derivadas para entradas que saíram de _index.
+
+        DEVE ser chamada com _lock adquirido.
+        """
+        self._memo_discard([e.id for e in entries])
+        # Das mais antigas para as mais novas, para casar com o fim das deques
+        for entry in reversed(entries):
+            self._by_id.pop(entry.id, None)
+            self._status_counts[entry.status] -= 1
+            bucket = self._by_status.get(entry.status)
+            if not bucket:
+                continue
+            # Trim remove as mais antigas: caso comum é o fim da deque
+            if bucket[-1] is entry:
+                bucket.pop()
+            else:
+                bucket.remove(entry)
+
+    def _migrate_legacy_index(self, legacy_path: Path) -> None:
+        """
+        Converte um index.json legado para index.log e remove o arquivo.
+
+        Com ijson, o arquivo é lido incrementalmente e o parse para nas
+        `max_records` primeiras entradas (as mais recentes), então um
+        índice legado enorme não é materializado inteiro em memória.
+
+        DEVE ser chamada com _write_lock e _lock adquiridos.
+        """
+        try:
+            if ijson is not None:
+                # Parse incremental: para em max_records sem materializar o resto
+                with open(legacy_path, "rb") as f:
+                    legacy = list(islice(ijson.items(f, "item", use_float=True), self.max_records))
+            else:
+                legacy = (_read_json_file(legacy_path) or [])[:self.max_records]
+            self._index = [HistoryIndexEntry.from_dict(e) for e in legacy]
+        except (ValueError, OSError, TypeError, KeyError, *_IJSON_ERRORS):
+            self._index = []
+        self._compact_index()
+        try:
+            legacy_path.unlink()
+        except OSError:
+            pass
+
+    def _append_index(self, items: list[dict[str, Any]]) -> None:
+        """
+        Anexa linhas ao index.log, compactando quando ele fica grande.
+
+        DEVE ser chamada com _write_lock adquirido.
+        """
+        data = b"".join(_json_dumps(item) + b"\n" for item in items)
+        with open(self.history_dir / self.INDEX_LOG, "ab") as f:
+            f.write(data)
+            if self.DURABLE_WRITES:
+                f.flush()
+                os.fsync(f.fileno())
+        self._log_lines += len(items)
+
+        if self._log_lines > 2 * self.max_records:
+            self._compact_index()
+
+    def _compact_index(self) -> None:
+        """
+        Reescreve o index.log apenas com as entradas vivas.
+
+        DEVE ser chamada com _write_lock adquirido.
+        """
+        data = b"".join(_json_dumps(e.to_dict()) + b"\n" for e in reversed(self._index))
+        _atomic_write_bytes(self.history_dir / self.INDEX_LOG, data, durable=self.DURABLE_WRITES)
+        self._log_lines = len(self._index)
+
+    def _generate_id(self) -> str:
+        """
+        Gera ID único para execução.
+
+        Formato: 11 hex do timestamp em ms + 4 hex de uma sequência, o que
+        torna os IDs ordenáveis por tempo e evita ler os.urandom por chamada.
+        """
+        return f"{int(time.time() * 1000):011x}{next(self._id_counter) & 0xFFFF:04x}"
+
+    def _append_record(self, date_dir: Path, payload: bytes) -> tuple[int, int]:
+        """
+        Anexa um frame ao log de registros do dia (group commit).
+
+        O frame entra numa fila; o primeiro escritor a obter `_commit_lock`
+        grava todos os frames pendentes de cada log em um único `write` (e
+        um único `fsync`, com `DURABLE_WRITES`). Escritores concorrentes que
+        chegam durante essa gravação têm seus frames gravados pelo próximo
+        líder, compartilhando a syscall e o fsync. Não há espera por timer:
+        um escritor sozinho grava imediatamente.
+
+        `record_execution` chama esta função sem _write_lock, com o log
+        marcado em `_appending` (ver `_release_storage`).
+
+        ## Retorno:
+
+        Tupla (offset do payload, tamanho do payload).
+        """
+        pending = _PendingFrame(
+            date_dir / self.RECORDS_FILE,
+            self._FRAME_HEADER.pack(len(payload)) + payload,
+            len(payload),
+        )
+        with self._commit_queue_lock:
+            self._commit_queue.append(pending)
+
+        with self._commit_lock:
+            if pending.offset is None and pending.error is None:
+                with self._commit_queue_lock:
+                    batch, self._commit_queue = self._commit_queue, []
+                self._commit_batch(batch)
+
+        if pending.error is not None:
+            raise pending.error
+        return pending.offset, pending.length
+
+    def _commit_batch(self, batch: list[_PendingFrame]) -> None:
+        """
+        Grava um lote de frames, um `write` por log. DEVE ser chamada com
+        _commit_lock adquirido.
+
+        Com O_APPEND, o bloco inteiro cai no final do arquivo mesmo com
+        outros processos anexando; a posição do fd após a escrita dá o
+        offset de cada frame dentro do bloco.
+        """
+        by_path: dict[Path, list[_PendingFrame]] = {}
+        for pending in batch:
+            by_path.setdefault(pending.path, []).append(pending)
+
+        for path, frames in by_path.items():
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                try:
+                    view = memoryview(b"".join(f.frame for f in frames))
+                    total = len(view)
+                    while view:
+                        written = os.write(fd, view)
+                        view = view[written:]
+                    end = os.lseek(fd, 0, os.SEEK_CUR)
+                    if self.DURABLE_WRITES:
+                        os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                for f in frames:
+                    f.error = e
+                continue
+
+            position = end - total
+            for f in frames:
+                position += len(f.frame)
+                f.offset = position - f.length
+
+    def _read_record(self, entry: HistoryIndexEntry) -> bytes | None:
+        """
+        Lê o JSON (descomprimido) do registro apontado por uma entrada do índice.
+
+        Entradas com `offset` apontam para um frame do log do dia; as
+        demais são registros legados em arquivo individual. O formato do
+        payload (zstd, gzip ou JSON puro) é detectado pelo magic number.
+        """
+        file_path = self.history_dir / entry.file
+        try:
+            if entry.offset is not None:
+                fd = os.open(file_path, os.O_RDONLY)
+                try:
+                    data = os.pread(fd, entry.length, entry.offset)
+                finally:
+                    os.close(fd)
+                if len(data) != entry.length:
+                    return None
+            else:
+                data = file_path.read_bytes()
+            return _decompress(data)
+        except _ENTRY_READ_ERRORS:
+            return None
+
+    def _memo_get(self, record_id: str) -> bytes | None:
+        """
+        Retorna o JSON de um registro do LRU, ou None (contando o acesso).
+        """
+        with self._memo_lock:
+            data = self._memo.get(record_id)
+            if data is not None:
+                self._memo.move_to_end(record_id)
+            else:
+                self._memo_hits[record_id] += 1
+            return data
+
+    def _memo_put(self, record_id: str, data: bytes) -> None:
+        """
+        Insere o JSON de um registro no LRU, descartando o mais antigo.
+
+        Só admite registros pedidos pelo menos `MEMO_MIN_HITS` vezes, para
+        que consultas únicas (ex: varrer o histórico) não expulsem os
+        registros realmente consultados de novo.
+        """
+        with self._memo_lock:
+            if self._memo_hits[record_id] < self.MEMO_MIN_HITS:
+                return
+            if record_id not in self._by_id:
+                return  # Removido enquanto era lido
+            del self._memo_hits[record_id]
+            self._memo[record_id] = data
+            if len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+
+    def _memo_discard(self, record_ids: list[str] | None = None) -> None:
+        """Remove registros do LRU (todos, se `record_ids` for None)."""
+        with self._memo_lock:
+            if record_ids is None:
+                self._memo.clear()
+                self._memo_hits.clear()
+                return
+            for record_id in record_ids:
+                self._memo.pop(record_id, None)
+                self._memo_hits.pop(record_id, None)
+
+    def _release_storage(self, entries: list[HistoryIndexEntry]) -> None:
+        """
+        Libera o armazenamento de entradas já removidas do índice.
+
+        Registros legados têm o próprio arquivo removido. Um log diário é
+        compartilhado, então só é removido quando nenhuma entrada restante
+        no índice aponta para ele e nenhum `record_execution` desta
+        instância está anexando a ele (`_appending`). O log do dia atual
+        nunca é removido: outros processos podem estar anexando a ele.
+        DEVE ser chamada com _write_lock adquirido.
+        """
+        logs: set[str] = set()
+        for entry in entries:
+            if entry.offset is not None:
+                logs.add(entry.file)
+            else:
                 try:
-                    with open(index_path, "r", encoding="utf-8") as f:
-                        self._index = json.load(f)
-                except (json.JSONDecodeError, IOError):
-                    self._index = []
-
-    def _save_index(self) -> None:
-        """Salva índice no disco. DEVE ser chamada com _lock adquirido."""
-        index_path = self.history_dir / self.INDEX_FILE
-        with open(index_path, "w", encoding="utf-8") as f:
-            json.dump(self._index, f, indent=2)
-
-    def _generate_id(self) -> str:
-        """Gera ID único para execução."""
-        import uuid
-        return uuid.uuid4().hex[:12]
+                    (self.history_dir / entry.file).unlink()
+                except OSError:
+                    pass  # Ignora erro ao deletar arquivo
+
+        if logs:
+            logs.difference_update(e.file for e in self._index if e.offset is not None)
+            today = _utc_today() + "/"
+            with self._logs_lock:
+                for log_file in logs:
+                    if log_file.startswith(today) or log_file in self._appending:
+                        continue
+                    try:
+                        (self.history_dir / log_file).unlink()
+                    except OSError:
+                        pass
 
     def record_execution(
         self,
@@ -939,7 +2405,7 @@ class ExecutionHistory:
         if not self.enabled:
             return ExecutionRecord(
                 id="disabled",
-                timestamp=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                timestamp=_utc_now_iso(),
                 plan_file=plan_file,
                 duration_ms=duration_ms,
                 total_steps=total_steps,
@@ -950,8 +2416,7 @@ class ExecutionHistory:
             )
 
         record_id = self._generate_id()
-        timestamp = datetime.now(timezone.utc)
-        timestamp_str = timestamp.isoformat().replace("+00:00", "Z")
+        timestamp_str = _utc_now_iso()
 
         record = ExecutionRecord(
             id=record_id,
@@ -967,11 +2432,10 @@ class ExecutionHistory:
         )
 
         # Cria subdiretório por data
-        date_dir = self.history_dir / timestamp.strftime("%Y-%m-%d")
+        date_dir = self.history_dir / timestamp_str[:10]  # YYYY-MM-DD
         date_dir.mkdir(parents=True, exist_ok=True)
 
         # Salva registro
-        record_file = date_dir / f"{record_id}.json"
         record_data = {
             "id": record.id,
             "timestamp": record.timestamp,
@@ -984,39 +2448,61 @@ class ExecutionHistory:
             "status": record.status,
             "runner_report": record.runner_report,
         }
-
-        with self._lock:
-            # Salva arquivo do registro
-            if self.compress:
-                with gzip.open(str(record_file) + ".gz", "wt", encoding="utf-8") as f:
-                    json.dump(record_data, f, indent=2, ensure_ascii=False)
-            else:
-                with open(record_file, "w", encoding="utf-8") as f:
-                    json.dump(record_data, f, indent=2, ensure_ascii=False)
+        payload = _compress(_json_dumps(record_data), self.codec)
+
+        # O anexo acontece fora de _write_lock, para que escritores
+        # concorrentes caiam no mesmo lote do group commit. Até a entrada
+        # chegar ao índice o log fica marcado em _appending, senão um
+        # delete() concorrente o veria sem entradas e o removeria
+        log_file = f"{date_dir.name}/{self.RECORDS_FILE}"
+        with self._logs_lock:
+            self._appending[log_file] += 1
+        try:
+            offset, length = self._append_record(date_dir, payload)
 
             # Atualiza índice (sem runner_report para economia de espaço)
-            index_entry = {
-                "id": record.id,
-                "timestamp": record.timestamp,
-                "plan_file": record.plan_file,
-                "plan_hash": record.plan_hash,
-                "duration_ms": record.duration_ms,
-                "total_steps": record.total_steps,
-                "passed_steps": record.passed_steps,
-                "failed_steps": record.failed_steps,
-                "status": record.status,
-                "file": str(record_file.relative_to(self.history_dir)) + (".gz" if self.compress else ""),
-            }
-            self._index.insert(0, index_entry)
-
-            # Limita número de registros
-            if len(self._index) > self.max_records:
-                self._index = self._index[:self.max_records]
-
-            self._save_index()
+            index_entry = HistoryIndexEntry(
+                id=record.id,
+                timestamp=record.timestamp,
+                plan_file=record.plan_file,
+                plan_hash=record.plan_hash,
+                duration_ms=record.duration_ms,
+                total_steps=record.total_steps,
+                passed_steps=record.passed_steps,
+                failed_steps=record.failed_steps,
+                status=record.status,
+                file=log_file,
+                offset=offset,
+                length=length,
+            )
+            self._insert_entry(index_entry)
+        finally:
+            with self._logs_lock:
+                self._appending[log_file] -= 1
+                if self._appending[log_file] <= 0:
+                    del self._appending[log_file]
 
         return record
 
+    def _insert_entry(self, index_entry: HistoryIndexEntry) -> None:
+        """Insere uma entrada no início do índice e a registra no index.log."""
+        with self._write_lock:
+            with self._lock:
+                self._index.insert(0, index_entry)
+                self._remember(index_entry)
+
+                # Limita número de registros; excedentes viram marcadores de
+                # remoção para não reaparecerem na próxima carga
+                lines: list[dict[str, Any]] = [index_entry.to_dict()]
+                if len(self._index) > self.max_records:
+                    dropped = self._index[self.max_records:]
+                    self._forget(dropped)
+                    self._index = self._index[:self.max_records]
+                    lines.extend({"deleted": e.id} for e in dropped)
+
+            # Escrita em disco fora do _lock: leitores não esperam por ela
+            self._append_index(lines)
+
     def get_recent(self, limit: int = 10) -> list[dict[str, Any]]:
         """
         Retorna execuções recentes.
@@ -1033,7 +2519,7 @@ class ExecutionHistory:
             return []
 
         with self._lock:
-            return self._index[:limit]
+            return [e.to_public_dict() for e in self._index[:limit]]
 
     def get_by_status(
         self,
@@ -1056,8 +2542,7 @@ class ExecutionHistory:
             return []
 
         with self._lock:
-            filtered = [r for r in self._index if r.get("status") == status]
-            return filtered[:limit]
+            return [e.to_public_dict() for e in islice(self._by_status.get(status, ()), limit)]
 
     def get_full_record(self, record_id: str) -> dict[str, Any] | None:
         """
@@ -1075,23 +2560,21 @@ class ExecutionHistory:
             return None
 
         with self._lock:
-            # Busca no índice
-            for entry in self._index:
-                if entry.get("id") == record_id:
-                    file_path = self.history_dir / entry["file"]
-                    if not file_path.exists():
-                        return None
+            entry = self._by_id.get(record_id)
 
-                    try:
-                        if str(file_path).endswith(".gz"):
-                            with gzip.open(file_path, "rt", encoding="utf-8") as f:
-                                return json.load(f)
-                        else:
-                            with open(file_path, "r", encoding="utf-8") as f:
-                                return json.load(f)
-                    except (json.JSONDecodeError, IOError, gzip.BadGzipFile):
-                        return None
+        if entry is None:
+            return None
+
+        data = self._memo_get(record_id)
+        if data is None:
+            data = self._read_record(entry)
+            if data is None:
+                return None
+            self._memo_put(record_id, data)
 
+        try:
+            return _json_loads(data)
+        except ValueError:
             return None
 
     def stats(self) -> dict[str, Any]:
@@ -1112,16 +2595,12 @@ class ExecutionHistory:
             return {"enabled": False, "total_records": 0}
 
         with self._lock:
-            success = sum(1 for r in self._index if r.get("status") == "success")
-            failure = sum(1 for r in self._index if r.get("status") == "failure")
-            error = sum(1 for r in self._index if r.get("status") == "error")
-
             return {
                 "enabled": True,
                 "total_records": len(self._index),
-                "success_count": success,
-                "failure_count": failure,
-                "error_count": error,
+                "success_count": self._status_counts["success"],
+                "failure_count": self._status_counts["failure"],
+                "error_count": self._status_counts["error"],
                 "history_dir": str(self.history_dir),
             }
 
@@ -1166,24 +2645,18 @@ class ExecutionHistory:
         if not self.enabled:
             return False
 
-        with self._lock:
-            # Busca no índice
-            for i, entry in enumerate(self._index):
-                if entry.get("id") == record_id:
-                    # Remove arquivo físico
-                    file_path = self.history_dir / entry["file"]
-                    if file_path.exists():
-                        try:
-                            file_path.unlink()
-                        except (IOError, OSError):
-                            pass  # Ignora erro ao deletar arquivo
-
-                    # Remove do índice
-                    self._index.pop(i)
-                    self._save_index()
-                    return True
+        with self._write_lock:
+            with self._lock:
+                entry = self._by_id.get(record_id)
+                if entry is None:
+                    return False
+                self._index.remove(entry)
+                self._forget([entry])
 
-            return False
+            # Libera o armazenamento do registro e registra a remoção
+            self._release_storage([entry])
+            self._append_index([{"deleted": record_id}])
+            return True
 
     def delete_bulk(self, record_ids: list[str]) -> int:
         """
@@ -1207,27 +2680,27 @@ class ExecutionHistory:
             return 0
 
         ids_set = set(record_ids)
-        deleted = 0
 
-        with self._lock:
-            new_index: list[dict[str, Any]] = []
-            for entry in self._index:
-                if entry.get("id") in ids_set:
-                    # Remove arquivo físico
-                    file_path = self.history_dir / entry["file"]
-                    if file_path.exists():
-                        try:
-                            file_path.unlink()
-                            deleted += 1
-                        except (IOError, OSError):
-                            pass
-                else:
-                    new_index.append(entry)
+        with self._write_lock:
+            with self._lock:
+                if ids_set.isdisjoint(self._by_id):
+                    return 0
 
-            self._index = new_index
-            self._save_index()
+                new_index: list[HistoryIndexEntry] = []
+                removed: list[HistoryIndexEntry] = []
+                for entry in self._index:
+                    if entry.id in ids_set:
+                        removed.append(entry)
+                    else:
+                        new_index.append(entry)
 
-        return deleted
+                self._index = new_index
+                self._forget(removed)
+
+            self._release_storage(removed)
+            self._append_index([{"deleted": e.id} for e in removed])
+
+        return len(removed)
 
     def clear_all(self) -> None:
         """
@@ -1241,10 +2714,13 @@ class ExecutionHistory:
         if not self.enabled:
             return
 
-        with self._lock:
+        with self._write_lock:
+            with self._lock:
+                self._index = []
+                self._reindex()
+
             self._ensure_dir()
-            self._index = []
-            self._save_index()
+            self._compact_index()
 
 
 # =============================================================================
@@ -1283,6 +2759,74 @@ class PlanVersion:
     description: str = ""
     tags: list[str] | None = None
     parent_version: int | None = None
+    # Cache de step_hashes(): fora do __init__, do repr, da comparação e de to_dict
+    _step_hashes: dict[Any, bytes] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Converte para o dict exportado (mesmas chaves dos arquivos de versão).
+
+        Raso: `plan` e `tags` são os objetos da própria instância.
+        """
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def step_hashes(self) -> dict[Any, bytes]:
+        """
+        Retorna hash de conteúdo de cada step, indexado pelo ID.
+
+        Calculado na primeira chamada e guardado na instância; o `diff`
+        do store também guarda o resultado no cache de versões, então diffs
+        repetidos contra a mesma versão não recalculam.
+        """
+        if self._step_hashes is None:
+            self._step_hashes = {
+                s.get("id"): _content_hash(s) for s in self.plan.get("steps", [])
+            }
+        return self._step_hashes
+
+
+@dataclass
+class _VersionMemo:
+    """
+    Entrada do cache de versões do `PlanVersionStore`.
+
+    Guarda os bytes do arquivo, não o objeto decodificado: cada leitura
+    decodifica de novo (orjson) e recebe um PlanVersion próprio, sem cópia
+    profunda de um objeto compartilhado.
+    """
+
+    signature: tuple[int, int]  # (mtime_ns, tamanho) do arquivo lido
+    data: bytes
+    step_hashes: dict[Any, bytes] | None = None
+
+
+class ChangePair(NamedTuple):
+    """
+    Valor de um campo antes e depois, em um diff de versões.
+
+    Tupla nomeada: mais leve que um dict por entrada.
+    """
+
+    before: Any
+    after: Any
+
+
+class ModifiedStep(NamedTuple):
+    """
+    Step presente nas duas versões, mas com conteúdo diferente.
+
+    ## Atributos:
+
+    - `id`: ID do step
+    - `before`: Step na versão A
+    - `after`: Step na versão B
+    """
+
+    id: Any
+    before: dict[str, Any]
+    after: dict[str, Any]
 
 
 @dataclass
@@ -1305,9 +2849,9 @@ class PlanDiff:
     version_b: int
     steps_added: list[dict[str, Any]]
     steps_removed: list[dict[str, Any]]
-    steps_modified: list[dict[str, Any]]
-    config_changes: dict[str, Any]
-    meta_changes: dict[str, Any]
+    steps_modified: list[ModifiedStep]
+    config_changes: dict[str, ChangePair]
+    meta_changes: dict[str, ChangePair]
 
     @property
     def has_changes(self) -> bool:
@@ -1337,6 +2881,48 @@ class PlanDiff:
         return ", ".join(parts) if parts else "no changes"
 
 
+def _diff_mapping(a: dict[str, Any], b: dict[str, Any]) -> dict[str, ChangePair]:
+    """
+    Compara dois dicts chave a chave em uma única passada.
+
+    Chaves ausentes são tratadas como None. Percorre `a` uma vez (uma
+    busca em `b` por chave) e depois apenas as chaves exclusivas de `b`,
+    sem alocar o conjunto união das chaves.
+
+    ## Retorno:
+
+    Dict chave → ChangePair(before, after) apenas das chaves alteradas.
+    """
+    changes: dict[str, ChangePair] = {}
+    for key, before in a.items():
+        after = b.get(key)
+        if before != after:
+            changes[key] = ChangePair(before, after)
+    for key in b.keys() - a.keys():
+        after = b[key]
+        if after is not None:
+            changes[key] = ChangePair(None, after)
+    return changes
+
+
+@lru_cache(maxsize=1024)
+def _slugify_plan_name(name: str) -> str:
+    """
+    Converte nome de plano em slug (memoizado: a função é pura).
+
+    Ver `PlanVersionStore._slugify`.
+    """
+    # Lowercase e substitui espaços por hífens
+    slug = name.lower().strip().replace(" ", "-")
+    # Remove caracteres não alfanuméricos (exceto hífens)
+    slug = re.sub(r"[^a-z0-9\-]", "", slug)
+    # Remove hífens duplicados
+    slug = re.sub(r"-+", "-", slug)
+    # Remove hífens no início/fim
+    slug = slug.strip("-")
+    return slug or "unnamed-plan"
+
+
 def get_global_plans_dir() -> Path:
     """
     Retorna o diretório global de planos versionados (~/.aqa/plans/).
@@ -1399,11 +2985,22 @@ class PlanVersionStore:
         >>> diff = store.diff("my-api-tests", 1, 2)
         >>> print(diff.summary)
         '+2 steps, ~1 modified'
+
+    ## Concorrência:
+
+    Arquivos v{N}.json são imutáveis depois de gravados (escrita atômica
+    via `os.replace`). Por isso a leitura de versões não usa locks do
+    store: leitores nunca bloqueiam escritores e nunca veem arquivos parciais.
+
+    Escritas usam um lock por plano (slug) e um lock curto para o índice,
+    sempre nessa ordem, então planos diferentes são salvos em paralelo.
     """
 
     INDEX_FILE = "index.json"
     METADATA_FILE = "metadata.json"
     CURRENT_LINK = "current.json"
+    VERSION_CACHE_SIZE = 512
+    LOCK_STRIPES = 64  # locks por plano (potência de 2)
 
     def __init__(
         self,
@@ -1425,7 +3022,17 @@ class PlanVersionStore:
 
         self.enabled = enabled
         self._index: dict[str, dict[str, Any]] = {}
-        self._lock = threading.Lock()
+
+        # Lock curto, apenas para mutações/leituras de _index e index.json
+        self._index_lock = threading.Lock()
+
+        # Locks por plano (slug), em faixas de tamanho fixo: saves em planos
+        # diferentes só se bloqueiam se os slugs caírem na mesma faixa
+        self._plan_locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+
+        # Cache de versões lidas: (slug, versão) → ((mtime_ns, size), PlanVersion)
+        self._version_cache: dict[tuple[str, int], _VersionMemo] = {}
+        self._version_cache_lock = threading.Lock()
 
         if enabled:
             self._ensure_dir()
@@ -1446,26 +3053,38 @@ class PlanVersionStore:
         """
         return cls(plans_dir=None, enabled=enabled)
 
+    def _plan_lock_stripe(self, slug: str) -> int:
+        """Retorna o índice da faixa de lock responsável por um plano."""
+        return hash(slug) & (self.LOCK_STRIPES - 1)
+
+    def _get_plan_lock(self, slug: str) -> threading.Lock:
+        """
+        Retorna o lock da faixa responsável por um plano.
+
+        Os locks são fixos desde o construtor, então a memória não cresce
+        com o número de planos.
+        """
+        return self._plan_locks[self._plan_lock_stripe(slug)]
+
     def _ensure_dir(self) -> None:
         """Cria diretório de planos se não existir."""
         self.plans_dir.mkdir(parents=True, exist_ok=True)
 
     def _load_index(self) -> None:
         """Carrega índice do disco."""
-        with self._lock:
+        with self._index_lock:
             index_path = self.plans_dir / self.INDEX_FILE
             if index_path.exists():
                 try:
-                    with open(index_path, "r", encoding="utf-8") as f:
-                        self._index = json.load(f)
+                    self._index = _read_json_file(index_path) or {}
                 except (json.JSONDecodeError, IOError):
                     self._index = {}
 
     def _save_index(self) -> None:
-        """Salva índice no disco. DEVE ser chamada com _lock adquirido."""
+        """Salva índice no disco. DEVE ser chamada com _index_lock adquirido."""
         index_path = self.plans_dir / self.INDEX_FILE
-        with open(index_path, "w", encoding="utf-8") as f:
-            json.dump(self._index, f, indent=2)
+        with open(index_path, "wb") as f:
+            f.write(_json_dumps(self._index))
 
     def _slugify(self, name: str) -> str:
         """
@@ -1479,16 +3098,7 @@ class PlanVersionStore:
 
         Slug válido (lowercase, sem espaços, sem caracteres especiais)
         """
-        import re
-        # Lowercase e substitui espaços por hífens
-        slug = name.lower().strip().replace(" ", "-")
-        # Remove caracteres não alfanuméricos (exceto hífens)
-        slug = re.sub(r"[^a-z0-9\-]", "", slug)
-        # Remove hífens duplicados
-        slug = re.sub(r"-+", "-", slug)
-        # Remove hífens no início/fim
-        slug = slug.strip("-")
-        return slug or "unnamed-plan"
+        return _slugify_plan_name(name)
 
     def _get_plan_dir(self, plan_name: str) -> Path:
         """Retorna diretório de um plano específico."""
@@ -1506,7 +3116,7 @@ class PlanVersionStore:
         if not self.enabled:
             return []
 
-        with self._lock:
+        with self._index_lock:
             return list(self._index.values())
 
     def get_plan_info(self, plan_name: str) -> dict[str, Any] | None:
@@ -1525,7 +3135,7 @@ class PlanVersionStore:
             return None
 
         slug = self._slugify(plan_name)
-        with self._lock:
+        with self._index_lock:
             return self._index.get(slug)
 
     def get_version(
@@ -1536,6 +3146,10 @@ class PlanVersionStore:
         """
         Retorna uma versão específica do plano.
 
+        Não adquire locks do store. Versões explícitas têm os bytes do arquivo
+        memoizados (o arquivo é imutável); cada chamada decodifica de novo,
+        então o PlanVersion retornado é independente e pode ser alterado.
+
         ## Parâmetros:
 
         - `plan_name`: Nome do plano
@@ -1545,12 +3159,27 @@ class PlanVersionStore:
 
         PlanVersion ou None se não existir.
         """
+        loaded = self._load_version(plan_name, version)
+        return loaded[0] if loaded is not None else None
+
+    def _load_version(
+        self,
+        plan_name: str,
+        version: int | None = None,
+    ) -> tuple[PlanVersion, _VersionMemo | None] | None:
+        """
+        Lê uma versão do plano, memoizando os bytes de versões explícitas.
+
+        ## Retorno:
+
+        Tupla (PlanVersion novo, entrada do cache de versões ou None para
+        a versão atual), ou None se a versão não existir.
+        """
         if not self.enabled:
             return None
 
-        plan_dir = self._get_plan_dir(plan_name)
-        if not plan_dir.exists():
-            return None
+        slug = self._slugify(plan_name)
+        plan_dir = self.plans_dir / slug
 
         # Determina arquivo da versão
         if version is None:
@@ -1558,33 +3187,98 @@ class PlanVersionStore:
         else:
             version_file = plan_dir / f"v{version}.json"
 
-        if not version_file.exists():
+        try:
+            file_stat = version_file.stat()
+        except OSError:
+            return None
+
+        # v{N}.json é imutável: o cache só é invalidado se o arquivo for
+        # removido e recriado (ex: delete_plan seguido de novo save)
+        memo: _VersionMemo | None = None
+        if version is None:
+            data = self._read_version_file(version_file)
+        else:
+            cache_key = (slug, version)
+            signature = (file_stat.st_mtime_ns, file_stat.st_size)
+            with self._version_cache_lock:
+                memo = self._version_cache.get(cache_key)
+            if memo is None or memo.signature != signature:
+                try:
+                    memo = _VersionMemo(signature, version_file.read_bytes())
+                except OSError:
+                    return None
+                with self._version_cache_lock:
+                    if len(self._version_cache) >= self.VERSION_CACHE_SIZE:
+                        self._version_cache.pop(next(iter(self._version_cache)))
+                    self._version_cache[cache_key] = memo
+            try:
+                data = _json_loads(memo.data) if memo.data else None
+            except ValueError:
+                data = None
+        if not data:
             return None
 
+        plan_version = PlanVersion(
+            version=data.get("version", 1),
+            plan=data.get("plan", {}),
+            created_at=data.get("created_at", ""),
+            created_by=data.get("created_by", "auto"),
+            source=data.get("source", "llm"),
+            llm_provider=data.get("llm_provider"),
+            llm_model=data.get("llm_model"),
+            input_hash=data.get("input_hash"),
+            description=data.get("description", ""),
+            tags=data.get("tags"),
+            parent_version=data.get("parent_version"),
+        )
+        if memo is not None:
+            plan_version._step_hashes = memo.step_hashes
+        return plan_version, memo
+
+    def _read_version_file(self, version_file: Path) -> dict[str, Any] | None:
+        """
+        Lê o dict bruto de um arquivo de versão.
+
+        ## Retorno:
+
+        Dict da versão ou None se não existir, estiver vazio ou inválido.
+        """
         try:
-            with open(version_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return PlanVersion(
-                    version=data.get("version", 1),
-                    plan=data.get("plan", {}),
-                    created_at=data.get("created_at", ""),
-                    created_by=data.get("created_by", "auto"),
-                    source=data.get("source", "llm"),
-                    llm_provider=data.get("llm_provider"),
-                    llm_model=data.get("llm_model"),
-                    input_hash=data.get("input_hash"),
-                    description=data.get("description", ""),
-                    tags=data.get("tags"),
-                    parent_version=data.get("parent_version"),
-                )
+            data = _read_json_file(version_file)
         except (json.JSONDecodeError, IOError):
             return None
+        return data or None
+
+    def _get_version_plan_only(
+        self,
+        plan_name: str,
+        version: int | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Retorna apenas o plano de uma versão, sem montar PlanVersion.
+
+        ## Parâmetros:
+
+        - `plan_name`: Nome do plano
+        - `version`: Número da versão (None = versão atual)
+
+        ## Retorno:
+
+        Dict do plano ou None se não existir.
+        """
+        if not self.enabled:
+            return None
+
+        plan_dir = self.plans_dir / self._slugify(plan_name)
+        filename = self.CURRENT_LINK if version is None else f"v{version}.json"
+        data = self._read_version_file(plan_dir / filename)
+        return data.get("plan", {}) if data is not None else None
 
     def get_current(self, plan_name: str) -> dict[str, Any] | None:
         """
         Retorna o plano da versão atual.
 
-        Atalho para `get_version(plan_name, None).plan`.
+        Equivale a `get_version(plan_name, None).plan`, sem montar o PlanVersion.
 
         ## Parâmetros:
 
@@ -1594,8 +3288,38 @@ class PlanVersionStore:
 
         Dict do plano ou None se não existir.
         """
-        version = self.get_version(plan_name, None)
-        return version.plan if version else None
+        return self._get_version_plan_only(plan_name, None)
+
+    def export_version(
+        self,
+        plan_name: str,
+        version: int | None = None,
+        pretty: bool = True,
+    ) -> str | None:
+        """
+        Exporta uma versão do plano como texto JSON.
+
+        Os arquivos internos são gravados em JSON compacto; este método
+        reformata com indentação apenas quando o conteúdo é para humanos.
+
+        ## Parâmetros:
+
+        - `plan_name`: Nome do plano
+        - `version`: Número da versão (None = versão atual)
+        - `pretty`: Se True, indenta com 2 espaços
+
+        ## Retorno:
+
+        String JSON da versão ou None se não existir.
+        """
+        plan_version = self.get_version(plan_name, version)
+        if plan_version is None:
+            return None
+
+        data = plan_version.to_dict()
+        if pretty:
+            return json.dumps(data, indent=2, ensure_ascii=False)
+        return _json_dumps(data).decode("utf-8")
 
     def list_versions(self, plan_name: str) -> list[dict[str, Any]]:
         """
@@ -1674,71 +3398,206 @@ class PlanVersionStore:
             return PlanVersion(
                 version=0,
                 plan=plan,
-                created_at=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                created_at=_utc_now_iso(),
             )
 
         slug = self._slugify(plan_name)
-        plan_dir = self._get_plan_dir(plan_name)
-        plan_dir.mkdir(parents=True, exist_ok=True)
-
-        with self._lock:
-            # Determina próxima versão
-            current_info = self._index.get(slug, {})
-            current_version = current_info.get("current_version", 0)
-            new_version = current_version + 1
-            parent_version = current_version if current_version > 0 else None
-
-            # Cria dados da versão
-            timestamp = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-            version_data = {
-                "version": new_version,
-                "plan": plan,
-                "created_at": timestamp,
-                "created_by": created_by,
-                "source": source,
-                "llm_provider": llm_provider,
-                "llm_model": llm_model,
-                "input_hash": input_hash,
-                "description": description,
-                "tags": tags or [],
-                "parent_version": parent_version,
-            }
 
-            # Salva arquivo da versão
-            version_file = plan_dir / f"v{new_version}.json"
-            with open(version_file, "w", encoding="utf-8") as f:
-                json.dump(version_data, f, indent=2, ensure_ascii=False)
-
-            # Atualiza current.json (cópia do arquivo atual)
-            current_file = plan_dir / self.CURRENT_LINK
-            with open(current_file, "w", encoding="utf-8") as f:
-                json.dump(version_data, f, indent=2, ensure_ascii=False)
-
-            # Atualiza índice
-            self._index[slug] = {
-                "name": plan_name,
-                "slug": slug,
-                "current_version": new_version,
-                "total_versions": new_version,
-                "created_at": current_info.get("created_at", timestamp),
-                "updated_at": timestamp,
-                "path": str(plan_dir.relative_to(self.plans_dir)),
-            }
-            self._save_index()
+        with self._get_plan_lock(slug):
+            with self._index_lock:
+                current_info = self._index.get(slug, {})
 
-            return PlanVersion(
-                version=new_version,
-                plan=plan,
-                created_at=timestamp,
-                created_by=created_by,
+            plan_dir, version_data, plan_version, index_entry = self._prepare_version(
+                slug,
+                plan_name,
+                plan,
+                current_info,
                 source=source,
                 llm_provider=llm_provider,
                 llm_model=llm_model,
                 input_hash=input_hash,
                 description=description,
                 tags=tags,
-                parent_version=parent_version,
+                created_by=created_by,
             )
+            self._write_version_file(plan_dir, version_data, write_current=True)
+
+            with self._index_lock:
+                self._index[slug] = index_entry
+                self._save_index()
+
+            return plan_version
+
+    def save_many(
+        self,
+        items: list[tuple[str, dict[str, Any], dict[str, Any]]],
+    ) -> list[PlanVersion]:
+        """
+        Salva várias versões de uma vez, gravando o índice uma única vez.
+
+        Útil para importações/migrações em lote: em vez de N reescritas do
+        `index.json`, os arquivos de versão são gravados em paralelo e o
+        índice é persistido apenas no final.
+
+        ## Parâmetros:
+
+        - `items`: Lista de tuplas `(plan_name, plan, kwargs)`, onde
+          `kwargs` aceita os mesmos argumentos nomeados de `save()`
+
+        ## Retorno:
+
+        Lista de PlanVersion criadas, na mesma ordem de `items`.
+
+        ## Exemplo:
+
+            >>> store.save_many([
+            ...     ("plan-a", plan_a, {"source": "import"}),
+            ...     ("plan-b", plan_b, {"description": "Migrated"}),
+            ... ])
+        """
+        if not self.enabled:
+            return [self.save(name, plan, **kwargs) for name, plan, kwargs in items]
+        if not items:
+            return []
+
+        from concurrent.futures import ThreadPoolExecutor
+        from contextlib import ExitStack
+
+        slugs = [self._slugify(name) for name, _, _ in items]
+
+        with ExitStack() as stack:
+            # Cada faixa uma vez só (slugs podem dividir uma faixa) e em
+            # ordem fixa, o que evita deadlock entre lotes concorrentes
+            for stripe in sorted({self._plan_lock_stripe(slug) for slug in slugs}):
+                stack.enter_context(self._plan_locks[stripe])
+
+            with self._index_lock:
+                pending = {slug: self._index.get(slug, {}) for slug in slugs}
+
+            prepared = []
+            for slug, (name, plan, kwargs) in zip(slugs, items):
+                entry = self._prepare_version(slug, name, plan, pending[slug], **kwargs)
+                pending[slug] = entry[3]
+                prepared.append(entry)
+
+            # current.json recebe apenas a última versão de cada plano
+            latest: dict[Path, dict[str, Any]] = {}
+            for plan_dir, version_data, _, _ in prepared:
+                latest[plan_dir] = version_data
+
+            with ThreadPoolExecutor(max_workers=min(8, len(prepared))) as executor:
+                list(executor.map(
+                    self._write_version_file,
+                    [plan_dir for plan_dir, _, _, _ in prepared],
+                    [version_data for _, version_data, _, _ in prepared],
+                    [latest[plan_dir] is version_data for plan_dir, version_data, _, _ in prepared],
+                ))
+
+            with self._index_lock:
+                self._index.update(pending)
+                self._save_index()
+
+            return [plan_version for _, _, plan_version, _ in prepared]
+
+    def _prepare_version(
+        self,
+        slug: str,
+        plan_name: str,
+        plan: dict[str, Any],
+        current_info: dict[str, Any],
+        *,
+        source: Literal["llm", "manual", "import"] = "llm",
+        llm_provider: str | None = None,
+        llm_model: str | None = None,
+        input_hash: str | None = None,
+        description: str = "",
+        tags: list[str] | None = None,
+        created_by: str = "auto",
+    ) -> tuple[Path, dict[str, Any], PlanVersion, dict[str, Any]]:
+        """
+        Calcula o próximo número de versão e monta os dados a gravar.
+
+        Não altera `_index`: a entrada retornada deve ser aplicada pelo
+        chamador após gravar os arquivos. DEVE ser chamada com o lock do
+        plano adquirido.
+
+        ## Parâmetros:
+
+        - `current_info`: Entrada atual do índice para o slug ({} se novo)
+
+        ## Retorno:
+
+        Tupla (diretório do plano, dados da versão, PlanVersion, entrada do índice).
+        """
+        plan_dir = self.plans_dir / slug
+        plan_dir.mkdir(parents=True, exist_ok=True)
+
+        # Determina próxima versão
+        current_version = current_info.get("current_version", 0)
+        new_version = current_version + 1
+        parent_version = current_version if current_version > 0 else None
+
+        # Cria dados da versão
+        timestamp = _utc_now_iso()
+        version_data = {
+            "version": new_version,
+            "plan": plan,
+            "created_at": timestamp,
+            "created_by": created_by,
+            "source": source,
+            "llm_provider": llm_provider,
+            "llm_model": llm_model,
+            "input_hash": input_hash,
+            "description": description,
+            "tags": tags or [],
+            "parent_version": parent_version,
+        }
+
+        # Entrada do índice
+        index_entry = {
+            "name": plan_name,
+            "slug": slug,
+            "current_version": new_version,
+            "total_versions": new_version,
+            "created_at": current_info.get("created_at", timestamp),
+            "updated_at": timestamp,
+            "path": str(plan_dir.relative_to(self.plans_dir)),
+        }
+
+        plan_version = PlanVersion(
+            version=new_version,
+            plan=plan,
+            created_at=timestamp,
+            created_by=created_by,
+            source=source,
+            llm_provider=llm_provider,
+            llm_model=llm_model,
+            input_hash=input_hash,
+            description=description,
+            tags=tags,
+            parent_version=parent_version,
+        )
+        return plan_dir, version_data, plan_version, index_entry
+
+    def _write_version_file(
+        self,
+        plan_dir: Path,
+        version_data: dict[str, Any],
+        write_current: bool = True,
+    ) -> None:
+        """
+        Grava v{N}.json e, opcionalmente, current.json.
+
+        Usa JSON compacto (use `export_version` para leitura humana).
+        As gravações são atômicas (`os.replace`), e v{N}.json nunca é
+        reescrito depois de criado.
+        """
+        version_bytes = _json_dumps(version_data)
+        _atomic_write_bytes(plan_dir / f"v{version_data['version']}.json", version_bytes)
+
+        if write_current:
+            # Atualiza current.json (cópia do arquivo atual)
+            _atomic_write_bytes(plan_dir / self.CURRENT_LINK, version_bytes)
 
     def diff(
         self,
@@ -1768,11 +3627,12 @@ class PlanVersionStore:
         if not self.enabled:
             return None
 
-        v_a = self.get_version(plan_name, version_a)
-        v_b = self.get_version(plan_name, version_b)
+        loaded_a = self._load_version(plan_name, version_a)
+        loaded_b = self._load_version(plan_name, version_b)
 
-        if not v_a or not v_b:
+        if loaded_a is None or loaded_b is None:
             return None
+        (v_a, memo_a), (v_b, memo_b) = loaded_a, loaded_b
 
         plan_a = v_a.plan
         plan_b = v_b.plan
@@ -1783,39 +3643,23 @@ class PlanVersionStore:
 
         steps_added = [s for sid, s in steps_b.items() if sid not in steps_a]
         steps_removed = [s for sid, s in steps_a.items() if sid not in steps_b]
-        steps_modified = []
-
-        for sid in steps_a:
-            if sid in steps_b and steps_a[sid] != steps_b[sid]:
-                steps_modified.append({
-                    "id": sid,
-                    "before": steps_a[sid],
-                    "after": steps_b[sid],
-                })
-
-        # Compara config
-        config_a = plan_a.get("config", {})
-        config_b = plan_b.get("config", {})
-        config_changes = {}
-        all_keys = set(config_a.keys()) | set(config_b.keys())
-        for key in all_keys:
-            if config_a.get(key) != config_b.get(key):
-                config_changes[key] = {
-                    "before": config_a.get(key),
-                    "after": config_b.get(key),
-                }
+        # Compara hashes de conteúdo (cacheados por versão) em vez de
+        # igualdade recursiva dos dicts
+        hashes_a = v_a.step_hashes()
+        hashes_b = v_b.step_hashes()
+        if memo_a is not None:
+            memo_a.step_hashes = hashes_a
+        if memo_b is not None:
+            memo_b.step_hashes = hashes_b
+        steps_modified = [
+            ModifiedStep(sid, step_a, steps_b[sid])
+            for sid, step_a in steps_a.items()
+            if sid in steps_b and hashes_a[sid] != hashes_b[sid]
+        ]
 
-        # Compara meta
-        meta_a = plan_a.get("meta", {})
-        meta_b = plan_b.get("meta", {})
-        meta_changes = {}
-        all_meta_keys = set(meta_a.keys()) | set(meta_b.keys())
-        for key in all_meta_keys:
-            if meta_a.get(key) != meta_b.get(key):
-                meta_changes[key] = {
-                    "before": meta_a.get(key),
-                    "after": meta_b.get(key),
-                }
+        # Compara config e meta
+        config_changes = _diff_mapping(plan_a.get("config", {}), plan_b.get("config", {}))
+        meta_changes = _diff_mapping(plan_a.get("meta", {}), plan_b.get("meta", {}))
 
         return PlanDiff(
             version_a=version_a,
@@ -1846,10 +3690,11 @@ class PlanVersionStore:
             return False
 
         slug = self._slugify(plan_name)
-        plan_dir = self._get_plan_dir(plan_name)
+        plan_dir = self.plans_dir / slug
 
-        with self._lock:
-            info = self._index.get(slug)
+        with self._get_plan_lock(slug):
+            with self._index_lock:
+                info = self._index.get(slug)
             if not info:
                 return False
 
@@ -1862,6 +3707,7 @@ class PlanVersionStore:
                 return False
 
             version_file.unlink()
+            self._forget_versions(slug, version)
             return True
 
     def delete_plan(self, plan_name: str) -> bool:
@@ -1880,22 +3726,52 @@ class PlanVersionStore:
             return False
 
         slug = self._slugify(plan_name)
-        plan_dir = self._get_plan_dir(plan_name)
+        plan_dir = self.plans_dir / slug
 
-        with self._lock:
-            if slug not in self._index:
-                return False
+        with self._get_plan_lock(slug):
+            with self._index_lock:
+                if slug not in self._index:
+                    return False
 
-            # Remove diretório e conteúdo
-            import shutil
-            if plan_dir.exists():
-                shutil.rmtree(plan_dir)
+            # Remove diretório e conteúdo (v*.json planos, sem recursão)
+            self._remove_plan_dir(plan_dir)
+            self._forget_versions(slug)
 
             # Remove do índice
-            del self._index[slug]
-            self._save_index()
+            with self._index_lock:
+                del self._index[slug]
+                self._save_index()
             return True
 
+    def _forget_versions(self, slug: str, version: int | None = None) -> None:
+        """Descarta do cache de versões uma versão do plano (None = todas)."""
+        with self._version_cache_lock:
+            if version is not None:
+                self._version_cache.pop((slug, version), None)
+                return
+            for cache_key in [key for key in self._version_cache if key[0] == slug]:
+                del self._version_cache[cache_key]
+
+    def _remove_plan_dir(self, plan_dir: Path) -> None:
+        """
+        Remove diretório de um plano.
+
+        O diretório contém apenas arquivos planos (v*.json, current.json),
+        então um único `scandir` + `unlink` evita o walker recursivo do
+        `shutil.rmtree`, usado apenas se houver subdiretório inesperado.
+        """
+        try:
+            with os.scandir(plan_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        import shutil
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+            os.rmdir(plan_dir)
+        except FileNotFoundError:
+            pass
+
     def rollback(
         self,
         plan_name: str,
@@ -1926,14 +3802,14 @@ class PlanVersionStore:
         if not self.enabled:
             return None
 
-        # Obtém versão alvo
-        target = self.get_version(plan_name, target_version)
-        if not target:
+        # Obtém plano da versão alvo
+        target_plan = self._get_version_plan_only(plan_name, target_version)
+        if target_plan is None:
             return None
 
         # Obtém versão atual para referência
-        current = self.get_version(plan_name)
-        current_version = current.version if current else 0
+        info = self.get_plan_info(plan_name)
+        current_version = info.get("current_version", 0) if info else 0
 
         # Monta descrição
         if not description:
@@ -1942,7 +3818,7 @@ class PlanVersionStore:
         # Salva como nova versão
         return self.save(
             plan_name=plan_name,
-            plan=target.plan,
+            plan=target_plan,
             source="manual",
             description=description,
         )
@@ -75,24 +75,21 @@ import argparse
 # json: Para serialização do relatório
 import json
 
+# os: stat do arquivo de spec (invalidação do cache por mtime)
+import os
+
 # sys: Para exit codes e stderr
 import sys
 
+# lru_cache: O parser é montado uma única vez por processo
+from functools import lru_cache
+
 # Path: Manipulação de caminhos
 from pathlib import Path
 
-# TYPE_CHECKING: Importações apenas para checagem de tipos (não em runtime)
-from typing import TYPE_CHECKING
-
-# Nossos módulos
-from .generator import UTDLGenerator
-from .ingestion import parse_openapi
-from .ingestion.swagger import spec_to_requirement_text
-from .runner import run_plan
-
-# Importações condicionais para type checking
-if TYPE_CHECKING:
-    from argparse import ArgumentParser, Namespace
+# Nossos módulos (gerador, ingestão, runner) são importados dentro dos
+# comandos que os usam: `--help` e erros de argumento não carregam a
+# stack de LLM e suas dependências.
 
 
 # =============================================================================
@@ -109,10 +106,38 @@ def main() -> None:
     `python -m brain.src.cli`
 
     Ela:
-    1. Configura o parser de argumentos (quais flags aceitar)
+    1. Obtém o parser de argumentos (quais flags aceitar)
     2. Parseia os argumentos que o usuário digitou
     3. Chama a função apropriada (generate ou run)
     """
+    # Parseia os argumentos da linha de comando
+    args = _build_parser().parse_args()
+
+    # Despacha para o comando apropriado
+    if args.command == "generate":
+        run_generate(args)
+    elif args.command == "run":
+        run_full(args)
+
+
+# =============================================================================
+# FUNÇÕES DE CONFIGURAÇÃO
+# =============================================================================
+
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Monta o parser de argumentos do CLI.
+
+    ## Para todos entenderem:
+    O parser é construído na primeira chamada e reaproveitado nas
+    seguintes (ex: `main` chamado várias vezes em testes). `parse_args`
+    não altera o parser, então compartilhá-lo é seguro.
+
+    ## Retorna:
+        Parser principal com os subcomandos generate e run
+    """
     # Cria parser principal
     parser = argparse.ArgumentParser(
         description="Brain CLI - Gera e executa planos de teste UTDL usando IA"
@@ -151,22 +176,10 @@ def main() -> None:
         help="Salva o relatório de execução neste arquivo",
     )
 
-    # Parseia os argumentos da linha de comando
-    args = parser.parse_args()
-
-    # Despacha para o comando apropriado
-    if args.command == "generate":
-        run_generate(args)
-    elif args.command == "run":
-        run_full(args)
-
-
-# =============================================================================
-# FUNÇÕES DE CONFIGURAÇÃO
-# =============================================================================
+    return parser
 
 
-def _add_common_args(parser: ArgumentParser) -> None:
+def _add_common_args(parser: argparse.ArgumentParser) -> None:
     """
     Adiciona argumentos comuns a um subparser.
 
@@ -210,7 +223,7 @@ def _add_common_args(parser: ArgumentParser) -> None:
 # =============================================================================
 
 
-def run_generate(args: Namespace) -> None:
+def run_generate(args: argparse.Namespace) -> None:
     """
     Executa o comando generate.
 
@@ -227,6 +240,8 @@ def run_generate(args: Namespace) -> None:
         0: Sucesso
         1: Erro (mensagem impressa no stderr)
     """
+    from .generator import UTDLGenerator
+
     # Obtém texto do requisito e URL base
     requirement, base_url = _get_requirement(args)
 
@@ -238,27 +253,23 @@ def run_generate(args: Namespace) -> None:
         generator = UTDLGenerator(provider=args.model)
         plan = generator.generate(requirement, base_url)
 
-        # Serializa para JSON
-        json_output = plan.to_json()
-
         # Salva em arquivo ou imprime no stdout
         if args.output:
-            Path(args.output).write_text(json_output, encoding="utf-8")
+            with open(args.output, "wb") as fp:
+                plan.dump_json(fp)
             print(f"Plano salvo em: {args.output}", file=sys.stderr)
         else:
-            print(json_output)
+            print(plan.to_json())
 
     except ValueError as e:
         # Erro de validação ou geração
-        print(f"Erro: {e}", file=sys.stderr)
-        sys.exit(1)
+        sys.exit(f"Erro: {e}")
     except Exception as e:
         # Erro inesperado
-        print(f"Erro inesperado: {e}", file=sys.stderr)
-        sys.exit(1)
+        sys.exit(f"Erro inesperado: {e}")
 
 
-def run_full(args: Namespace) -> None:
+def run_full(args: argparse.Namespace) -> None:
     """
     Executa o fluxo completo: geração + execução.
 
@@ -276,6 +287,9 @@ def run_full(args: Namespace) -> None:
         0: Todos os testes passaram
         1: Algum teste falhou ou erro na execução
     """
+    from .generator import UTDLGenerator
+    from .runner import run_plan
+
     requirement, base_url = _get_requirement(args)
 
     # -----------------------------------------------------------------
@@ -290,7 +304,8 @@ def run_full(args: Namespace) -> None:
 
         # Opcionalmente salva o plano
         if args.save_plan:
-            Path(args.save_plan).write_text(plan.to_json(), encoding="utf-8")
+            with open(args.save_plan, "wb") as fp:
+                plan.dump_json(fp)
             print(f"📄 Plano salvo em: {args.save_plan}", file=sys.stderr)
 
         # -----------------------------------------------------------------
@@ -307,10 +322,7 @@ def run_full(args: Namespace) -> None:
 
         # Opcionalmente salva relatório
         if args.save_report:
-            Path(args.save_report).write_text(
-                json.dumps(result.raw_report, indent=2, ensure_ascii=False),
-                encoding="utf-8",
-            )
+            _write_json(Path(args.save_report), result.raw_report)
             print(f"📊 Relatório salvo em: {args.save_report}", file=sys.stderr)
 
         # Sai com código apropriado
@@ -318,14 +330,11 @@ def run_full(args: Namespace) -> None:
         sys.exit(0 if result.success else 1)
 
     except ValueError as e:
-        print(f"❌ Erro de geração: {e}", file=sys.stderr)
-        sys.exit(1)
+        sys.exit(f"❌ Erro de geração: {e}")
     except RuntimeError as e:
-        print(f"❌ Erro de execução: {e}", file=sys.stderr)
-        sys.exit(1)
+        sys.exit(f"❌ Erro de execução: {e}")
     except Exception as e:
-        print(f"❌ Erro inesperado: {e}", file=sys.stderr)
-        sys.exit(1)
+        sys.exit(f"❌ Erro inesperado: {e}")
 
 
 # =============================================================================
@@ -333,7 +342,7 @@ def run_full(args: Namespace) -> None:
 # =============================================================================
 
 
-def _get_requirement(args: Namespace) -> tuple[str, str]:
+def _get_requirement(args: argparse.Namespace) -> tuple[str, str]:
     """
     Extrai texto de requisito e base_url dos argumentos.
 
@@ -356,25 +365,93 @@ def _get_requirement(args: Namespace) -> tuple[str, str]:
     if args.swagger:
         # Carrega spec OpenAPI e converte para texto
         print(f"Parseando spec OpenAPI: {args.swagger}", file=sys.stderr)
-        spec = parse_openapi(args.swagger)
-        requirement = spec_to_requirement_text(spec)
+        if args.swagger.startswith(("http://", "https://")):
+            # URL: sem mtime para invalidar, então não entra no cache
+            requirement, spec_base_url = _spec_to_requirement(args.swagger)
+        else:
+            requirement, spec_base_url = _spec_to_requirement_cached(
+                args.swagger, os.stat(args.swagger).st_mtime_ns
+            )
         # Usa base_url da spec se disponível, senão usa o argumento
-        base_url: str = spec.get("base_url") or args.base_url
+        base_url: str = spec_base_url or args.base_url
     elif args.requirement:
         # Usa requisito direto do argumento
         requirement = args.requirement
         base_url = args.base_url
     else:
         # Nenhum dos dois foi fornecido
-        print(
-            "Erro: É necessário fornecer --requirement ou --swagger",
-            file=sys.stderr,
-        )
-        sys.exit(1)
+        sys.exit("Erro: É necessário fornecer --requirement ou --swagger")
 
     return requirement, base_url
 
 
+def _write_json(path: Path, data: object) -> None:
+    """
+    Grava `data` como JSON indentado (2 espaços, UTF-8 sem escapes).
+
+    ## Para todos entenderem:
+    Usa orjson quando instalado (serialização nativa, já em bytes).
+    Sem ele, ou se ele rejeitar o valor, usa `json.dump` escrevendo direto
+    no arquivo, sem montar a string inteira em memória. Mesmo formato de
+    `src.cli.utils.write_json_file`, que não é importado aqui porque
+    carregaria o pacote `src.cli` (todos os comandos click).
+
+    ## Parâmetros:
+        path: Arquivo de destino
+        data: Valor serializável em JSON
+    """
+    try:
+        import orjson
+    except ImportError:
+        orjson = None  # type: ignore[assignment]
+
+    if orjson is not None:
+        try:
+            path.write_bytes(
+                orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
+            return
+        except TypeError:
+            pass
+
+    with path.open("w", encoding="utf-8") as fp:
+        json.dump(data, fp, indent=2, ensure_ascii=False)
+
+
+def _spec_to_requirement(source: str) -> tuple[str, str]:
+    """
+    Parseia uma spec OpenAPI e a converte em texto de requisito.
+
+    ## Parâmetros:
+        source: Caminho ou URL da spec
+
+    ## Retorna:
+        Tupla (requirement_text, base_url da spec ou "")
+    """
+    from .ingestion import parse_openapi_cached
+    from .ingestion.swagger import spec_to_requirement_text
+
+    spec = parse_openapi_cached(source)
+    return spec_to_requirement_text(spec), spec.get("base_url") or ""
+
+
+@lru_cache(maxsize=16)
+def _spec_to_requirement_cached(path: str, mtime_ns: int) -> tuple[str, str]:
+    """
+    Versão memoizada de `_spec_to_requirement` para arquivos locais.
+
+    ## Para todos entenderem:
+    A chave inclui o mtime do arquivo: editar a spec muda a chave e
+    força um novo parse. O resultado é uma tupla de strings (imutável),
+    então pode ser compartilhado entre chamadas sem cópia.
+
+    ## Parâmetros:
+        path: Caminho da spec
+        mtime_ns: `st_mtime_ns` do arquivo (só compõe a chave do cache)
+    """
+    return _spec_to_requirement(path)
+
+
 # =============================================================================
 # PONTO DE ENTRADA
 # =============================================================================
@@ -22,7 +22,6 @@ aqa demo --dry-run
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any
 
@@ -31,6 +30,7 @@ from rich.console import Console
 from rich.panel import Panel
 
 from ..registry import register_command
+from ..utils import print_json_output, write_json_file
 
 
 # Plano de demonstração usando httpbin.org (API pública de teste)
@@ -202,43 +202,42 @@ def demo(ctx: click.Context, url: str | None, dry_run: bool, save: str | None) -
     # Se URL customizada foi fornecida, mostra aviso
     if url:
         if not quiet and not json_output:
-            console.print("[yellow]⚠️  URL customizada não implementada ainda.[/yellow]")
-            console.print("[yellow]   Usando plano demo padrão (httpbin.org)[/yellow]")
-            console.print()
+            console.print(
+                "[yellow]⚠️  URL customizada não implementada ainda.[/yellow]\n"
+                "[yellow]   Usando plano demo padrão (httpbin.org)[/yellow]\n"
+            )
 
     # Mostra o plano
     if dry_run:
-        if json_output:
-            Console().print_json(data=DEMO_PLAN)
-        else:
-            console.print("[bold]📋 Plano de Demonstração:[/bold]")
-            console.print()
-            console.print_json(data=DEMO_PLAN)
+        if not json_output:
+            console.print("[bold]📋 Plano de Demonstração:[/bold]\n")
+        print_json_output(console, DEMO_PLAN)
         return
 
     # Salva se solicitado
     if save:
         save_path = Path(save)
-        save_path.write_text(json.dumps(DEMO_PLAN, indent=2), encoding="utf-8")
+        write_json_file(save_path, DEMO_PLAN)
         if not quiet and not json_output:
-            console.print(f"[green]✅ Plano salvo em: {save_path}[/green]")
-            console.print()
+            console.print(f"[green]✅ Plano salvo em: {save_path}[/green]\n")
 
     # Executa o plano
     if not quiet and not json_output:
-        console.print("[bold]🚀 Executando demo...[/bold]")
-        console.print()
-        console.print("[dim]Para executar o plano demo completo, use:[/dim]")
-        console.print()
-        console.print("  [cyan]# Salvar o plano[/cyan]")
-        console.print("  [white]aqa demo --save demo_plan.json[/white]")
-        console.print()
-        console.print("  [cyan]# Executar o plano[/cyan]")
-        console.print("  [white]aqa run demo_plan.json[/white]")
-        console.print()
-        console.print("[dim]Ou execute tudo de uma vez com:[/dim]")
-        console.print("  [white]aqa demo --save demo.json && aqa run demo.json[/white]")
-        console.print()
+        # Um print por bloco de texto (linhas em branco inclusas)
+        console.print(
+            "[bold]🚀 Executando demo...[/bold]\n"
+            "\n"
+            "[dim]Para executar o plano demo completo, use:[/dim]\n"
+            "\n"
+            "  [cyan]# Salvar o plano[/cyan]\n"
+            "  [white]aqa demo --save demo_plan.json[/white]\n"
+            "\n"
+            "  [cyan]# Executar o plano[/cyan]\n"
+            "  [white]aqa run demo_plan.json[/white]\n"
+            "\n"
+            "[dim]Ou execute tudo de uma vez com:[/dim]\n"
+            "  [white]aqa demo --save demo.json && aqa run demo.json[/white]\n"
+        )
 
         # Mostra resumo do plano
         console.print(Panel(
@@ -257,7 +256,7 @@ def demo(ctx: click.Context, url: str | None, dry_run: bool, save: str | None) -
         ))
 
     if json_output:
-        Console().print_json(data={
+        print_json_output(console, {
             "status": "demo_ready",
             "plan": DEMO_PLAN,
             "instructions": "Use 'aqa run' with the saved plan to execute",
@@ -24,24 +24,48 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import click
 from rich.console import Console
 from rich.panel import Panel
 
 from ..registry import register_command
+from ..utils import print_json_output, read_json_file
 
 
-def _explain_step(step: dict[str, Any], index: int) -> str:
-    """Gera explicação textual de um step."""
-    step_id = step.get("id", f"step_{index}")
-    action = step.get("action", "unknown")
-    description = step.get("description", "")
-
-    params = step.get("params", {})
+def _explain_http(params: dict[str, Any], lines: list[str]) -> None:
+    """Explica os params de um step `http_request`."""
     method = params.get("method", "GET")
     path = params.get("path", "/")
+    lines.append(f"   Faz requisição {method} para `{path}`")
+
+    if params.get("body"):
+        lines.append("   Envia body JSON")
+
+    headers = params.get("headers")
+    if headers:
+        lines.append(f"   Com {len(headers)} header(s) customizado(s)")
+
+
+def _explain_wait(params: dict[str, Any], lines: list[str]) -> None:
+    """Explica os params de um step `wait`/`sleep`."""
+    duration = params.get("duration_ms", params.get("ms", 0))
+    lines.append(f"   Aguarda {duration}ms")
+
+
+# Ação → função que explica seus params (ações sem entrada não têm linha própria)
+_ACTION_EXPLAINERS: dict[str, Callable[[dict[str, Any], list[str]], None]] = {
+    "http_request": _explain_http,
+    "wait": _explain_wait,
+    "sleep": _explain_wait,
+}
+
+
+def _explain_step(step: dict[str, Any], index: int) -> list[str]:
+    """Gera as linhas da explicação textual de um step."""
+    step_id = step.get("id", f"step_{index}")
+    description = step.get("description", "")
 
     lines: list[str] = []
     lines.append(f"📍 **Step {index + 1}: {step_id}**")
@@ -49,18 +73,9 @@ def _explain_step(step: dict[str, Any], index: int) -> str:
     if description:
         lines.append(f"   {description}")
 
-    if action == "http_request":
-        lines.append(f"   Faz requisição {method} para `{path}`")
-
-        if params.get("body"):
-            lines.append("   Envia body JSON")
-
-        if params.get("headers"):
-            lines.append(f"   Com {len(params['headers'])} header(s) customizado(s)")
-
-    elif action in ("wait", "sleep"):
-        duration = params.get("duration_ms", params.get("ms", 0))
-        lines.append(f"   Aguarda {duration}ms")
+    explainer = _ACTION_EXPLAINERS.get(step.get("action", "unknown"))
+    if explainer is not None:
+        explainer(step.get("params", {}), lines)
 
     # Assertions
     assertions = step.get("assertions", [])
@@ -78,7 +93,7 @@ def _explain_step(step: dict[str, Any], index: int) -> str:
     if deps:
         lines.append(f"   ⏳ Depende de: {', '.join(deps)}")
 
-    return "\n".join(lines)
+    return lines
 
 
 def _explain_plan_json(plan: dict[str, Any]) -> dict[str, Any]:
@@ -87,6 +102,25 @@ def _explain_plan_json(plan: dict[str, Any]) -> dict[str, Any]:
     config = plan.get("config", {})
     steps = plan.get("steps", [])
 
+    # Uma única passada: monta a lista e conta as ações ao mesmo tempo
+    steps_out: list[dict[str, Any]] = []
+    http_count = wait_count = 0
+    for i, s in enumerate(steps):
+        action = s.get("action", "unknown")
+        if action == "http_request":
+            http_count += 1
+        elif action in ("wait", "sleep"):
+            wait_count += 1
+        steps_out.append({
+            "index": i + 1,
+            "id": s.get("id", f"step_{i}"),
+            "action": action,
+            "description": s.get("description", ""),
+            "has_assertions": len(s.get("assertions", [])) > 0,
+            "has_extractions": len(s.get("extract", [])) > 0,
+            "depends_on": s.get("depends_on", []),
+        })
+
     return {
         "plan": {
             "id": meta.get("id", "unknown"),
@@ -97,22 +131,11 @@ def _explain_plan_json(plan: dict[str, Any]) -> dict[str, Any]:
             "base_url": config.get("base_url", ""),
             "variables_count": len(config.get("variables", {})),
         },
-        "steps": [
-            {
-                "index": i + 1,
-                "id": s.get("id", f"step_{i}"),
-                "action": s.get("action", "unknown"),
-                "description": s.get("description", ""),
-                "has_assertions": len(s.get("assertions", [])) > 0,
-                "has_extractions": len(s.get("extract", [])) > 0,
-                "depends_on": s.get("depends_on", []),
-            }
-            for i, s in enumerate(steps)
-        ],
+        "steps": steps_out,
         "summary": {
             "total_steps": len(steps),
-            "http_requests": sum(1 for s in steps if s.get("action") == "http_request"),
-            "waits": sum(1 for s in steps if s.get("action") in ("wait", "sleep")),
+            "http_requests": http_count,
+            "waits": wait_count,
         },
     }
 
@@ -143,24 +166,23 @@ def explain(ctx: click.Context, file: str, detailed: bool) -> None:
     path = Path(file)
 
     try:
-        content = path.read_text(encoding="utf-8")
-        plan = json.loads(content)
+        plan = read_json_file(path)
     except json.JSONDecodeError as e:
         if json_output:
-            Console().print_json(data={"error": f"JSON inválido: {e}"})
+            print_json_output(console, {"error": f"JSON inválido: {e}"})
         else:
             console.print(f"[red]❌ JSON inválido: {e}[/red]")
         raise SystemExit(1)
     except Exception as e:
         if json_output:
-            Console().print_json(data={"error": str(e)})
+            print_json_output(console, {"error": str(e)})
         else:
             console.print(f"[red]❌ Erro: {e}[/red]")
         raise SystemExit(1)
 
     # Saída JSON
     if json_output:
-        Console().print_json(data=_explain_plan_json(plan))
+        print_json_output(console, _explain_plan_json(plan))
         return
 
     # Saída formatada
@@ -177,32 +199,37 @@ def explain(ctx: click.Context, file: str, detailed: bool) -> None:
         border_style="cyan",
     ))
 
-    # Config
-    console.print()
-    console.print(f"[bold]🌐 Base URL:[/bold] {config.get('base_url', 'N/A')}")
+    # Config e cabeçalho dos steps num único print (linhas em branco inclusas)
+    lines = ["", f"[bold]🌐 Base URL:[/bold] {config.get('base_url', 'N/A')}"]
 
     variables = config.get("variables", {})
     if variables:
-        console.print(f"[bold]📦 Variáveis:[/bold] {len(variables)} definida(s)")
+        lines.append(f"[bold]📦 Variáveis:[/bold] {len(variables)} definida(s)")
         if detailed:
             for k, v in variables.items():
                 val_str = str(v)[:50] + "..." if len(str(v)) > 50 else str(v)
-                console.print(f"   • {k} = {val_str}")
+                lines.append(f"   • {k} = {val_str}")
 
-    # Steps
-    console.print()
-    console.print(f"[bold]📝 Steps ({len(steps)}):[/bold]")
-    console.print()
+    lines += ["", f"[bold]📝 Steps ({len(steps)}):[/bold]", ""]
+    console.print("\n".join(lines))
 
+    # Um único print para todos os steps (cada um seguido de linha em
+    # branco), em vez de dois por step no pipeline de render do Rich.
+    # Os totais do resumo são contados na mesma passada.
+    parts: list[str] = []
+    http_count = wait_count = 0
     for i, step in enumerate(steps):
-        explanation = _explain_step(step, i)
-        console.print(explanation)
-        console.print()
+        parts.extend(_explain_step(step, i))
+        parts.append("")
+        action = step.get("action")
+        if action == "http_request":
+            http_count += 1
+        elif action in ("wait", "sleep"):
+            wait_count += 1
+    if parts:
+        console.print("\n".join(parts))
 
     # Summary
-    http_count = sum(1 for s in steps if s.get("action") == "http_request")
-    wait_count = sum(1 for s in steps if s.get("action") in ("wait", "sleep"))
-
     console.print(Panel(
         f"[bold]Total:[/bold] {len(steps)} steps\n"
         f"[bold]HTTP Requests:[/bold] {http_count}\n"
@@ -34,12 +34,11 @@ from pathlib import Path
 import click
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.prompt import Prompt, Confirm
 
-from ...generator import UTDLGenerator
-from ...ingestion import parse_openapi
-from ...ingestion.swagger import spec_to_requirement_text
+# Gerador (SDKs de LLM), ingestão OpenAPI e barra de progresso são
+# importados dentro de `generate`: carregar o módulo para registrar o
+# comando não os carrega
 from ..registry import register_command
 from ..utils import load_config, get_default_model
 
@@ -172,9 +171,12 @@ def generate(
             console.print(f"[red]❌ Arquivo não encontrado: {swagger}[/red]")
             raise SystemExit(1)
 
+        from ...ingestion import parse_openapi_cached
+        from ...ingestion.swagger import spec_to_requirement_text
+
         console.print(f"📖 Parseando spec OpenAPI: [cyan]{swagger}[/cyan]")
         try:
-            spec = parse_openapi(swagger)
+            spec = parse_openapi_cached(swagger)
         except Exception as e:
             console.print(f"[red]❌ Erro ao parsear OpenAPI: {e}[/red]")
             raise SystemExit(1)
@@ -210,6 +212,8 @@ def generate(
     is_mock = provider_name == "mock"
 
     # Gera plano com progress spinner
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
@@ -239,6 +243,8 @@ def generate(
                 plan = Plan(**plan_dict)
             else:
                 # UTDLGenerator usa 'provider' e não 'model' (detecta automaticamente)
+                from ...generator import UTDLGenerator
+
                 generator = UTDLGenerator()
                 plan = generator.generate(str(requirement_text), final_base_url)
             progress.update(task, completed=True)
@@ -351,12 +357,11 @@ def generate(
         plan.steps = plan.steps[:max_steps]
 
     # Output do plano
-    json_output = plan.to_json()
-
     if output:
         output_path = Path(output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(json_output, encoding="utf-8")
+        with output_path.open("wb") as fp:
+            plan.dump_json(fp)
 
         console.print()
         console.print(Panel(
@@ -368,10 +373,10 @@ def generate(
         ))
     else:
         # Imprime no stdout (para piping)
-        print(json_output)
+        print(plan.to_json())
 
         # Resumo no stderr
-        error_console = Console(stderr=True)
+        error_console: Console = ctx.obj["error_console"]
         error_console.print(
             f"[green]✅ Plano gerado: {plan.meta.name} ({len(plan.steps)} steps)[/green]"
         )
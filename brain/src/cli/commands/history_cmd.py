@@ -121,7 +121,7 @@ def history(ctx: click.Context, limit: int, status: str | None) -> None:
 
         # Tabela de execuções
         table = Table(title=f"📊 Histórico de Execuções (últimas {len(records)})")
-        table.add_column("ID", style="cyan", width=12)
+        table.add_column("ID", style="cyan", width=15)
         table.add_column("Data/Hora", style="dim")
         table.add_column("Plano", max_width=30)
         table.add_column("Status", justify="center")
@@ -323,9 +323,7 @@ def plan(
 
     # Carrega e parseia a spec
     try:
-        from ...ingestion.swagger import parse_openapi
-        import json as json_module
-        from pathlib import Path as PathLib
+        from ...ingestion.swagger import load_spec_file, parse_openapi
 
         original_spec: dict[str, Any] = {}
 
@@ -344,13 +342,7 @@ def plan(
                     resp.raise_for_status()
                     original_spec = resp.json()
                 else:
-                    path = PathLib(swagger)
-                    with path.open(encoding="utf-8") as f:
-                        if path.suffix in (".yaml", ".yml"):
-                            import yaml
-                            original_spec = yaml.safe_load(f)
-                        else:
-                            original_spec = json_module.load(f)
+                    original_spec = load_spec_file(Path(swagger))
 
                 spec = parse_openapi(swagger, validate_spec=True, strict=False)
                 progress.update(task, description="[green]✓[/] Especificação carregada")
@@ -362,13 +354,7 @@ def plan(
                 resp.raise_for_status()
                 original_spec = resp.json()
             else:
-                path = PathLib(swagger)
-                with path.open(encoding="utf-8") as f:
-                    if path.suffix in (".yaml", ".yml"):
-                        import yaml
-                        original_spec = yaml.safe_load(f)
-                    else:
-                        original_spec = json_module.load(f)
+                original_spec = load_spec_file(Path(swagger))
 
             spec = parse_openapi(swagger, validate_spec=True, strict=False)
 
@@ -115,9 +115,9 @@ def _format_diff_output(
     if diff.steps_modified:
         console.print(f"[yellow]~ {len(diff.steps_modified)} steps modificados:[/]")
         for change in diff.steps_modified:
-            step_id = change.get("id", "?")
-            before = change.get("before", {})
-            after = change.get("after", {})
+            step_id = change.id if change.id is not None else "?"
+            before = change.before
+            after = change.after
             step_desc = before.get("description", before.get("name", "Unnamed"))
             console.print(f"  [yellow]~[/] {step_id}: {step_desc}")
 
@@ -139,8 +139,8 @@ def _format_diff_output(
     if diff.config_changes:
         console.print("[cyan]⚙ Configuração modificada:[/]")
         for key, change in diff.config_changes.items():
-            before = change.get("before")
-            after = change.get("after")
+            before = change.before
+            after = change.after
             console.print(f"  {key}:")
             console.print(f"    [red]- {before}[/]")
             console.print(f"    [green]+ {after}[/]")
@@ -150,7 +150,7 @@ def _format_diff_output(
     if diff.meta_changes:
         console.print("[magenta]📝 Metadados modificados:[/]")
         for key, change in diff.meta_changes.items():
-            console.print(f"  {key}: [dim]{change.get('before')} → {change.get('after')}[/]")
+            console.print(f"  {key}: [dim]{change.before} → {change.after}[/]")
 
 
 @click.command("list")
@@ -41,13 +41,16 @@ from rich.table import Table
 from ...adapter import SmartFormatAdapter
 from ...cache import ExecutionHistory
 from ...config import BrainConfig
-from ...generator import UTDLGenerator
-from ...ingestion import parse_openapi
-from ...ingestion.swagger import spec_to_requirement_text
 from ...runner import run_plan, RunnerResult
 from ...validator import UTDLValidator, Plan
 from ..registry import register_command
-from ..utils import load_config, get_default_model, get_runner_path, get_runner_search_paths
+from ..utils import (
+    get_default_model,
+    get_runner_path,
+    get_runner_search_paths,
+    load_config,
+    write_json_file,
+)
 
 
 def _get_execution_history() -> ExecutionHistory:
@@ -309,9 +312,13 @@ def run(
                     console.print(f"[red]❌ Arquivo não encontrado: {swagger}[/red]")
                 raise SystemExit(1)
 
+            # Import tardio: a ingestão carrega o validador OpenAPI
+            from ...ingestion import parse_openapi_cached
+            from ...ingestion.swagger import spec_to_requirement_text
+
             console.print(f"📖 Parseando spec: [cyan]{swagger}[/cyan]")
             try:
-                spec = parse_openapi(swagger)
+                spec = parse_openapi_cached(swagger)
             except Exception as e:
                 if json_output:
                     _print_json_error(error_console, "PARSE_ERROR", str(e))
@@ -355,6 +362,10 @@ def run(
                     plan_dict["config"]["base_url"] = final_base_url
                     plan = Plan.model_validate(plan_dict)
                 else:
+                    # Import tardio: o gerador carrega os SDKs de LLM, que só
+                    # são necessários quando o plano é gerado aqui
+                    from ...generator import UTDLGenerator
+
                     generator = UTDLGenerator()
                     plan = generator.generate(str(requirement_text), final_base_url)
                 progress.update(task, completed=True)
@@ -368,7 +379,8 @@ def run(
 
         # Salva plano se solicitado
         if save_plan:
-            Path(save_plan).write_text(plan.to_json(), encoding="utf-8")
+            with open(save_plan, "wb") as fp:
+                plan.dump_json(fp)
             if not quiet and not json_output:
                 console.print(f"📄 Plano salvo em: [cyan]{save_plan}[/cyan]")
 
@@ -458,10 +470,7 @@ def run(
         if report:
             report_path = Path(report)
             report_path.parent.mkdir(parents=True, exist_ok=True)
-            report_path.write_text(
-                json.dumps(result.raw_report, indent=2, ensure_ascii=False),
-                encoding="utf-8"
-            )
+            write_json_file(report_path, result.raw_report)
         raise SystemExit(0 if result.success else 1)
 
     console.print()
@@ -514,10 +523,7 @@ def run(
     if report:
         report_path = Path(report)
         report_path.parent.mkdir(parents=True, exist_ok=True)
-        report_path.write_text(
-            json.dumps(result.raw_report, indent=2, ensure_ascii=False),
-            encoding="utf-8"
-        )
+        write_json_file(report_path, result.raw_report)
         console.print(f"\n📊 Relatório salvo em: [cyan]{report}[/cyan]")
 
     # Mostra ID da execução para referência
@@ -113,7 +113,7 @@ def serve(
       Swagger UI: http://localhost:PORT/docs
       ReDoc:      http://localhost:PORT/redoc
     """
-    console: Console = ctx.obj.get("console", Console())
+    console: Console = ctx.obj["console"]
     quiet = ctx.obj.get("quiet", False)
 
     # Configura ambiente
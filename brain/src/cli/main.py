@@ -30,6 +30,8 @@ import click
 from rich.console import Console
 from rich.logging import RichHandler
 
+from .registry import LazyGroup
+
 # Console global para output formatado
 console = Console()
 error_console = Console(stderr=True)
@@ -59,7 +61,7 @@ def setup_logging(verbose: bool, quiet: bool) -> None:
 # =============================================================================
 
 
-@click.group()
+@click.group(cls=LazyGroup)
 @click.version_option(version="0.3.0", prog_name="aqa")
 @click.option(
     "--verbose",
@@ -121,20 +123,6 @@ def cli(ctx: click.Context, verbose: bool, quiet: bool, json_output: bool) -> No
     ctx.obj["error_console"] = error_console
 
 
-# =============================================================================
-# IMPORTA E REGISTRA SUBCOMANDOS
-# =============================================================================
-
-# Usa o sistema de registry para carregar e registrar comandos
-from .registry import load_commands, register_all_commands
-
-# Carrega todos os comandos (dispara os imports e registra via decorator)
-load_commands()
-
-# Registra os comandos carregados no grupo principal
-register_all_commands(cli)
-
-
 # =============================================================================
 # PONTO DE ENTRADA
 # =============================================================================
@@ -15,8 +15,9 @@ Antes, os comandos eram importados no final de cli/main.py, o que:
 ## Como funciona:
 
 1. Cada comando se registra usando o decorator `@register_command`
-2. O main.py chama `register_all_commands(cli)` para registrar todos
-3. Os imports são feitos de forma controlada
+2. O grupo principal (`LazyGroup`) importa o módulo do comando, listado em
+   `COMMAND_MODULES`, só quando o comando é usado
+3. `register_all_commands(cli)` adiciona ao grupo os comandos registrados
 
 ## Exemplo de uso em um comando:
 
@@ -40,6 +41,7 @@ def my_command():
 
 from __future__ import annotations
 
+import importlib
 from typing import TYPE_CHECKING, TypeVar
 
 import click
@@ -58,6 +60,21 @@ T = TypeVar("T", bound=click.Command)
 # Lista de comandos registrados (nome, comando)
 _registered_commands: list[click.Command] = []
 
+# Nome do subcomando → módulo em `commands/` que o define (ver LazyGroup)
+COMMAND_MODULES: dict[str, str] = {
+    "init": "init_cmd",
+    "generate": "generate_cmd",
+    "validate": "validate_cmd",
+    "run": "run_cmd",
+    "explain": "explain_cmd",
+    "demo": "demo_cmd",
+    "plan": "plan_cmd",
+    "history": "history_cmd",
+    "show": "show_cmd",
+    "planversion": "plan_version_cmd",
+    "serve": "serve_cmd",
+}
+
 
 def register_command(cmd: T) -> T:
     """
@@ -105,6 +122,26 @@ def register_all_commands(cli_group: click.Group) -> None:
             cli_group.add_command(cmd)
 
 
+class LazyGroup(click.Group):
+    """
+    Grupo click que só importa o módulo de um subcomando quando ele é usado.
+
+    `aqa validate plan.json` carrega apenas `validate_cmd`, sem pagar o
+    import dos demais comandos (e das dependências deles). Listagens como
+    `aqa --help` ainda importam todos, pois precisam do help de cada um.
+    """
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*self.commands, *COMMAND_MODULES})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in COMMAND_MODULES:
+            # O import registra o comando via decorator
+            importlib.import_module(f"{__package__}.commands.{COMMAND_MODULES[cmd_name]}")
+            register_all_commands(self)
+        return self.commands.get(cmd_name)
+
+
 def load_commands() -> None:
     """
     Importa todos os módulos de comandos para registrá-los.
@@ -8,13 +8,21 @@ Funções auxiliares compartilhadas entre os comandos do CLI.
 
 from __future__ import annotations
 
+import copy
+import json
 import os
 import shutil
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import yaml
 
+from ..json_utils import loads_json
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
 
 def load_config() -> dict[str, Any]:
     """
@@ -38,21 +46,104 @@ def load_config() -> dict[str, Any]:
 
     while current != current.parent:
         config_path = current / ".aqa" / "config.yaml"
-        if config_path.exists():
-            try:
-                content = config_path.read_text(encoding="utf-8")
-                loaded = yaml.safe_load(content)
-                if isinstance(loaded, dict):
-                    return dict(loaded)  # type: ignore[arg-type]
-                return {}
-            except Exception:
-                return {}
-        current = current.parent
+        try:
+            mtime_ns = config_path.stat().st_mtime_ns
+        except OSError:
+            current = current.parent
+            continue
+        # Cópia: o dict em cache é compartilhado entre chamadas
+        return copy.deepcopy(_load_config_cached(str(config_path), mtime_ns))
 
     # Não encontrou, retorna vazio
     return {}
 
 
+@lru_cache(maxsize=16)
+def _load_config_cached(path: str, mtime_ns: int) -> dict[str, Any]:
+    """
+    Lê e parseia um config.yaml, memoizado por caminho e mtime.
+
+    Editar o arquivo (ex: `aqa init --force`) muda o mtime e, com ele, a
+    chave do cache, então não é preciso invalidar nada manualmente.
+
+    ## Parâmetros:
+        path: Caminho do config.yaml
+        mtime_ns: `st_mtime_ns` do arquivo (só compõe a chave do cache)
+    """
+    try:
+        content = Path(path).read_text(encoding="utf-8")
+        loaded = yaml.safe_load(content)
+        if isinstance(loaded, dict):
+            return dict(loaded)  # type: ignore[arg-type]
+        return {}
+    except Exception:
+        return {}
+
+
+def read_json_file(path: Path) -> Any:
+    """
+    Lê e parseia um arquivo JSON.
+
+    Lê os bytes e parseia direto, sem decodificar para `str` antes, com
+    `loads_json`: orjson quando instalado, com o mesmo resultado de
+    `json.loads` (NaN/Infinity e inteiros maiores que 64 bits incluídos).
+    JSON inválido levanta `json.JSONDecodeError`.
+
+    ## Parâmetros:
+        path: Arquivo a ler
+    """
+    return loads_json(path.read_bytes())
+
+
+def write_json_file(path: Path, data: Any) -> None:
+    """
+    Grava `data` em `path` como JSON indentado (2 espaços, UTF-8 sem escapes).
+
+    Usa orjson quando instalado: serialização nativa, já em bytes UTF-8.
+    Sem orjson, ou se ele rejeitar o valor (ex: tipo não suportado), usa
+    `json.dump` escrevendo direto no arquivo, sem montar a string inteira.
+
+    ## Parâmetros:
+        path: Arquivo de destino
+        data: Valor serializável em JSON
+    """
+    try:
+        import orjson
+    except ImportError:
+        orjson = None  # type: ignore[assignment]
+
+    if orjson is not None:
+        try:
+            path.write_bytes(
+                orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
+            return
+        except TypeError:
+            pass
+
+    with path.open("w", encoding="utf-8") as fp:
+        json.dump(data, fp, indent=2, ensure_ascii=False)
+
+
+def print_json_output(console: Console, data: Any) -> None:
+    """
+    Imprime `data` como JSON indentado (saída de `--json`).
+
+    Em terminal usa `console.print_json` (com realce de sintaxe). Fora de
+    terminal (pipe, arquivo, CI) o realce não aparece, então escreve o texto
+    de `json.dumps` direto no arquivo do console, sem passar pelo
+    highlighter e pelo render do Rich. O texto é o mesmo nos dois casos.
+
+    ## Parâmetros:
+        console: Console de saída (respeita `quiet`)
+        data: Valor serializável em JSON
+    """
+    if console.is_terminal:
+        console.print_json(data=data)
+    elif not console.quiet:
+        console.file.write(json.dumps(data, indent=2, ensure_ascii=False) + "\n")
+
+
 def get_default_model() -> str:
     """
     Retorna o modelo LLM padrão a usar.
@@ -68,7 +68,7 @@ from ..validator import Plan
 from .prompts import ERROR_CORRECTION_PROMPT, SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
 
 # Cache: Sistema de cache para evitar chamadas repetidas ao LLM
-from ..cache import PlanCache
+from ..cache import NullPlanCache, PlanCache
 
 
 # =============================================================================
@@ -199,7 +199,7 @@ class UTDLGenerator:
                 compress=True,
             )
         else:
-            self._cache = PlanCache(enabled=False)
+            self._cache = NullPlanCache()
 
         # Guarda info do provider para o hash do cache
         self._primary_provider = primary
@@ -1,4 +1,4 @@
-from .swagger import parse_openapi, spec_to_requirement_text
+from .swagger import load_spec_file, parse_openapi, parse_openapi_cached, spec_to_requirement_text
 from .negative_cases import (
     NegativeCase,
     NegativeTestResult,
@@ -46,7 +46,9 @@ from .security import (
 
 __all__ = [
     # swagger
+    "load_spec_file",
     "parse_openapi",
+    "parse_openapi_cached",
     "spec_to_requirement_text",
     # negative_cases
     "NegativeCase",
@@ -38,9 +38,21 @@ que a IA pode usar para gerar planos de teste automaticamente.
 
 from __future__ import annotations
 
+# codecs: BOM UTF-8 (specs exportadas por algumas ferramentas o incluem)
+import codecs
+
+# hashlib: Para a chave do cache de specs em disco
+import hashlib
+
 # json: Para ler arquivos .json
 import json
 
+# os: Para gravação atômica do cache de specs
+import os
+
+# re: Para detectar JSON que o PyYAML leria de outro jeito
+import re
+
 # dataclass: Simplifica criação de classes de dados
 from dataclasses import dataclass, field
 
@@ -50,9 +62,28 @@ from pathlib import Path
 # typing: Anotações de tipo para melhor documentação
 from typing import Any, Hashable, Mapping, cast
 
-# openapi_spec_validator: Biblioteca que valida specs OpenAPI
-from openapi_spec_validator import validate
-from openapi_spec_validator.validation.exceptions import OpenAPIValidationError
+# openapi_spec_validator (valida specs OpenAPI) é importado dentro de
+# `validate_openapi_spec`: custa ~300 ms e não é usado quando a spec vem
+# do cache em disco (`parse_openapi_cached`)
+
+# orjson: opcional, acelera a gravação do cache de specs
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# loads_json: parse JSON com orjson e fallback para a stdlib (mesmo
+# resultado de json.loads), compartilhado com o CLI
+from ..json_utils import loads_json as _json_loads
+
+# Trechos de JSON que o PyYAML (YAML 1.1) lê diferente: números com
+# expoente (`1e5` vira a string '1e5'), NaN/Infinity (strings no YAML) e
+# escapes de surrogate (`\ud83d`, erro no YAML). Com um deles, um .yaml
+# com conteúdo JSON não usa o atalho do parser JSON
+_YAML_JSON_MISMATCH_RE = re.compile(rb"[0-9][eE]|NaN|Infinity|\\u[dD][89abAB]")
+
+# Subdiretório do cache global (~/.aqa/cache/) com as specs parseadas
+SPEC_CACHE_SUBDIR = "openapi"
 
 
 # =============================================================================
@@ -197,6 +228,9 @@ def validate_openapi_spec(spec: dict[str, Any]) -> ValidationResult:
     # Validação completa usando openapi-spec-validator
     # -----------------------------------------------------------------
 
+    from openapi_spec_validator import validate
+    from openapi_spec_validator.validation.exceptions import OpenAPIValidationError
+
     try:
         # cast() é só para o type checker, não faz nada em runtime
         validate(cast(Mapping[Hashable, Any], spec))
@@ -302,16 +336,7 @@ def parse_openapi(
             spec = resp.json()
         else:
             # É um arquivo local
-            path = Path(source)
-            with path.open(encoding="utf-8") as f:
-                if path.suffix in (".yaml", ".yml"):
-                    # Arquivo YAML
-                    import yaml
-
-                    spec = yaml.safe_load(f)
-                else:
-                    # Assume JSON
-                    spec = json.load(f)
+            spec = load_spec_file(Path(source))
 
     # -----------------------------------------------------------------
     # Passo 2: Validação opcional
@@ -322,26 +347,14 @@ def parse_openapi(
     if validate_spec:
         validation_result = validate_openapi_spec(spec)
 
-        if not validation_result.is_valid:
-            if strict:
-                # Modo estrito: lança exceção
-                raise OpenAPIValidationException(
-                    f"Especificação OpenAPI inválida: {', '.join(validation_result.errors)}",
-                    validation_result,
-                )
-            # Modo não-estrito: loga warnings e continua
-            import logging
-
-            logger = logging.getLogger(__name__)
-            for error in validation_result.errors:
-                logger.warning("OpenAPI validation error: %s", error)
-
-        # Loga warnings independente de validez
-        for warning in validation_result.warnings:
-            import logging
-
-            logger = logging.getLogger(__name__)
-            logger.info("OpenAPI validation warning: %s", warning)
+        if not validation_result.is_valid and strict:
+            # Modo estrito: lança exceção
+            raise OpenAPIValidationException(
+                f"Especificação OpenAPI inválida: {', '.join(validation_result.errors)}",
+                validation_result,
+            )
+        # Modo não-estrito: loga erros e avisos e continua
+        _log_validation(validation_result.errors, validation_result.warnings)
 
     # -----------------------------------------------------------------
     # Passo 3: Normalização
@@ -360,6 +373,148 @@ def parse_openapi(
     return normalized
 
 
+def parse_openapi_cached(
+    source: str | Path,
+    *,
+    cache_dir: Path | None = None,
+) -> dict[str, Any]:
+    """
+    Como `parse_openapi(source)`, mas reaproveita o resultado de arquivos locais.
+
+    ## Para todos entenderem:
+    Ler, validar e normalizar uma spec grande leva centenas de ms, e em
+    loops de CI/dev a mesma spec é parseada a cada `aqa generate`/`aqa run`.
+    O resultado normalizado fica salvo em JSON no cache global, com chave
+    derivada do caminho, mtime e tamanho do arquivo (e do mtime deste
+    módulo, para que mudanças na normalização invalidem entradas antigas).
+    Editar a spec muda a chave: nada precisa ser invalidado à mão. O nome
+    do arquivo começa pelo hash do caminho, e gravar uma entrada nova
+    remove as anteriores da mesma spec: o cache guarda uma entrada por
+    spec, em vez de crescer a cada edição.
+
+    URLs não entram no cache (não há mtime para detectar mudanças). Specs
+    cujo resultado não sobrevive a um round-trip JSON (ex: datas do YAML,
+    chaves inteiras) também não são cacheadas. Falhas ao gravar o cache são
+    ignoradas: o cache é só uma otimização.
+
+    ## Parâmetros:
+        source: Caminho ou URL da spec
+        cache_dir: Diretório do cache (default: ~/.aqa/cache/openapi/,
+            respeitando AQA_HOME)
+
+    ## Retorna:
+        O mesmo dicionário normalizado de `parse_openapi(source)`
+    """
+    if str(source).startswith(("http://", "https://")):
+        return parse_openapi(source)
+
+    path = Path(source).resolve()
+    stat = path.stat()
+    path_key = hashlib.blake2b(str(path).encode(), digest_size=8).hexdigest()
+    version_key = hashlib.blake2b(
+        f"{stat.st_mtime_ns}:{stat.st_size}:{_MODULE_MTIME_NS}".encode(),
+        digest_size=8,
+    ).hexdigest()
+    if cache_dir is None:
+        from ..cache import get_global_cache_dir
+
+        cache_dir = get_global_cache_dir() / SPEC_CACHE_SUBDIR
+    entry_path = cache_dir / f"{path_key}-{version_key}.json"
+
+    # Hit: devolve o resultado salvo, repetindo os logs da validação
+    try:
+        cached = _json_loads(entry_path.read_bytes())
+    except (OSError, ValueError):
+        cached = None
+    if isinstance(cached, dict):
+        validation = cached.get("validation") or {}
+        _log_validation(validation.get("errors", []), validation.get("warnings", []))
+        return cast(dict[str, Any], cached)
+
+    # Miss: parseia e salva se o resultado for representável em JSON
+    normalized = parse_openapi(path)
+    try:
+        if orjson is not None:
+            data = orjson.dumps(normalized)
+            round_trip = orjson.loads(data)
+        else:
+            data = json.dumps(normalized, ensure_ascii=False).encode("utf-8")
+            round_trip = json.loads(data)
+        if round_trip == normalized:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_name(f".{entry_path.name}.{os.getpid()}.tmp")
+            try:
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, entry_path)
+            except OSError:
+                tmp_path.unlink(missing_ok=True)
+            else:
+                # Entradas de versões anteriores da spec nunca mais serão lidas
+                for stale_path in cache_dir.glob(f"{path_key}-*.json"):
+                    if stale_path != entry_path:
+                        stale_path.unlink(missing_ok=True)
+    except (TypeError, ValueError, OSError):
+        pass
+    return normalized
+
+
+def load_spec_file(path: Path) -> Any:
+    """
+    Lê e parseia um arquivo de spec local (JSON ou YAML).
+
+    ## Para todos entenderem:
+    O arquivo é lido uma vez em bytes e parseado direto, sem decodificar
+    para texto. JSON usa orjson quando instalado (parser nativo, bem mais
+    rápido que o `json` da stdlib). Um `.yaml`/`.yml` cujo conteúdo é um
+    objeto JSON (comum em specs exportadas) tenta o parser JSON primeiro
+    e só cai no PyYAML se não for JSON válido, ou se tiver algo que o
+    PyYAML leria diferente (ex: `1e5`, que em YAML 1.1 é string): o
+    resultado é sempre o mesmo de `yaml.safe_load`. O PyYAML usa o loader em C
+    (libyaml, `CSafeLoader`) quando disponível, bem mais rápido que o
+    `SafeLoader` em Python puro e com o mesmo resultado. Um BOM UTF-8 no
+    início é ignorado.
+
+    ## Parâmetros:
+        path: Caminho do arquivo
+
+    ## Retorna:
+        O documento parseado (normalmente um dict)
+    """
+    raw = path.read_bytes()
+    if raw.startswith(codecs.BOM_UTF8):
+        raw = raw[len(codecs.BOM_UTF8):]
+
+    if path.suffix in (".yaml", ".yml"):
+        if raw.lstrip()[:1] == b"{" and _YAML_JSON_MISMATCH_RE.search(raw) is None:
+            try:
+                return _json_loads(raw)
+            except ValueError:
+                pass
+        import yaml
+
+        return yaml.load(raw, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+    # Assume JSON
+    return _json_loads(raw)
+
+
+def _log_validation(errors: list[str], warnings: list[str]) -> None:
+    """Loga erros (warning) e avisos (info) da validação de uma spec."""
+    if not errors and not warnings:
+        return
+    import logging
+
+    logger = logging.getLogger(__name__)
+    for error in errors:
+        logger.warning("OpenAPI validation error: %s", error)
+    for warning in warnings:
+        logger.info("OpenAPI validation warning: %s", warning)
+
+
+# mtime deste módulo: compõe a chave do cache de specs (ver parse_openapi_cached)
+_MODULE_MTIME_NS = os.stat(__file__).st_mtime_ns
+
+
 # =============================================================================
 # FUNÇÕES DE NORMALIZAÇÃO (Internas)
 # =============================================================================
@@ -0,0 +1,54 @@
+"""
+================================================================================
+LEITURA DE JSON (orjson com fallback para a stdlib)
+================================================================================
+
+Parser JSON compartilhado para documentos vindos de fora (specs OpenAPI,
+planos UTDL lidos pelo CLI).
+
+## Para todos entenderem:
+
+O orjson é bem mais rápido que o `json` da stdlib, mas não aceita tudo o
+que ela aceita: rejeita NaN/Infinity e converte inteiros maiores que 64
+bits em float (perdendo precisão). `loads_json` usa o orjson quando o
+resultado é o mesmo e a stdlib nos demais casos, então quem chama recebe
+sempre o mesmo resultado de `json.loads`.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+# orjson: opcional, acelera o parse
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# 19+ dígitos seguidos: possível inteiro fora de 64 bits, que o orjson
+# converte em float; a stdlib o mantém como int
+_LONG_DIGITS_RE = re.compile(rb"\d{19,}")
+
+
+def loads_json(raw: bytes) -> Any:
+    """
+    Parseia JSON em bytes, com o mesmo resultado de `json.loads`.
+
+    Usa orjson quando instalado. Se o orjson falhar (ex: NaN/Infinity), ou
+    se o documento tiver uma sequência longa de dígitos, o parse é feito
+    pela stdlib.
+
+    ## Parâmetros:
+        raw: Documento JSON em bytes (UTF-8, BOM opcional)
+
+    ## Exceções:
+        json.JSONDecodeError: JSON inválido (subclasse de ValueError)
+    """
+    if orjson is not None and _LONG_DIGITS_RE.search(raw) is None:
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            pass
+    return json.loads(raw)
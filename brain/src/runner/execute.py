@@ -334,13 +334,12 @@ def run_plan(
     # NamedTemporaryFile cria arquivo com nome único
     # delete=False porque precisamos do arquivo após fechar
     with tempfile.NamedTemporaryFile(
-        mode="w",
+        mode="wb",
         suffix=".json",
         delete=False,
-        encoding="utf-8",
     ) as plan_file:
         # Serializa o plano para JSON e escreve no arquivo
-        plan_file.write(execution_plan.to_json())
+        execution_plan.dump_json(plan_file)
         plan_path = plan_file.name  # Guarda o caminho
 
     # -----------------------------------------------------------------
@@ -64,7 +64,7 @@ import uuid
 from datetime import datetime, timezone
 
 # typing: Anotações de tipo
-from typing import Any, Literal
+from typing import Any, BinaryIO, Literal
 
 # Pydantic: Biblioteca de validação de dados
 from pydantic import BaseModel, Field, field_validator, model_validator
@@ -575,6 +575,20 @@ class Plan(BaseModel):
         """
         return self.model_dump_json(indent=2)
 
+    def dump_json(self, fp: BinaryIO) -> None:
+        """
+        Escreve o plano como JSON formatado direto em um arquivo binário.
+
+        ## Para todos entenderem:
+        Mesmo conteúdo de `to_json()`, mas o serializador do Pydantic já
+        produz bytes UTF-8: gravá-los direto evita decodificar para `str`
+        e codificar de novo na escrita.
+
+        ## Parâmetros:
+            fp: Arquivo aberto em modo binário (ex: `open(path, "wb")`)
+        """
+        fp.write(self.__pydantic_serializer__.to_json(self, indent=2))
+
     def to_dict(self) -> dict[str, Any]:
         """
         Serializa o plano para dicionário Python.
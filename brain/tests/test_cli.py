@@ -8,8 +8,10 @@ Testes para os comandos do CLI `aqa`.
 
 from __future__ import annotations
 
+import io
 import json
 import os
+import subprocess
 import sys
 import tempfile
 from pathlib import Path
@@ -18,12 +20,20 @@ from unittest.mock import patch
 
 import pytest
 from click.testing import CliRunner
+from rich.console import Console
 
 # Adiciona o diretório brain ao path para imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.cli.main import cli
-from src.cli.utils import get_runner_path, get_runner_search_paths, load_config
+from src.cli.utils import (
+    get_runner_path,
+    get_runner_search_paths,
+    load_config,
+    print_json_output,
+    read_json_file,
+    write_json_file,
+)
 
 
 # =============================================================================
@@ -114,6 +124,28 @@ class TestCliHelp:
         assert "--quiet" in result.output
         assert "--json" in result.output
 
+    def test_subcommand_imports_only_its_module(self) -> None:
+        """Invocar um subcomando não importa os módulos dos outros (nem o gerador)."""
+        code = (
+            "import sys\n"
+            "from src.cli.main import cli\n"
+            "try:\n"
+            "    cli(['validate', '--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "loaded = [m for m in ('src.cli.commands.validate_cmd',\n"
+            "          'src.cli.commands.run_cmd', 'src.generator') if m in sys.modules]\n"
+            "print(loaded, file=sys.stderr)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parent.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stderr.strip().splitlines()[-1] == "['src.cli.commands.validate_cmd']"
+
 
 # =============================================================================
 # TESTES DO COMANDO VALIDATE
@@ -264,6 +296,72 @@ class TestUtils:
             finally:
                 os.chdir(original_cwd)
 
+    def test_load_config_reloads_after_edit(self, tmp_path: Path) -> None:
+        """load_config reaproveita o parse em cache e relê quando o arquivo muda."""
+        config_path = tmp_path / ".aqa" / "config.yaml"
+        config_path.parent.mkdir()
+        config_path.write_text("model: a\n", encoding="utf-8")
+        original_cwd = os.getcwd()
+        try:
+            os.chdir(tmp_path)
+            first = load_config()
+            first["model"] = "mutado"
+            assert load_config() == {"model": "a"}
+
+            config_path.write_text("model: b\n", encoding="utf-8")
+            stat = config_path.stat()
+            os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            assert load_config() == {"model": "b"}
+        finally:
+            os.chdir(original_cwd)
+
+    def test_write_json_file_matches_stdlib_format(self, tmp_path: Path) -> None:
+        """write_json_file grava o mesmo texto que json.dumps(indent=2, ensure_ascii=False)."""
+        # O segundo valor (int > 64 bits) força o fallback para stdlib quando há orjson
+        for data in ({"nome": "ação", "steps": [1, {"ok": None}]}, {"big": 10**30}):
+            path = tmp_path / "report.json"
+            write_json_file(path, data)
+            assert path.read_text(encoding="utf-8") == json.dumps(data, indent=2, ensure_ascii=False)
+
+    def test_print_json_output_plain_when_not_terminal(self) -> None:
+        """Fora de terminal, print_json_output escreve o mesmo texto de json.dumps."""
+        data: dict[str, Any] = {"nome": "ação", "steps": [1, {"ok": None}]}
+        buffer = io.StringIO()
+        print_json_output(Console(file=buffer), data)
+        assert buffer.getvalue() == json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+        quiet_buffer = io.StringIO()
+        print_json_output(Console(file=quiet_buffer, quiet=True), data)
+        assert quiet_buffer.getvalue() == ""
+
+    def test_read_json_file_round_trip(self, tmp_path: Path) -> None:
+        """read_json_file lê de volta o que write_json_file gravou."""
+        data: dict[str, Any] = {"nome": "ação", "steps": [1, 2.5, {"ok": None}]}
+        path = tmp_path / "plan.json"
+        write_json_file(path, data)
+
+        assert read_json_file(path) == data
+
+    def test_read_json_file_raises_json_decode_error(self, tmp_path: Path) -> None:
+        """JSON inválido levanta json.JSONDecodeError, com ou sem orjson."""
+        path = tmp_path / "broken.json"
+        path.write_text("{not json", encoding="utf-8")
+
+        with pytest.raises(json.JSONDecodeError):
+            read_json_file(path)
+
+    def test_read_json_file_matches_stdlib(self, tmp_path: Path) -> None:
+        """NaN e inteiros maiores que 64 bits são lidos como pelo json da stdlib."""
+        raw = '{"steps": [], "x": NaN, "big": 123456789012345678901234567890}'
+        path = tmp_path / "plan.json"
+        path.write_text(raw, encoding="utf-8")
+
+        plan = read_json_file(path)
+
+        assert plan["x"] != plan["x"]  # NaN
+        assert plan["big"] == 123456789012345678901234567890
+        assert plan["steps"] == []
+
 
 # =============================================================================
 # TESTES DE MODOS QUIET E VERBOSE
@@ -30,7 +30,7 @@ import pytest
 # Adiciona o diretório brain ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.cache import PlanCache
+from src.cache import IJSON_AVAILABLE, ZSTD_AVAILABLE, PlanCache
 from src.validator import (
     UTDLValidator,
     ValidationMode,
@@ -248,6 +248,197 @@ class TestValidatorCacheIntegration:
         stats = cache.stats()
         assert stats.entries == 0
 
+    def test_cache_large_entry_roundtrip(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """Entries grandes (caminho via mmap) são lidas corretamente."""
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        large_plan: PlanDict = {
+            **valid_plan_dict,
+            "meta": {**valid_plan_dict["meta"], "description": "é" * (PlanCache.ENTRY_MMAP_MIN_SIZE * 2)},
+        }
+
+        cache.store("req-large", "url", large_plan)
+        assert cache.get("req-large", "url") == large_plan
+
+    def test_cache_repeat_hits_served_from_memory(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """Hits repetidos vêm do LRU em memória, sempre como dicts independentes."""
+        from pathlib import Path
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        hash_key = cache.store("req", "url", valid_plan_dict)
+
+        first = cache.get("req", "url")
+        (Path(temp_cache_dir) / cache._index[hash_key]["filename"]).unlink()
+        second = cache.get("req", "url")
+
+        assert first == second == valid_plan_dict
+        assert first is not second
+        first["meta"]["name"] = "mutado"
+        assert cache.get("req", "url")["meta"]["name"] == valid_plan_dict["meta"]["name"]
+
+        cache.invalidate("req", "url")
+        assert cache.get("req", "url") is None
+
+    @pytest.mark.skipif(not IJSON_AVAILABLE, reason="ijson não instalado")
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_cache_large_entry_streamed(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict, compress: bool
+    ) -> None:
+        """Entries acima do limiar de streaming são lidas incrementalmente."""
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True, compress=compress)
+        cache.ENTRY_STREAM_MIN_SIZE = 1
+        plan: PlanDict = {
+            **valid_plan_dict,
+            "config": {**valid_plan_dict["config"], "timeout_ms": 1500, "ratio": 0.25},
+        }
+
+        cache.store("req-stream", "url", plan)
+        assert cache.get("req-stream", "url") == plan
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_cache_entry_is_compact_and_prettify_on_demand(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict, compress: bool
+    ) -> None:
+        """Entries ficam compactas no disco; prettify indenta sob demanda."""
+        from pathlib import Path
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True, compress=compress)
+        hash_key = cache.store("req", "url", valid_plan_dict)
+
+        if not compress:
+            raw = (Path(temp_cache_dir) / cache._index[hash_key]["filename"]).read_bytes()
+            assert b"\n" not in raw
+
+        pretty = cache.prettify(hash_key)
+        assert pretty is not None
+        assert '\n  "plan": {' in pretty
+        assert json.loads(pretty)["plan"] == valid_plan_dict
+        assert cache.prettify("0" * 16) is None
+
+    def test_cache_entry_write_is_atomic(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """Entries são gravadas via temporário + rename, sem sobras."""
+        from pathlib import Path
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        cache.DURABLE_WRITES = True
+        cache.store("req", "url", valid_plan_dict)
+        cache.store("req", "url", valid_plan_dict)
+
+        assert not list(Path(temp_cache_dir).glob("*.tmp"))
+        assert cache.get("req", "url") == valid_plan_dict
+
+    def test_identical_plans_share_one_object(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """Inputs diferentes com o mesmo plano apontam para um único objeto."""
+        from pathlib import Path
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        reordered = dict(reversed(list(valid_plan_dict.items())))
+        first = cache.store("gerar testes de login", "url", valid_plan_dict)
+        second = cache.store("gere testes para o login", "url", reordered)
+
+        filename = cache._index[first]["filename"]
+        assert filename.startswith("objects/")
+        assert cache._index[second]["filename"] == filename
+        assert len(list((Path(temp_cache_dir) / "objects").rglob("*.json"))) == 1
+
+        # Objeto só sai quando a última entrada que aponta para ele sai
+        assert cache.invalidate("gerar testes de login", "url")
+        assert (Path(temp_cache_dir) / filename).exists()
+        assert cache.get("gere testes para o login", "url") == valid_plan_dict
+
+        # Regravar com outro plano libera o objeto antigo (removido no flush)
+        other_plan = {**valid_plan_dict, "meta": {**valid_plan_dict["meta"], "name": "outro"}}
+        cache.store("gere testes para o login", "url", other_plan)
+        cache.flush()
+        assert not (Path(temp_cache_dir) / filename).exists()
+        assert cache.get("gere testes para o login", "url") == other_plan
+
+        # Contagem de referências sobrevive à recarga do índice
+        cache.store("terceiro", "url", other_plan)
+        cache.close()
+        reloaded = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        assert reloaded.invalidate("terceiro", "url")
+        assert reloaded.get("gere testes para o login", "url") == other_plan
+
+    def test_shared_object_survives_release_by_other_instance(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """Objeto referenciado no índice por outra instância não é removido."""
+        from pathlib import Path
+
+        first = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        first.store("req", "url", valid_plan_dict)
+        first.flush()
+
+        second = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        second.store("outro req", "url", valid_plan_dict)
+        second.flush()
+        filename = second._index[second._compute_hash("outro req", "url")]["filename"]
+
+        # Na memória de `first` o objeto perdeu a última referência
+        assert first.invalidate("req", "url")
+        first.flush()
+        assert (Path(temp_cache_dir) / filename).exists()
+        assert second.get("outro req", "url") == valid_plan_dict
+
+        # Sem nenhuma linha no índice, o objeto sai (`second` carregou
+        # "req" do índice, então também o tinha como referência)
+        assert second.invalidate("outro req", "url")
+        assert second.invalidate("req", "url")
+        second.flush()
+        assert not (Path(temp_cache_dir) / filename).exists()
+        first.close()
+        second.close()
+
+    def test_max_entries_evicts_least_recently_used(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """Passar de max_entries remove as entradas acessadas há mais tempo."""
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True, max_entries=10)
+        plans = [
+            {**valid_plan_dict, "meta": {**valid_plan_dict["meta"], "name": f"p{i}"}}
+            for i in range(11)
+        ]
+        for i in range(10):
+            cache.store(f"req-{i}", "url", plans[i])
+        # req-0 acessado por último: não é o mais antigo
+        assert cache.get("req-0", "url") == plans[0]
+
+        cache.store("req-10", "url", plans[10])
+
+        # Volta a EVICT_TARGET do limite, removendo req-1, req-2
+        assert cache.stats().entries == 9
+        assert cache.get("req-0", "url") == plans[0]
+        assert cache.get("req-1", "url") is None
+        assert cache.get("req-2", "url") is None
+        assert cache.get("req-10", "url") == plans[10]
+        assert len(cache._file_refs) == 9
+
+        # Remoções chegam ao índice persistido
+        cache.close()
+        reloaded = PlanCache(cache_dir=temp_cache_dir, enabled=True, max_entries=10)
+        assert reloaded.stats().entries == 9
+
+    def test_cache_entry_file_deleted_externally(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """Arquivo de entry removido por fora vira miss e sai do índice."""
+        from pathlib import Path
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        hash_key = cache.store("req", "url", valid_plan_dict)
+        (Path(temp_cache_dir) / cache._index[hash_key]["filename"]).unlink()
+
+        assert cache.get("req", "url") is None
+        assert hash_key not in cache._index
+
 
 # =============================================================================
 # TESTES DE INTEGRAÇÃO: FLUXO COMPLETO COM MOCK DE LLM
@@ -457,6 +648,154 @@ class TestCacheConcurrency:
         stats = cache.stats()
         assert stats.entries == 10
 
+    def test_hash_locks_are_fixed_stripes(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """Locks por hash não crescem com o número de chaves."""
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        for i in range(200):
+            cache.store(f"req-{i}", "https://api.com", valid_plan_dict)
+            cache.get(f"req-{i}", "https://api.com")
+
+        assert len(cache._key_locks) == PlanCache.LOCK_STRIPES
+        assert cache._get_hash_lock("abc") is cache._get_hash_lock("abc")
+        assert cache.stats().entries == 200
+
+    def test_lock_free_reads_race_with_writes(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """Leituras sem lock concorrendo com store nunca veem plano parcial ou velho."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        plans = [
+            {**valid_plan_dict, "meta": {**valid_plan_dict["meta"], "name": f"v{i}"}}
+            for i in range(20)
+        ]
+        cache.store("req", "url", plans[0])
+
+        def writer() -> None:
+            for plan in plans[1:]:
+                cache.store("req", "url", plan)
+
+        def reader(_: int) -> set[str]:
+            return {cache.get("req", "url")["meta"]["name"] for _ in range(50)}
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            write = executor.submit(writer)
+            seen = set().union(*executor.map(reader, range(4)))
+            write.result()
+
+        assert seen <= {plan["meta"]["name"] for plan in plans}
+        assert cache.get("req", "url")["meta"]["name"] == "v19"
+
+    def test_index_flush_is_deferred(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """O índice é gravado em lote pelo flush, não a cada store."""
+        import sqlite3
+        from pathlib import Path
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        cache.INDEX_FLUSH_INTERVAL = 60.0
+        db_path = Path(temp_cache_dir) / PlanCache.INDEX_DB
+
+        def persisted() -> set[str]:
+            with sqlite3.connect(db_path) as db:
+                return {row[0] for row in db.execute("SELECT hash FROM entries")}
+
+        hash_a = cache.store("req-a", "https://api.com", valid_plan_dict)
+        hash_b = cache.store("req-b", "https://api.com", valid_plan_dict)
+        assert persisted() == set()
+
+        cache.flush()
+        assert persisted() == {hash_a, hash_b}
+
+        cache.invalidate("req-a", "https://api.com")
+        cache.flush()
+        assert persisted() == {hash_b}
+
+    def test_corrupt_index_is_moved_aside_and_recreated(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """index.db ilegível vai para index.db.corrupt e o cache volta a persistir."""
+        from pathlib import Path
+
+        db_path = Path(temp_cache_dir) / PlanCache.INDEX_DB
+        db_path.write_bytes(b"isto nao e um banco sqlite" * 100)
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        cache.store("req", "https://api.com", valid_plan_dict)
+        cache.close()
+
+        assert (Path(temp_cache_dir) / f"{PlanCache.INDEX_DB}.corrupt").exists()
+        reloaded = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        assert reloaded.get("req", "https://api.com") == valid_plan_dict
+
+    def test_legacy_json_index_is_migrated(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """index.json legado é importado para o SQLite e removido."""
+        from pathlib import Path
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        hash_key = cache.store("req-legacy", "https://api.com", valid_plan_dict)
+        cache.close()
+        (Path(temp_cache_dir) / PlanCache.INDEX_DB).unlink()
+
+        # Entry legada: arquivo por hash com o plano embutido
+        (Path(temp_cache_dir) / f"{hash_key}.json").write_text(
+            json.dumps({"hash": hash_key, "plan": valid_plan_dict}), encoding="utf-8"
+        )
+        index_path = Path(temp_cache_dir) / PlanCache.INDEX_FILE
+        index_path.write_text(json.dumps({hash_key: f"{hash_key}.json"}), encoding="utf-8")
+
+        reloaded = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        assert reloaded.get("req-legacy", "https://api.com") == valid_plan_dict
+        assert not index_path.exists()
+
+    def test_index_loads_in_background(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Construtor não espera o índice; operações esperam a carga terminar."""
+        import threading
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        cache.store("req", "url", valid_plan_dict)
+        cache.close()
+
+        release = threading.Event()
+        original_load = PlanCache._load_index
+
+        def slow_load(self: PlanCache) -> None:
+            release.wait(5)
+            original_load(self)
+
+        monkeypatch.setattr(PlanCache, "_load_index", slow_load)
+        reloaded = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        assert not reloaded._index_ready.is_set()
+
+        release.set()
+        assert reloaded.get("req", "url") == valid_plan_dict
+
+    def test_concurrent_writes_persist_full_index(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """Escritas concorrentes em shards diferentes chegam todas ao índice."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            hashes = list(executor.map(
+                lambda i: cache.store(f"req-{i}", "https://api.com", valid_plan_dict),
+                range(40),
+            ))
+
+        cache.flush()
+        reloaded = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        assert set(reloaded._index) == set(hashes)
+        assert reloaded.get("req-7", "https://api.com") is not None
+
 
 # =============================================================================
 # TESTES DE CACHE COM PROVIDER/MODEL
@@ -535,6 +874,32 @@ class TestCacheProviderModel:
 
         assert hash_gpt4 != hash_gpt5
 
+    def test_hash_is_stable_across_versions(self, temp_cache_dir: str) -> None:
+        """
+        Hash é BLAKE2b-64 do input normalizado, igual em qualquer ambiente.
+        """
+        import hashlib
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        expected = hashlib.blake2b(
+            b"teste api|https://api.com|provider:openai|model:gpt-5.1", digest_size=8
+        ).hexdigest()
+
+        assert cache._compute_hash(" Teste API ", "HTTPS://api.com", "OpenAI", "GPT-5.1") == expected
+
+    def test_hash_memo_matches_uncached_path(self, temp_cache_dir: str) -> None:
+        """
+        Requisitos longos (fora do LRU de chaves) geram o mesmo hash.
+        """
+        from src.cache import _CACHE_KEY_MEMO_MAX_LEN, _cache_key
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        long_req = "x" * (_CACHE_KEY_MEMO_MAX_LEN + 1)
+
+        assert cache._compute_hash(long_req, "u") == _cache_key(long_req, "u", None, None)
+        assert cache._compute_hash("req", "u", "p", "m") == _cache_key("req", "u", "p", "m")
+        assert cache._compute_hash("req", "u", "p", "m") == cache._compute_hash(" REQ", "U ", "P", "M")
+
     def test_get_returns_correct_plan_for_provider_model(
         self, temp_cache_dir: str, valid_plan_dict: PlanDict
     ) -> None:
@@ -583,7 +948,6 @@ class TestCacheProviderModel:
         Entry armazenada contém metadados de provider/model para debug.
         """
         import json
-        from pathlib import Path
 
         cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
 
@@ -592,10 +956,9 @@ class TestCacheProviderModel:
             provider="openai", model="gpt-5.1"
         )
 
-        # Lê arquivo diretamente
-        filepath = Path(temp_cache_dir) / f"{hash_key}.json"
-        with open(filepath, "r") as f:
-            entry = json.load(f)
+        # Metadados do input ficam no índice (persistidos) e aparecem na entry
+        cache.close()
+        entry = json.loads(PlanCache(cache_dir=temp_cache_dir).prettify(hash_key))
 
         assert entry["provider"] == "openai"
         assert entry["model"] == "gpt-5.1"
@@ -633,6 +996,60 @@ class TestCacheTTLAndCompression:
         expected = datetime.now(timezone.utc) + timedelta(days=7)
         diff = abs((expires - expected).total_seconds())
         assert diff < 60  # Menos de 1 minuto de diferença
+        assert entry_meta["expires_at_ts"] == pytest.approx(expires.timestamp(), abs=1e-6)
+        created = entry_meta["details"]["created_at"]
+        assert (expires - datetime.fromisoformat(created.replace("Z", "+00:00"))) == timedelta(days=7)
+
+    def test_cleanup_expired_removes_only_past_entries(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """
+        cleanup_expired remove apenas entries vencidas.
+        """
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True, ttl_days=7)
+
+        fresh = cache.store("fresh", "https://api.com", valid_plan_dict)
+        old = cache.store("old", "https://api.com", valid_plan_dict)
+        older = cache.store("older", "https://api.com", valid_plan_dict)
+        cache._shard_for(old)[1][old]["expires_at_ts"] = 1.0
+        cache._shard_for(older)[1][older]["expires_at_ts"] = 0.0
+
+        assert cache.cleanup_expired() == 2
+        assert set(cache._index) == {fresh}
+
+    def test_get_evicts_expired_entry(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """
+        get de entry expirada retorna None e remove índice e arquivo.
+        """
+        from pathlib import Path
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True, ttl_days=7)
+        hash_key = cache.store("req", "https://api.com", valid_plan_dict)
+        filepath = Path(temp_cache_dir) / cache._index[hash_key]["filename"]
+        cache._shard_for(hash_key)[1][hash_key]["expires_at_ts"] = 0.0
+
+        assert cache.get("req", "https://api.com") is None
+        assert hash_key not in cache._index
+        cache.flush()
+        assert not filepath.exists()
+
+    def test_expiry_timestamp_survives_reload(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """
+        expires_at_ts é persistido no índice e bate com expires_at.
+        """
+        from datetime import datetime
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True, ttl_days=7)
+        hash_key = cache.store("req", "https://api.com", valid_plan_dict)
+        cache.close()
+
+        meta = PlanCache(cache_dir=temp_cache_dir, enabled=True)._index[hash_key]
+        expiry = datetime.fromisoformat(meta["expires_at"].replace("Z", "+00:00"))
+        assert meta["expires_at_ts"] == expiry.timestamp()
 
     def test_cache_without_ttl_no_expiry(
         self, temp_cache_dir: str, valid_plan_dict: PlanDict
@@ -648,26 +1065,51 @@ class TestCacheTTLAndCompression:
         assert entry_meta["expires_at"] is None
 
     def test_cache_with_compression_creates_gzip(
-        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """
-        Cache com compressão cria arquivos .gz.
+        Cache com compressão cria arquivos .gz quando zstandard não está instalado.
         """
         import gzip
         from pathlib import Path
 
+        monkeypatch.setattr("src.cache.zstd", None)
         cache = PlanCache(cache_dir=temp_cache_dir, enabled=True, compress=True)
 
         hash_key = cache.store("req", "https://api.com", valid_plan_dict)
 
         # Verifica que arquivo é .json.gz
-        filepath = Path(temp_cache_dir) / f"{hash_key}.json.gz"
+        filepath = Path(temp_cache_dir) / cache._index[hash_key]["filename"]
+        assert filepath.name.endswith(".json.gz")
         assert filepath.exists()
 
-        # Verifica que é gzip válido
+        # Verifica que é gzip válido (o objeto é o próprio plano)
         with gzip.open(filepath, "rt", encoding="utf-8") as f:
-            entry = json.load(f)
-        assert entry["plan"]["meta"]["id"] == valid_plan_dict["meta"]["id"]
+            stored_plan = json.load(f)
+        assert stored_plan["meta"]["id"] == valid_plan_dict["meta"]["id"]
+
+    @pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard não instalado")
+    def test_cache_with_compression_prefers_zstd(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """
+        Com zstandard instalado, entries novas usam zstd e gzip antigo continua legível.
+        """
+        from pathlib import Path
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True, compress=True)
+        hash_key = cache.store("req", "https://api.com", valid_plan_dict)
+
+        filepath = Path(temp_cache_dir) / cache._index[hash_key]["filename"]
+        assert filepath.name.endswith(".json.zst")
+        assert filepath.read_bytes()[:4] == b"\x28\xb5\x2f\xfd"
+        assert cache.get("req", "https://api.com") == valid_plan_dict
+
+        # Entry gravada em gzip por uma versão anterior
+        cache.codec = "gzip"
+        cache.store("req-old", "https://api.com", valid_plan_dict)
+        cache.codec = "zstd"
+        assert cache.get("req-old", "https://api.com") == valid_plan_dict
 
     def test_cache_compressed_can_be_retrieved(
         self, temp_cache_dir: str, valid_plan_dict: PlanDict
@@ -698,6 +1140,25 @@ class TestCacheTTLAndCompression:
         assert stats.compressed_entries == 2
         assert stats.size_bytes > 0
 
+    def test_cache_stats_size_comes_from_index(
+        self, temp_cache_dir: str, valid_plan_dict: PlanDict
+    ) -> None:
+        """
+        size_bytes vem do índice (registrado no store), inclusive após reabrir.
+        """
+        from pathlib import Path
+
+        cache = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        cache.store("req1", "https://api.com", valid_plan_dict)
+        cache.store("req2", "https://api.com", valid_plan_dict)
+        on_disk = sum(p.stat().st_size for p in Path(temp_cache_dir).rglob("*.json"))
+        assert cache.stats().size_bytes == on_disk
+        cache.close()
+
+        reloaded = PlanCache(cache_dir=temp_cache_dir, enabled=True)
+        assert all(meta["size_bytes"] for meta in reloaded._index.values())
+        assert reloaded.stats().size_bytes == on_disk
+
 
 # =============================================================================
 # TESTES DE HISTÓRICO DE EXECUÇÕES
@@ -762,6 +1223,17 @@ class TestExecutionHistory:
         assert recent[0]["plan_file"] == "plan3.json"  # Mais recente primeiro
         assert recent[1]["plan_file"] == "plan2.json"
 
+        # Só metadados públicos: a localização no disco fica no índice
+        assert set(recent[0]) == {
+            "id", "timestamp", "plan_file", "plan_hash", "duration_ms",
+            "total_steps", "passed_steps", "failed_steps", "status",
+        }
+        assert set(history.get_by_status("success")[0]) == set(recent[0])
+
+        # Dicts retornados são cópias: alterá-los não afeta o índice
+        recent[0]["status"] = "error"
+        assert history.get_recent(limit=1)[0]["status"] == "success"
+
     def test_get_by_status_filters_correctly(
         self, temp_cache_dir: str
     ) -> None:
@@ -823,6 +1295,489 @@ class TestExecutionHistory:
         assert stats["failure_count"] == 1
         assert stats["error_count"] == 1
 
+    def test_records_are_appended_to_daily_log(
+        self, temp_cache_dir: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        Registros vão para um log append-only por dia e são lidos por offset.
+        """
+        import gzip
+        import json
+        from pathlib import Path
+
+        from src.cache import ExecutionHistory, HistoryIndexEntry
+
+        history = ExecutionHistory(history_dir=temp_cache_dir, enabled=True)
+        first = history.record_execution(
+            plan_file="a.json", duration_ms=100, total_steps=1,
+            passed_steps=1, failed_steps=0, status="success",
+            runner_report={"steps": [{"id": "s1", "status": "passed"}]},
+        )
+        second = history.record_execution(
+            plan_file="b.json", duration_ms=200, total_steps=1,
+            passed_steps=0, failed_steps=1, status="failure",
+        )
+
+        logs = list(Path(temp_cache_dir).glob("*/records.log"))
+        assert len(logs) == 1
+        assert not list(Path(temp_cache_dir).glob("*/*.json*"))
+
+        # Outra instância lê os registros a partir do índice persistido
+        reloaded = ExecutionHistory(history_dir=temp_cache_dir, enabled=True)
+        full = reloaded.get_full_record(first.id)
+        assert full is not None
+        assert full["runner_report"] == {"steps": [{"id": "s1", "status": "passed"}]}
+        assert reloaded.get_full_record(second.id)["plan_file"] == "b.json"
+
+        # Registro legado em arquivo individual continua legível
+        date_dir = logs[0].parent
+        legacy = {"id": "legacy000001", "plan_file": "old.json", "runner_report": None}
+        with gzip.open(date_dir / "legacy000001.json.gz", "wt", encoding="utf-8") as f:
+            json.dump(legacy, f, indent=2)
+        reloaded._index.append(
+            HistoryIndexEntry(id="legacy000001", file=f"{date_dir.name}/legacy000001.json.gz")
+        )
+        reloaded._reindex()
+        assert reloaded.get_full_record("legacy000001") == legacy
+
+        # O log só é removido quando o último registro dele sai do índice,
+        # e nunca o do dia atual (outros processos podem anexar a ele)
+        assert reloaded.delete(first.id) is True
+        assert logs[0].exists()
+        assert reloaded.delete_bulk([second.id, "legacy000001"]) == 2
+        assert logs[0].exists()
+        reloaded.record_execution(
+            plan_file="c.json", duration_ms=300, total_steps=1,
+            passed_steps=1, failed_steps=0, status="success",
+        )
+        monkeypatch.setattr("src.cache._utc_today", lambda: "1999-12-31")
+        assert reloaded.delete_bulk([reloaded.get_recent(1)[0]["id"]]) == 1
+        assert not logs[0].exists()
+        assert not (date_dir / "legacy000001.json.gz").exists()
+
+    def test_delete_during_append_keeps_new_record(
+        self, temp_cache_dir: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        delete() concorrente com um record_execution não remove o log em que
+        o novo registro acabou de ser gravado.
+        """
+        import threading
+
+        from src.cache import ExecutionHistory
+
+        history = ExecutionHistory(history_dir=temp_cache_dir, enabled=True)
+        first = history.record_execution(
+            plan_file="a.json", duration_ms=100, total_steps=1,
+            passed_steps=1, failed_steps=0, status="success",
+        )
+
+        # Sem a proteção do dia atual, só a marcação de anexo em andamento
+        # impede a remoção do log
+        monkeypatch.setattr("src.cache._utc_today", lambda: "1999-12-31")
+        original_append = history._append_record
+        deleted: list[bool] = []
+        threads: list[threading.Thread] = []
+
+        def append_then_delete(date_dir: Any, payload: bytes) -> tuple[int, int]:
+            result = original_append(date_dir, payload)
+            # Outro thread remove o único registro indexado no log do dia
+            t = threading.Thread(target=lambda: deleted.append(history.delete(first.id)))
+            threads.append(t)
+            t.start()
+            t.join(timeout=0.2)
+            return result
+
+        monkeypatch.setattr(history, "_append_record", append_then_delete)
+        second = history.record_execution(
+            plan_file="b.json", duration_ms=200, total_steps=1,
+            passed_steps=1, failed_steps=0, status="success",
+        )
+        threads[0].join()
+
+        assert deleted == [True]
+        assert history.count() == 1
+        full = history.get_full_record(second.id)
+        assert full is not None
+        assert full["plan_file"] == "b.json"
+
+    def test_index_is_append_only_log(
+        self, temp_cache_dir: str
+    ) -> None:
+        """
+        Índice é um log NDJSON: inserções anexam, remoções viram marcadores
+        e a compactação acontece ao passar de 2 * max_records linhas.
+        """
+        import json
+        from pathlib import Path
+
+        from src.cache import ExecutionHistory
+
+        history = ExecutionHistory(history_dir=temp_cache_dir, max_records=3)
+        ids = [
+            history.record_execution(
+                plan_file=f"p{i}.json", duration_ms=100, total_steps=1,
+                passed_steps=1, failed_steps=0, status="success",
+            ).id
+            for i in range(4)
+        ]
+        history.delete(ids[2])
+
+        log_path = Path(temp_cache_dir) / "index.log"
+        lines = log_path.read_text(encoding="utf-8").splitlines()
+        # 4 entradas + marcador do trim de ids[0] + marcador do delete
+        assert len(lines) == 6
+        assert json.loads(lines[-2]) == {"deleted": ids[0]}
+        assert json.loads(lines[-1]) == {"deleted": ids[2]}
+
+        # Recarga reproduz o log: entradas removidas ou cortadas não voltam
+        reloaded = ExecutionHistory(history_dir=temp_cache_dir, max_records=3)
+        assert [r["id"] for r in reloaded.get_recent()] == [ids[3], ids[1]]
+
+        # Linha parcial (queda durante escrita) é descartada na carga
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write('{"id": "trunc')
+        reloaded = ExecutionHistory(history_dir=temp_cache_dir, max_records=3)
+        assert reloaded.count() == 2
+        assert len(log_path.read_text(encoding="utf-8").splitlines()) == 2
+
+        # Passando de 2 * max_records linhas o log é reescrito
+        for i in range(4, 7):
+            reloaded.record_execution(
+                plan_file=f"p{i}.json", duration_ms=100, total_steps=1,
+                passed_steps=1, failed_steps=0, status="success",
+            )
+        compacted = log_path.read_text(encoding="utf-8").splitlines()
+        assert len(compacted) == 3
+        assert [json.loads(line)["plan_file"] for line in compacted] == ["p4.json", "p5.json", "p6.json"]
+
+    def test_legacy_index_json_is_migrated(
+        self, temp_cache_dir: str
+    ) -> None:
+        """
+        index.json legado vira index.log na primeira abertura.
+        """
+        import json
+        from pathlib import Path
+
+        from src.cache import ExecutionHistory
+
+        legacy = [
+            {"id": "bbb", "plan_file": "new.json", "status": "failure"},
+            {"id": "aaa", "plan_file": "old.json", "status": "success"},
+        ]
+        (Path(temp_cache_dir) / "index.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+        history = ExecutionHistory(history_dir=temp_cache_dir)
+
+        assert [r["id"] for r in history.get_recent()] == ["bbb", "aaa"]
+        assert not (Path(temp_cache_dir) / "index.json").exists()
+        assert [r["id"] for r in ExecutionHistory(history_dir=temp_cache_dir).get_recent()] == ["bbb", "aaa"]
+
+    def test_legacy_index_migration_stops_at_max_records(
+        self, temp_cache_dir: str
+    ) -> None:
+        """
+        Migração de index.json grande mantém só as max_records mais recentes.
+        """
+        import json
+        from pathlib import Path
+
+        from src.cache import ExecutionHistory
+
+        legacy = [{"id": f"id{i:04d}", "status": "success", "duration_ms": 1.5} for i in range(50)]
+        (Path(temp_cache_dir) / "index.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+        history = ExecutionHistory(history_dir=temp_cache_dir, max_records=10)
+
+        assert [r["id"] for r in history.get_recent(limit=100)] == [f"id{i:04d}" for i in range(10)]
+        assert history.get_recent(limit=1)[0]["duration_ms"] == 1.5
+
+    @pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard não instalado")
+    def test_records_use_zstd_and_read_any_codec(
+        self, temp_cache_dir: str
+    ) -> None:
+        """
+        Registros novos usam zstd; frames gzip/puros no mesmo log seguem legíveis.
+        """
+        from src.cache import ExecutionHistory
+
+        history = ExecutionHistory(history_dir=temp_cache_dir, compress=True)
+        assert history.codec == "zstd"
+
+        ids = {}
+        for codec in ("zstd", "gzip", "none"):
+            history.codec = codec
+            ids[codec] = history.record_execution(
+                plan_file=f"{codec}.json", duration_ms=100, total_steps=1,
+                passed_steps=1, failed_steps=0, status="success",
+                runner_report={"codec": codec},
+            ).id
+
+        reloaded = ExecutionHistory(history_dir=temp_cache_dir)
+        for codec, record_id in ids.items():
+            full = reloaded.get_full_record(record_id)
+            assert full is not None
+            assert full["runner_report"] == {"codec": codec}
+
+    def test_stats_counters_follow_trim_delete_and_clear(
+        self, temp_cache_dir: str
+    ) -> None:
+        """
+        Contadores de status acompanham trim, remoções, recarga e clear_all.
+        """
+        from src.cache import ExecutionHistory
+
+        history = ExecutionHistory(history_dir=temp_cache_dir, max_records=3)
+        statuses = ["failure", "success", "error", "success"]
+        ids = [
+            history.record_execution(
+                plan_file="p.json", duration_ms=100, total_steps=1,
+                passed_steps=1, failed_steps=0, status=status,
+            ).id
+            for status in statuses
+        ]
+
+        # O "failure" mais antigo saiu pelo trim
+        stats = history.stats()
+        assert (stats["success_count"], stats["failure_count"], stats["error_count"]) == (2, 0, 1)
+
+        history.delete(ids[3])
+        history.delete_bulk([ids[2]])
+        stats = ExecutionHistory(history_dir=temp_cache_dir, max_records=3).stats()
+        assert (stats["success_count"], stats["failure_count"], stats["error_count"]) == (1, 0, 0)
+
+        history.clear_all()
+        assert history.stats()["success_count"] == 0
+
+    def test_get_by_status_index_follows_trim_and_delete(
+        self, temp_cache_dir: str
+    ) -> None:
+        """
+        Índice por status mantém ordem e acompanha trim e remoções.
+        """
+        from src.cache import ExecutionHistory
+
+        history = ExecutionHistory(history_dir=temp_cache_dir, max_records=4)
+        ids = [
+            history.record_execution(
+                plan_file=f"p{i}.json", duration_ms=100, total_steps=1,
+                passed_steps=1, failed_steps=0, status=status,
+            ).id
+            for i, status in enumerate(["success", "failure", "success", "success", "success"])
+        ]
+
+        # ids[0] saiu pelo trim
+        assert [r["id"] for r in history.get_by_status("success")] == [ids[4], ids[3], ids[2]]
+        assert [r["id"] for r in history.get_by_status("success", limit=1)] == [ids[4]]
+
+        history.delete(ids[3])
+        assert [r["id"] for r in history.get_by_status("success")] == [ids[4], ids[2]]
+        assert [r["id"] for r in history.get_by_status("failure")] == [ids[1]]
+        assert history.get_by_status("error") == []
+
+        reloaded = ExecutionHistory(history_dir=temp_cache_dir, max_records=4)
+        assert reloaded.get_by_status("success") == history.get_by_status("success")
+
+    def test_lookup_by_id_follows_trim_and_delete(
+        self, temp_cache_dir: str
+    ) -> None:
+        """
+        Busca por ID não encontra registros cortados pelo trim ou removidos.
+        """
+        from src.cache import ExecutionHistory
+
+        history = ExecutionHistory(history_dir=temp_cache_dir, max_records=2)
+        ids = [
+            history.record_execution(
+                plan_file=f"p{i}.json", duration_ms=100, total_steps=1,
+                passed_steps=1, failed_steps=0, status="success",
+            ).id
+            for i in range(3)
+        ]
+
+        assert history.get_full_record(ids[0]) is None
+        assert history.delete(ids[0]) is False
+        assert history.get_full_record(ids[2])["plan_file"] == "p2.json"
+
+        assert history.delete(ids[2]) is True
+        assert history.get_full_record(ids[2]) is None
+        assert history.delete_bulk([ids[2], "missing"]) == 0
+        assert [r["id"] for r in history.get_recent()] == [ids[1]]
+
+    def test_generated_ids_are_unique_and_time_ordered(
+        self, temp_cache_dir: str
+    ) -> None:
+        """
+        IDs têm prefixo de timestamp: únicos e ordenáveis pela criação.
+        """
+        import time
+
+        from src.cache import ExecutionHistory
+
+        history = ExecutionHistory(history_dir=temp_cache_dir)
+        ids = [history._generate_id() for _ in range(1000)]
+        time.sleep(0.002)
+        later = history._generate_id()
+
+        assert len(set(ids)) == len(ids)
+        assert all(len(i) == 15 and int(i, 16) >= 0 for i in ids)
+        assert later > max(ids)
+
+    def test_full_record_lru_admits_on_second_read(
+        self, temp_cache_dir: str
+    ) -> None:
+        """
+        Registros entram no LRU só na segunda leitura e saem ao serem removidos.
+        """
+        from pathlib import Path
+
+        from src.cache import ExecutionHistory
+
+        history = ExecutionHistory(history_dir=temp_cache_dir)
+        hot, cold = (
+            history.record_execution(
+                plan_file=f"{name}.json", duration_ms=100, total_steps=1,
+                passed_steps=1, failed_steps=0, status="success",
+                runner_report={"name": name},
+            ).id
+            for name in ("hot", "cold")
+        )
+
+        history.get_full_record(hot)
+        history.get_full_record(hot)
+        history.get_full_record(cold)
+
+        # Sem o log, só o registro admitido no LRU ainda é servido
+        for log in Path(temp_cache_dir).glob("*/records.log"):
+            log.unlink()
+        assert history.get_full_record(hot)["runner_report"] == {"name": "hot"}
+        assert history.get_full_record(cold) is None
+
+        history.delete(hot)
+        assert history.get_full_record(hot) is None
+        assert hot not in history._memo
+
+    def test_concurrent_writers_and_readers(
+        self, temp_cache_dir: str
+    ) -> None:
+        """
+        Escritas concorrentes não perdem entradas e leitores seguem consistentes.
+        """
+        import threading
+
+        from src.cache import ExecutionHistory
+
+        history = ExecutionHistory(history_dir=temp_cache_dir, max_records=500)
+        errors: list[Exception] = []
+
+        def writer() -> None:
+            for _ in range(25):
+                history.record_execution(
+                    plan_file="p.json", duration_ms=1, total_steps=1,
+                    passed_steps=1, failed_steps=0, status="success",
+                )
+
+        def reader() -> None:
+            try:
+                for _ in range(200):
+                    stats = history.stats()
+                    assert stats["success_count"] == stats["total_records"]
+                    history.get_by_status("success", limit=5)
+            except Exception as e:  # pragma: no cover - falha do teste
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer) for _ in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert history.count() == 100
+        assert ExecutionHistory(history_dir=temp_cache_dir, max_records=500).count() == 100
+
+    def test_group_commit_keeps_offsets_of_concurrent_records(
+        self, temp_cache_dir: str
+    ) -> None:
+        """
+        Frames gravados em lote por outro escritor apontam para o registro certo.
+        """
+        import threading
+
+        from src.cache import ExecutionHistory
+
+        history = ExecutionHistory(history_dir=temp_cache_dir, max_records=500)
+        history.DURABLE_WRITES = True
+        recorded: dict[str, int] = {}
+
+        def writer(n: int) -> None:
+            for i in range(10):
+                record = history.record_execution(
+                    plan_file="p.json", duration_ms=n * 100 + i, total_steps=1,
+                    passed_steps=1, failed_steps=0, status="success",
+                    runner_report={"writer": n, "i": i, "pad": "x" * (n * 37)},
+                )
+                recorded[record.id] = n * 100 + i
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        reloaded = ExecutionHistory(history_dir=temp_cache_dir, max_records=500)
+        assert reloaded.count() == 80
+        for record_id, duration in recorded.items():
+            full = reloaded.get_full_record(record_id)
+            assert full is not None
+            assert full["duration_ms"] == duration
+            assert full["runner_report"]["i"] == duration % 100
+
+    def test_group_commit_batches_concurrent_writers(
+        self, temp_cache_dir: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        Escritores que chegam durante uma gravação saem juntos no lote seguinte.
+        """
+        import threading
+        import time
+
+        from src.cache import ExecutionHistory
+
+        history = ExecutionHistory(history_dir=temp_cache_dir, max_records=500)
+        original_commit = history._commit_batch
+        batch_sizes: list[int] = []
+
+        def slow_first_commit(batch: list[Any]) -> None:
+            # Segura o primeiro lote até os outros escritores entrarem na fila
+            if not batch_sizes:
+                deadline = time.monotonic() + 5
+                while len(history._commit_queue) < 3 and time.monotonic() < deadline:
+                    time.sleep(0.001)
+            batch_sizes.append(len(batch))
+            original_commit(batch)
+
+        monkeypatch.setattr(history, "_commit_batch", slow_first_commit)
+
+        def writer(n: int) -> None:
+            history.record_execution(
+                plan_file="p.json", duration_ms=n, total_steps=1,
+                passed_steps=1, failed_steps=0, status="success",
+            )
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sum(batch_sizes) == 4
+        assert max(batch_sizes) > 1
+        assert len(batch_sizes) < 4
+        assert sorted(r["duration_ms"] for r in history.get_recent(10)) == [0, 1, 2, 3]
+
     def test_history_disabled_returns_empty(
         self, temp_cache_dir: str
     ) -> None:
@@ -884,6 +1839,23 @@ class TestConfigCacheIntegration:
         assert config.cache_ttl_days == 30
         assert config.cache_compress is True
 
+    def test_disabled_cache_is_null_object(self, temp_cache_dir: str) -> None:
+        """
+        Fábricas com enabled=False retornam NullPlanCache sem tocar o disco.
+        """
+        from pathlib import Path
+
+        from src.cache import NullPlanCache
+
+        cache_dir = Path(temp_cache_dir) / "disabled"
+        cache = PlanCache.local_cache(cache_dir=str(cache_dir), enabled=False)
+
+        assert isinstance(cache, NullPlanCache)
+        assert cache.store("req", "url", {"x": 1}) == ""
+        assert cache.get("req", "url") is None
+        assert cache.stats().enabled is False
+        assert not cache_dir.exists()
+
     def test_config_for_testing_disables_cache(self) -> None:
         """
         Config de testes desabilita cache.
@@ -20,7 +20,7 @@ from typing import Any, Generator
 
 import pytest
 
-from src.cache import PlanVersion, PlanVersionStore, PlanDiff  # type: ignore[import-untyped]
+from src.cache import ChangePair, PlanVersion, PlanVersionStore, PlanDiff  # type: ignore[import-untyped]
 
 
 # =============================================================================
@@ -211,6 +211,73 @@ class TestPlanVersionStoreBasics:
         result = version_store.get_version("my-plan", version=999)
         assert result is None
 
+    def test_get_version_returns_independent_copies(
+        self,
+        version_store: PlanVersionStore,
+        sample_plan: dict[str, Any],
+    ) -> None:
+        """Versões explícitas são memoizadas, mas cada chamada recebe um objeto novo."""
+        version_store.save("my-plan", sample_plan)
+        version_store.save("my-plan", sample_plan)
+
+        first = version_store.get_version("my-plan", 1)
+        assert first is not None
+        assert ("my-plan", 1) in version_store._version_cache
+        first.plan["steps"].clear()
+        first.plan["config"]["timeout"] = 1
+
+        second = version_store.get_version("my-plan", 1)
+        assert second is not None
+        assert second is not first
+        assert second.plan == sample_plan
+
+        assert version_store.delete_version("my-plan", 1) is True
+        assert ("my-plan", 1) not in version_store._version_cache
+        assert version_store.get_version("my-plan", 1) is None
+
+    def test_get_version_hit_is_not_slower_than_cold_read(
+        self,
+        version_store: PlanVersionStore,
+        sample_plan: dict[str, Any],
+    ) -> None:
+        """Um acerto no cache de versões não custa mais que ler o arquivo."""
+        import time
+
+        step = sample_plan["steps"][0]
+        big_plan = {**sample_plan, "steps": [{**step, "id": f"step{i}"} for i in range(200)]}
+        version_store.save("big-plan", big_plan)
+
+        def best_of(runs: int, cold: bool) -> float:
+            best = float("inf")
+            for _ in range(runs):
+                if cold:
+                    version_store._forget_versions("big-plan")
+                start = time.perf_counter()
+                assert version_store.get_version("big-plan", 1) is not None
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        cold = best_of(30, cold=True)
+        hit = best_of(30, cold=False)
+        # Margem de 10% para ruído de medição
+        assert hit <= cold * 1.1
+
+    def test_delete_plan_forgets_cached_versions(
+        self,
+        version_store: PlanVersionStore,
+        sample_plan: dict[str, Any],
+    ) -> None:
+        """delete_plan descarta as versões memoizadas do plano."""
+        version_store.save("my-plan", sample_plan)
+        version_store.save("other-plan", sample_plan)
+        assert version_store.get_version("my-plan", 1) is not None
+        assert version_store.get_version("other-plan", 1) is not None
+
+        assert version_store.delete_plan("my-plan") is True
+
+        assert ("my-plan", 1) not in version_store._version_cache
+        assert ("other-plan", 1) in version_store._version_cache
+
     def test_get_current_returns_plan(
         self,
         version_store: PlanVersionStore,
@@ -339,9 +406,29 @@ class TestPlanVersionStoreDiff:
 
         assert diff is not None
         # step1 foi modificado (endpoint diferente)
-        modified_ids = [s.get("id") for s in diff.steps_modified]
+        modified_ids = [s.id for s in diff.steps_modified]
         assert "step1" in modified_ids
 
+    def test_diff_ignores_key_order_and_reuses_step_hashes(
+        self,
+        version_store: PlanVersionStore,
+        sample_plan: dict[str, Any],
+    ) -> None:
+        """Steps iguais com chaves em outra ordem não contam como modificados."""
+        version_store.save("my-plan", sample_plan)
+        reordered = json.loads(json.dumps(sample_plan))
+        reordered["steps"] = [dict(reversed(list(s.items()))) for s in reordered["steps"]]
+        version_store.save("my-plan", reordered)
+
+        diff = version_store.diff("my-plan", 1, 2)
+        assert diff is not None
+        assert diff.steps_modified == []
+
+        v1 = version_store.get_version("my-plan", 1)
+        assert v1 is not None
+        assert v1.step_hashes() is v1.step_hashes()
+        assert set(v1.step_hashes()) == {"step1", "step2"}
+
     def test_diff_versions_config_change(
         self,
         version_store: PlanVersionStore,
@@ -357,6 +444,29 @@ class TestPlanVersionStoreDiff:
         assert diff is not None
         assert "timeout" in diff.config_changes
 
+    def test_diff_config_added_and_removed_keys(
+        self,
+        version_store: PlanVersionStore,
+        sample_plan: dict[str, Any],
+    ) -> None:
+        """Chaves de config adicionadas/removidas aparecem no diff."""
+        version_store.save("my-plan", sample_plan)
+
+        changed_plan = json.loads(json.dumps(sample_plan))
+        del changed_plan["config"]["timeout"]
+        changed_plan["config"]["retries"] = 3
+        changed_plan["config"]["unset"] = None
+        version_store.save("my-plan", changed_plan)
+
+        diff = version_store.diff("my-plan", 1, 2)
+
+        assert diff is not None
+        assert diff.config_changes == {
+            "timeout": ChangePair(before=30, after=None),
+            "retries": ChangePair(before=None, after=3),
+        }
+        assert diff.config_changes["retries"].after == 3
+
     def test_diff_versions_removed_step(
         self,
         version_store: PlanVersionStore,
@@ -389,6 +499,54 @@ class TestPlanVersionStoreDiff:
         assert diff is None
 
 
+class TestPlanVersionStoreBatch:
+    """Testes de save_many do PlanVersionStore."""
+
+    def test_save_many_creates_versions(
+        self,
+        temp_storage_path: Path,
+        sample_plan: dict[str, Any],
+        modified_plan: dict[str, Any],
+    ) -> None:
+        """save_many numera versões por plano e atualiza current.json."""
+        store = PlanVersionStore(plans_dir=str(temp_storage_path))
+        versions = store.save_many([
+            ("plan-a", sample_plan, {"source": "import"}),
+            ("plan-b", sample_plan, {}),
+            ("plan-a", modified_plan, {"description": "Second"}),
+        ])
+
+        assert [v.version for v in versions] == [1, 1, 2]
+        assert versions[0].source == "import"
+        assert versions[2].parent_version == 1
+
+        reloaded = PlanVersionStore(plans_dir=str(temp_storage_path))
+        current = reloaded.get_version("plan-a")
+        assert current is not None
+        assert current.version == 2
+        assert current.plan == modified_plan
+        assert len(reloaded.list_versions("plan-a")) == 2
+        assert len(reloaded.list_plans()) == 2
+
+    def test_save_many_with_slugs_sharing_a_lock_stripe(
+        self,
+        version_store: PlanVersionStore,
+        sample_plan: dict[str, Any],
+    ) -> None:
+        """Mais planos que faixas de lock: cada faixa é adquirida uma vez só."""
+        names = [f"plan-{i}" for i in range(PlanVersionStore.LOCK_STRIPES + 1)]
+        versions = version_store.save_many([(name, sample_plan, {}) for name in names])
+
+        assert [v.version for v in versions] == [1] * len(names)
+        assert len(version_store._plan_locks) == PlanVersionStore.LOCK_STRIPES
+        assert len(version_store.list_plans()) == len(names)
+
+    def test_save_many_empty(self, version_store: PlanVersionStore) -> None:
+        """save_many com lista vazia não faz nada."""
+        assert version_store.save_many([]) == []
+        assert version_store.list_plans() == []
+
+
 # =============================================================================
 # TESTES: PlanVersionStore - Rollback
 # =============================================================================
@@ -474,6 +632,34 @@ class TestPlanVersion:
         assert version.llm_provider == "openai"
         assert version.parent_version is None
 
+    def test_step_hashes_cache_is_not_part_of_the_model(
+        self,
+        sample_plan: dict[str, Any],
+    ) -> None:
+        """O cache de step_hashes fica fora de to_dict, repr e comparação."""
+        version = PlanVersion(version=1, plan=sample_plan, created_at="2024-01-01T00:00:00Z")
+        other = PlanVersion(version=1, plan=sample_plan, created_at="2024-01-01T00:00:00Z")
+        version.step_hashes()
+
+        assert version == other
+        assert "_step_hashes" not in repr(version)
+        assert "_step_hashes" not in version.to_dict()
+        assert version.to_dict()["plan"] == sample_plan
+
+    def test_created_at_is_utc_iso(
+        self,
+        version_store: PlanVersionStore,
+        sample_plan: dict[str, Any],
+    ) -> None:
+        """created_at é ISO 8601 em UTC com sufixo Z."""
+        before = datetime.now(timezone.utc)
+        version = version_store.save("my-plan", sample_plan)
+        after = datetime.now(timezone.utc)
+
+        assert version.created_at.endswith("Z")
+        parsed = datetime.fromisoformat(version.created_at.replace("Z", "+00:00"))
+        assert before.replace(microsecond=0) <= parsed <= after
+
 
 # =============================================================================
 # TESTES: PlanDiff - Modelo de Diff
@@ -519,7 +705,7 @@ class TestPlanDiff:
             steps_added=[],
             steps_removed=[],
             steps_modified=[],
-            config_changes={"timeout": {"before": 30, "after": 60}},
+            config_changes={"timeout": ChangePair(before=30, after=60)},
             meta_changes={},
         )
 
@@ -592,6 +778,52 @@ class TestPlanVersionPersistence:
         assert version.llm_model == "gpt-4"
         assert version.description == "API testing"
 
+    def test_version_files_are_compact(
+        self,
+        temp_storage_path: Path,
+        sample_plan: dict[str, Any],
+    ) -> None:
+        """Arquivos internos são gravados sem indentação."""
+        store = PlanVersionStore(plans_dir=str(temp_storage_path))
+        store.save("my-plan", sample_plan)
+
+        raw = (temp_storage_path / "my-plan" / "v1.json").read_text(encoding="utf-8")
+        assert "\n" not in raw
+        assert json.loads(raw)["plan"] == sample_plan
+
+    def test_empty_or_corrupt_index_is_ignored(
+        self,
+        temp_storage_path: Path,
+        sample_plan: dict[str, Any],
+    ) -> None:
+        """index.json vazio ou corrompido não impede o uso do store."""
+        index_path = temp_storage_path / PlanVersionStore.INDEX_FILE
+        for content in (b"", b"{not json"):
+            index_path.write_bytes(content)
+            store = PlanVersionStore(plans_dir=str(temp_storage_path))
+            assert store.list_plans() == []
+
+        store.save("my-plan", sample_plan)
+        assert PlanVersionStore(plans_dir=str(temp_storage_path)).get_plan_info("my-plan") is not None
+
+    def test_export_version_pretty(
+        self,
+        version_store: PlanVersionStore,
+        sample_plan: dict[str, Any],
+    ) -> None:
+        """export_version indenta apenas quando solicitado."""
+        version_store.save("my-plan", sample_plan, description="Initial")
+
+        pretty = version_store.export_version("my-plan")
+        compact = version_store.export_version("my-plan", 1, pretty=False)
+
+        assert pretty is not None and compact is not None
+        assert "\n  " in pretty
+        assert "\n" not in compact
+        assert json.loads(pretty) == json.loads(compact)
+        assert json.loads(pretty)["description"] == "Initial"
+        assert version_store.export_version("missing-plan") is None
+
 
 # =============================================================================
 # TESTES: Edge Cases
@@ -664,6 +896,27 @@ class TestEdgeCases:
             versions = version_store.list_versions(name)
             assert len(versions) == 2
 
+    def test_parallel_saves_keep_versions_consistent(
+        self,
+        temp_storage_path: Path,
+        sample_plan: dict[str, Any],
+    ) -> None:
+        """Saves concorrentes (mesmo plano e planos distintos) não perdem versões."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        store = PlanVersionStore(plans_dir=str(temp_storage_path))
+        names = [f"plan-{i % 4}" for i in range(40)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda name: store.save(name, sample_plan), names))
+
+        reloaded = PlanVersionStore(plans_dir=str(temp_storage_path))
+        for i in range(4):
+            info = reloaded.get_plan_info(f"plan-{i}")
+            assert info is not None
+            assert info["current_version"] == 10
+            assert len(reloaded.list_versions(f"plan-{i}")) == 10
+
     def test_slugify_normalizes_names(
         self,
         version_store: PlanVersionStore,
@@ -680,6 +933,24 @@ class TestEdgeCases:
         version2 = version_store.get_version("my-api-tests")
         assert version2 is not None
 
+    def test_delete_plan_removes_directory(
+        self,
+        version_store: PlanVersionStore,
+        temp_storage_path: Path,
+        sample_plan: dict[str, Any],
+    ) -> None:
+        """delete_plan remove versões, subdiretórios inesperados e o índice."""
+        version_store.save("my-plan", sample_plan)
+        version_store.save("my-plan", sample_plan)
+        stale_dir = temp_storage_path / "my-plan" / "stale"
+        stale_dir.mkdir()
+        (stale_dir / "leftover.json").write_text("{}", encoding="utf-8")
+
+        assert version_store.delete_plan("my-plan") is True
+        assert not (temp_storage_path / "my-plan").exists()
+        assert version_store.get_plan_info("my-plan") is None
+        assert version_store.delete_plan("my-plan") is False
+
     def test_get_plan_info(
         self,
         version_store: PlanVersionStore,
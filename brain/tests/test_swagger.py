@@ -7,6 +7,8 @@ Testa:
 - Conversão para texto
 """
 
+import json
+import os
 import sys
 from pathlib import Path
 from typing import Any
@@ -16,9 +18,11 @@ import pytest
 # Adiciona o diretório brain ao path para imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.ingestion import swagger
 from src.ingestion.swagger import (
     OpenAPIValidationException,
     parse_openapi,
+    parse_openapi_cached,
     spec_to_requirement_text,
     validate_openapi_spec,
 )
@@ -152,6 +156,137 @@ class TestParseOpenAPI:
         result = parse_openapi(spec, strict=False)
         assert "endpoints" in result
 
+    def test_parse_json_file_with_bom_and_json_yaml(self, tmp_path: Path) -> None:
+        """Arquivos JSON com BOM e .yaml com conteúdo JSON parseiam igual ao dict."""
+        spec: dict[str, Any] = {
+            "openapi": "3.0.0",
+            "info": {"title": "File API", "version": "1.0.0"},
+            "paths": {"/test": {"get": {"responses": {"200": {"description": "OK"}}}}},
+        }
+        expected = parse_openapi(spec)
+
+        bom_path = tmp_path / "api.json"
+        bom_path.write_bytes(b"\xef\xbb\xbf" + json.dumps(spec).encode("utf-8"))
+        assert parse_openapi(bom_path) == expected
+
+        yaml_path = tmp_path / "api.yaml"
+        yaml_path.write_text(json.dumps(spec, indent=2), encoding="utf-8")
+        assert parse_openapi(yaml_path) == expected
+
+    def test_json_spec_file_accepts_what_stdlib_accepts(self, tmp_path: Path) -> None:
+        """NaN e inteiros maiores que 64 bits parseiam como no json da stdlib."""
+        raw = (
+            '{"openapi": "3.0.0", "info": {"title": "Big", "version": "1"},'
+            ' "x-max": 123456789012345678901234567890, "x-ratio": NaN, "paths": {}}'
+        )
+        path = tmp_path / "api.json"
+        path.write_text(raw, encoding="utf-8")
+
+        spec = swagger.load_spec_file(path)
+
+        assert spec["x-max"] == 123456789012345678901234567890
+        assert spec["x-ratio"] != spec["x-ratio"]  # NaN
+        assert spec["info"] == json.loads(raw)["info"]
+
+    def test_json_content_in_yaml_file_parses_like_pyyaml(self, tmp_path: Path) -> None:
+        """.yaml com conteúdo JSON dá o mesmo resultado de yaml.safe_load."""
+        import yaml
+
+        for raw in (
+            '{"x": 1e5, "y": 1.5}',
+            '{"x": NaN, "y": Infinity}',
+            '{"x": "\\u00e9", "n": 123456789012345678901234567890}',
+            '{"openapi": "3.0.0", "paths": {}, "flag": true, "none": null}',
+        ):
+            path = tmp_path / "api.yaml"
+            path.write_text(raw, encoding="utf-8")
+            assert swagger.load_spec_file(path) == yaml.safe_load(raw), raw
+
+    def test_parse_yaml_file(self, tmp_path: Path) -> None:
+        """Arquivo YAML de verdade parseia igual ao dict equivalente."""
+        yaml_path = tmp_path / "api.yml"
+        yaml_path.write_text(
+            "openapi: 3.0.0\n"
+            "info:\n"
+            "  title: YAML API\n"
+            "  version: 1.0.0\n"
+            "paths:\n"
+            "  /test:\n"
+            "    get:\n"
+            "      responses:\n"
+            "        '200':\n"
+            "          description: OK\n",
+            encoding="utf-8",
+        )
+        result = parse_openapi(yaml_path)
+
+        assert result["title"] == "YAML API"
+        assert result["endpoints"][0]["path"] == "/test"
+        assert result["validation"]["is_valid"] is True
+
+
+class TestParseOpenAPICached:
+    """Testes para parse_openapi_cached."""
+
+    SPEC: dict[str, Any] = {
+        "openapi": "3.0.0",
+        "info": {"title": "Cached API", "version": "1.0.0"},
+        "paths": {"/users": {"get": {"responses": {"200": {"description": "OK"}}}}},
+    }
+
+    def test_second_call_reads_from_cache(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A segunda chamada devolve o resultado salvo sem parsear de novo."""
+        spec_path = tmp_path / "api.json"
+        spec_path.write_text(json.dumps(self.SPEC), encoding="utf-8")
+        cache_dir = tmp_path / "cache"
+
+        first = parse_openapi_cached(spec_path, cache_dir=cache_dir)
+        assert first == parse_openapi(spec_path)
+        assert len(list(cache_dir.glob("*.json"))) == 1
+
+        def fail(*args: Any, **kwargs: Any) -> dict[str, Any]:
+            raise AssertionError("parse_openapi não deveria ser chamado")
+
+        monkeypatch.setattr(swagger, "parse_openapi", fail)
+        assert parse_openapi_cached(spec_path, cache_dir=cache_dir) == first
+
+    def test_edit_invalidates_entry(self, tmp_path: Path) -> None:
+        """Alterar a spec (mtime/tamanho) gera nova chave e novo parse."""
+        spec_path = tmp_path / "api.json"
+        spec_path.write_text(json.dumps(self.SPEC), encoding="utf-8")
+        cache_dir = tmp_path / "cache"
+        assert parse_openapi_cached(spec_path, cache_dir=cache_dir)["title"] == "Cached API"
+
+        edited = {**self.SPEC, "info": {"title": "Edited API", "version": "1.0.0"}}
+        spec_path.write_text(json.dumps(edited), encoding="utf-8")
+        stat = spec_path.stat()
+        os.utime(spec_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert parse_openapi_cached(spec_path, cache_dir=cache_dir)["title"] == "Edited API"
+
+    def test_new_entry_replaces_previous_one_of_same_spec(self, tmp_path: Path) -> None:
+        """Cada spec ocupa uma entrada: editar remove a entrada antiga, não a de outras specs."""
+        spec_path = tmp_path / "api.json"
+        other_path = tmp_path / "other.json"
+        spec_path.write_text(json.dumps(self.SPEC), encoding="utf-8")
+        other_path.write_text(json.dumps(self.SPEC), encoding="utf-8")
+        cache_dir = tmp_path / "cache"
+        parse_openapi_cached(spec_path, cache_dir=cache_dir)
+        parse_openapi_cached(other_path, cache_dir=cache_dir)
+        assert len(list(cache_dir.glob("*.json"))) == 2
+
+        for i in range(3):
+            edited = {**self.SPEC, "info": {"title": f"Edited {i}", "version": "1.0.0"}}
+            spec_path.write_text(json.dumps(edited), encoding="utf-8")
+            stat = spec_path.stat()
+            os.utime(spec_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + (i + 1) * 1_000_000))
+            assert parse_openapi_cached(spec_path, cache_dir=cache_dir)["title"] == f"Edited {i}"
+
+        assert len(list(cache_dir.glob("*.json"))) == 2
+        assert parse_openapi_cached(other_path, cache_dir=cache_dir)["title"] == "Cached API"
+
 
 class TestSpecToRequirementText:
     """Testes para spec_to_requirement_text."""
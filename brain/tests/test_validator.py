@@ -11,6 +11,7 @@ validam corretamente planos UTDL, incluindo:
 
 from __future__ import annotations
 
+import io
 import sys
 from pathlib import Path
 
@@ -157,6 +158,23 @@ class TestPlan:
         assert '"spec_version": "0.1"' in json_str
         assert '"name": "Plano de Teste"' in json_str
 
+    def test_dump_json_matches_to_json(self) -> None:
+        """Testa que dump_json() grava os mesmos bytes UTF-8 de to_json()."""
+        plan = Plan(
+            meta=Meta(name="Plano de Ação"),
+            config=Config(base_url="https://api.example.com"),
+            steps=[
+                Step(
+                    id="step_1",
+                    action="http_request",
+                    params={"method": "GET", "path": "/health"},
+                )
+            ],
+        )
+        buffer = io.BytesIO()
+        plan.dump_json(buffer)
+        assert buffer.getvalue() == plan.to_json().encode("utf-8")
+
 
 class TestExtraction:
     """Testes para o modelo Extraction."""